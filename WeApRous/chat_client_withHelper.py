@@ -6,6 +6,8 @@ import time
 import sys
 import argparse
 
+from daemon.timeouts import socket_deadline, DEFAULT_HEADER_TIMEOUT, DEFAULT_WRITE_TIMEOUT
+
 # --- CẤU HÌNH ---
 # Đảm bảo port này khớp với port bạn chạy start_sampleapp.py (thường là 8001 theo README)
 TRACKER_URL = "http://127.0.0.1:8001" 
@@ -23,12 +25,21 @@ def get_my_ip():
     return ip
 
 class P2PChatClient:
-    def __init__(self, username, my_port, tracker_url):
+    def __init__(self, username, my_port, tracker_url, handshake_timeout=DEFAULT_HEADER_TIMEOUT,
+                 idle_timeout=None, write_timeout=DEFAULT_WRITE_TIMEOUT):
         self.username = username
         self.my_port = my_port
         self.my_ip = get_my_ip()
         self.tracker_url = tracker_url
         self.running = True
+
+        # Giới hạn thời gian: bắt tay, kết nối im lặng (None = không giới hạn), gửi tin
+        self.handshake_timeout = handshake_timeout
+        self.idle_timeout = idle_timeout
+        self.write_timeout = write_timeout
+        # Deadline của từng kết nối, mỗi chiều một cái vì luồng nhận và
+        # send_to chạy song song: { socket_obj: (deadline nhận, deadline gửi) }
+        self.deadlines = {}
         
         # Quản lý kết nối P2P: { 'username': socket_obj }
         self.peers = {} 
@@ -103,6 +114,7 @@ class P2PChatClient:
                 try:
                     client_sock, addr = server_socket.accept()
                     # Khởi tạo luồng nhận tin nhắn cho kết nối mới này
+                    self.make_deadline(client_sock)
                     threading.Thread(target=self.handle_incoming_message, args=(client_sock,), daemon=True).start()
                 except OSError:
                     break
@@ -111,11 +123,40 @@ class P2PChatClient:
         finally:
             server_socket.close()
 
-    def handle_incoming_message(self, sock):
+    def make_deadline(self, sock):
+        """Tạo cặp deadline nhận / gửi (timer wheel dùng chung) cho một kết nối P2P."""
+        deadlines = (
+            socket_deadline(sock, header_timeout=self.handshake_timeout,
+                            idle_timeout=self.idle_timeout),
+            socket_deadline(sock, write_timeout=self.write_timeout),
+        )
+        self.deadlines[sock] = deadlines
+        return deadlines
+
+    def send_to(self, sock, data):
+        """Gửi dữ liệu, peer không đọc quá write_timeout sẽ bị ngắt."""
+        deadlines = self.deadlines.get(sock)
+        if deadlines is None:
+            sock.sendall(data)
+            return
+        receiving, sending = deadlines
+        sending.arm("write")
+        try:
+            sock.sendall(data)
+        finally:
+            sending.cancel()
+        # Gửi tin cũng là hoạt động: kết nối đang chờ không bị coi là im lặng,
+        # nhưng pha bắt tay của luồng nhận được giữ nguyên.
+        receiving.refresh("idle")
+
+    def handle_incoming_message(self, sock, incoming=True):
         """Xử lý tin nhắn nhận được từ một Peer."""
         peer_name = "Unknown"
+        deadline, sending = self.deadlines.get(sock) or self.make_deadline(sock)
         try:
             # Bước bắt tay đầu tiên: Nhận tên của người gửi
+            # (chỉ kết nối đến mới phải bắt tay trong handshake_timeout)
+            deadline.enter("header" if incoming else "idle")
             peer_name = sock.recv(1024).decode('utf-8')
             if not peer_name: return
             
@@ -126,6 +167,7 @@ class P2PChatClient:
             print("> ", end="", flush=True)
 
             while self.running:
+                deadline.arm("idle")
                 data = sock.recv(4096)
                 if not data: break
                 msg = data.decode('utf-8')
@@ -136,6 +178,9 @@ class P2PChatClient:
         finally:
             print(f"\n[P2P] Peer {peer_name} disconnected.")
             if peer_name in self.peers: del self.peers[peer_name]
+            deadline.cancel()
+            sending.cancel()
+            self.deadlines.pop(sock, None)
             sock.close()
             print("> ", end="", flush=True)
 
@@ -151,16 +196,19 @@ class P2PChatClient:
 
         try:
             s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            s.settimeout(self.handshake_timeout)
             s.connect((target_ip, int(target_port)))
+            s.settimeout(None)
+            self.make_deadline(s)
             
             # Gửi tên mình để định danh (Handshake đơn giản)
-            s.sendall(self.username.encode('utf-8'))
+            self.send_to(s, self.username.encode('utf-8'))
             
             self.peers[target_username] = s
             self.socket_to_user[s] = target_username
             
             # Bắt đầu luồng lắng nghe chiều ngược lại
-            threading.Thread(target=self.handle_incoming_message, args=(s,), daemon=True).start()
+            threading.Thread(target=self.handle_incoming_message, args=(s, False), daemon=True).start()
             # print(f"[P2P] Successfully connected to {target_username}")
         except Exception as e:
             print(f"[P2P] Failed to connect to {target_username}: {e}")
@@ -171,7 +219,7 @@ class P2PChatClient:
             print(f"[ERROR] Not connected to {target_username}. Use 'connect' first.")
             return
         try:
-            self.peers[target_username].sendall(message.encode('utf-8'))
+            self.send_to(self.peers[target_username], message.encode('utf-8'))
             print(f"[Me -> {target_username}]: {message}")
         except Exception as e:
             print(f"[ERROR] Sending failed: {e}")
@@ -182,9 +230,9 @@ class P2PChatClient:
             print("[INFO] No peers connected.")
             return
         print(f"[Broadcast -> {len(self.peers)} peers]: {message}")
-        for peer, sock in self.peers.items():
+        for peer, sock in list(self.peers.items()):
             try:
-                sock.sendall(message.encode('utf-8'))
+                self.send_to(sock, message.encode('utf-8'))
             except:
                 pass
 
@@ -271,11 +319,17 @@ if __name__ == "__main__":
     parser.add_argument("--peer-port", type=int, required=True, help="Port to listen for P2P connections")
     parser.add_argument("--tracker-ip", default="127.0.0.1", help="Tracker IP")
     parser.add_argument("--tracker-port", type=int, default=8001, help="Tracker Port") # Default 8001 như README
+    parser.add_argument("--handshake-timeout", type=float, default=DEFAULT_HEADER_TIMEOUT, help="Seconds for a peer to identify itself")
+    parser.add_argument("--idle-timeout", type=float, default=None, help="Seconds before a silent peer is dropped (default: never)")
+    parser.add_argument("--write-timeout", type=float, default=DEFAULT_WRITE_TIMEOUT, help="Seconds before a peer that stops reading is dropped")
 
     args = parser.parse_args()
     
     # Cập nhật URL Tracker từ tham số
     TRACKER_URL = f"http://{args.tracker_ip}:{args.tracker_port}"
     
-    client = P2PChatClient(args.username, args.peer_port, TRACKER_URL)
+    client = P2PChatClient(args.username, args.peer_port, TRACKER_URL,
+                           handshake_timeout=args.handshake_timeout,
+                           idle_timeout=args.idle_timeout,
+                           write_timeout=args.write_timeout)
     client.run()
\ No newline at end of file
@@ -13,7 +13,8 @@
 from .backend import create_backend
 from .proxy import create_proxy
 from .weaprous import WeApRous
-from .response import Response
+from .router import Router
+from .response import Response, RouteResponse
 from .request import Request
 from .backend import create_backend
 from .httpadapter import HttpAdapter
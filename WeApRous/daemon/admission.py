@@ -0,0 +1,241 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.admission
+~~~~~~~~~~~~~~~~~
+
+This module provides admission control (load shedding) for the accept path of
+the backend and proxy daemons.
+
+At most ``max_inflight`` connections are served at once. Up to ``max_queue``
+further connections may wait, each for at most ``queue_timeout`` seconds, for
+a slot to free up. Anything beyond that is answered immediately with
+``503 Service Unavailable`` and a ``Retry-After`` header. Under overload the
+daemon therefore keeps a bounded number of threads and a bounded waiting time
+instead of piling up work it cannot serve.
+
+Usage Example:
+--------------
+>>> admission = AdmissionController(max_inflight=64, max_queue=32)
+>>> if not admission.reserve():
+>>>     admission.reject(conn, blocking=False)
+>>> elif admission.acquire():
+>>>     try:
+>>>         serve(conn)
+>>>     finally:
+>>>         admission.release()
+"""
+
+import socket
+import threading
+
+#: Option names consumed by :func:`create_admission`.
+ADMISSION_OPTIONS = ("max_inflight", "max_queue", "queue_timeout", "retry_after")
+#: Default number of connections allowed to wait for a slot.
+DEFAULT_MAX_QUEUE = 64
+#: Default number of seconds a queued connection waits for a slot.
+DEFAULT_QUEUE_TIMEOUT = 1.0
+#: Default ``Retry-After`` value sent with a 503, in seconds.
+DEFAULT_RETRY_AFTER = 1
+
+
+def overload_response(retry_after=DEFAULT_RETRY_AFTER):
+    """
+    Builds the ``503 Service Unavailable`` reply sent to shed connections.
+
+    :param retry_after (int): seconds the client should wait before retrying.
+
+    :rtype bytes: the raw HTTP response.
+    """
+    body = "503 Service Unavailable"
+    return (
+        "HTTP/1.1 503 Service Unavailable\r\n"
+        "Retry-After: {}\r\n"
+        "Content-Type: text/plain\r\n"
+        "Content-Length: {}\r\n"
+        "Connection: close\r\n"
+        "\r\n"
+        "{}"
+    ).format(retry_after, len(body), body).encode('utf-8')
+
+
+class AdmissionController:
+    """The :class:`AdmissionController <AdmissionController>` object, which
+    bounds the connections in flight and waiting in a daemon.
+
+    A connection first :meth:`reserve` s a place (a slot or a queue position)
+    from the accept loop, then :meth:`acquire` s a slot from the thread that
+    serves it and finally :meth:`release` s it.
+
+    :attrs max_inflight (int): connections served concurrently.
+    :attrs max_queue (int): connections allowed to wait for a slot.
+    :attrs queue_timeout (float): seconds a connection may wait for a slot.
+    :attrs retry_after (int): ``Retry-After`` value of the 503 reply.
+    """
+
+    __attrs__ = [
+        "max_inflight",
+        "max_queue",
+        "queue_timeout",
+        "retry_after",
+    ]
+
+    def __init__(self, max_inflight, max_queue=DEFAULT_MAX_QUEUE,
+                 queue_timeout=DEFAULT_QUEUE_TIMEOUT, retry_after=DEFAULT_RETRY_AFTER):
+        """
+        Initialize a new AdmissionController instance.
+
+        :param max_inflight (int): connections served concurrently.
+        :param max_queue (int): connections allowed to wait for a slot.
+        :param queue_timeout (float): seconds a connection may wait for a slot.
+        :param retry_after (int): ``Retry-After`` value of the 503 reply.
+
+        :raises ValueError: If the limits are not positive.
+        """
+        if max_inflight < 1 or max_queue < 0:
+            raise ValueError("Invalid admission limits inflight={} queue={}".format(
+                max_inflight, max_queue))
+
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self._cond = threading.Condition()
+        self._inflight = 0
+        self._waiting = 0
+        self._response = overload_response(retry_after)
+
+    @property
+    def inflight(self):
+        """Number of connections currently being served."""
+        return self._inflight
+
+    @property
+    def waiting(self):
+        """Number of connections holding a place but no slot yet."""
+        return self._waiting
+
+    def busy(self):
+        """True when every slot is taken and connections are waiting for one."""
+        return self._waiting > 0 and self._inflight >= self.max_inflight
+
+    def reserve(self):
+        """
+        Reserve a place for a new connection, without blocking.
+
+        :rtype bool: True if the connection may proceed to :meth:`acquire`,
+                     False if it must be shed.
+        """
+        with self._cond:
+            if self._inflight + self._waiting >= self.max_inflight + self.max_queue:
+                return False
+            self._waiting += 1
+            return True
+
+    def acquire(self, timeout=None):
+        """
+        Turn a reservation into a slot, waiting while all slots are taken.
+
+        :param timeout (float): seconds to wait, defaults to ``queue_timeout``,
+                                0 never waits.
+
+        :rtype bool: True if a slot was acquired, False if the wait timed out
+                     (the reservation is dropped).
+        """
+        if timeout is None:
+            timeout = self.queue_timeout
+        with self._cond:
+            admitted = self._cond.wait_for(
+                lambda: self._inflight < self.max_inflight, timeout)
+            self._waiting -= 1
+            if not admitted:
+                return False
+            self._inflight += 1
+            return True
+
+    def release(self):
+        """Give a slot back and wake up one waiting connection."""
+        with self._cond:
+            self._inflight -= 1
+            self._cond.notify()
+
+    def reject(self, conn, blocking=True):
+        """
+        Answer a shed connection with 503 and close it.
+
+        Bytes the client already sent are drained first so that closing the
+        socket does not reset the connection before the reply is read.
+
+        :param conn (socket.socket): the client connection.
+        :param blocking (bool): wait up to a second for the reply to be
+                                written. Accept loops and event loops pass
+                                False: the reply is written with a single
+                                non-blocking ``send`` and whatever the socket
+                                does not take is dropped.
+        """
+        try:
+            conn.setblocking(False)
+            try:
+                conn.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                pass
+            if blocking:
+                conn.settimeout(1.0)
+                conn.sendall(self._response)
+            else:
+                try:
+                    conn.send(self._response)
+                except (BlockingIOError, InterruptedError):
+                    pass
+            conn.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def serve(self, handler, conn, *args, **kwargs):
+        """
+        Run ``handler(*args, **kwargs)`` for a reserved connection once it
+        gets a slot, or answer 503 if the wait times out.
+
+        :param handler (callable): the connection handler.
+        :param conn (socket.socket): the client connection.
+        :param args: positional arguments passed to ``handler``.
+        :param kwargs: keyword arguments passed to ``handler``.
+        """
+        if not self.acquire():
+            print("[Admission] Queue wait timed out, shedding connection")
+            self.reject(conn)
+            return
+        try:
+            handler(*args, **kwargs)
+        finally:
+            self.release()
+
+
+def create_admission(options):
+    """
+    Builds an :class:`AdmissionController <AdmissionController>` from the
+    ``max_inflight``, ``max_queue``, ``queue_timeout`` and ``retry_after``
+    entries of ``options``, removing them from it.
+
+    :param options (dict): daemon settings.
+
+    :rtype AdmissionController: the controller, or None when ``max_inflight``
+                                is not set (admission control disabled).
+    """
+    settings = {key: options.pop(key) for key in ADMISSION_OPTIONS if key in options}
+    if settings.get("max_inflight") is None:
+        return None
+    return AdmissionController(**settings)
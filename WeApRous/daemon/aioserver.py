@@ -0,0 +1,367 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.aioserver
+~~~~~~~~~~~~~~~~~
+
+This module provides the ``asyncio`` engine of the backend daemon, built on
+:func:`asyncio.start_server`.
+
+Every connection is served by a coroutine. Route hooks declared with
+``async def`` are awaited directly on the event loop, so a handler waiting for
+data does not hold an OS thread. Plain functions, the login page and static
+files are offloaded to a thread executor so they never block the loop.
+Connection deadlines live on a :class:`TimerWheel <TimerWheel>` ticked by the
+loop; an expired read deadline fails the pending read, an expired write
+deadline aborts the transport.
+
+Usage Example:
+--------------
+>>> app = WeApRous()
+>>> @app.route('/get-messages', methods=['POST'])
+>>> async def get_messages(headers, body):
+>>>     await asyncio.sleep(1)
+>>>     return json_response(200, "success", {"messages": []})
+>>> app.run(engine="asyncio")
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+
+from .httpadapter import HttpAdapter
+from .response import ChunkedResponse, FileResponse, RouteResponse, SENDFILE_BLOCK_SIZE
+from .reader import RECV_SIZE, RequestError, parse_request
+from .admission import overload_response
+from .timeouts import TimerWheel
+from .router import Router
+
+#: Default number of threads offloading synchronous handlers (None: Python default).
+DEFAULT_EXECUTOR_WORKERS = None
+
+
+class AsyncServer:
+    """The :class:`AsyncServer <AsyncServer>` object, which serves the route
+    hooks of a WeApRous application from an asyncio event loop.
+
+    :attrs ip (str): IP address the server is bound to.
+    :attrs port (int): Port number the server is listening on.
+    :attrs server (socket.socket): listening server socket.
+    :attrs routes (dict): Mapping of route paths to handler functions.
+    :attrs adapter_options (dict): settings passed to every HttpAdapter.
+    :attrs admission (AdmissionController): admission control, if enabled.
+    :attrs executor (ThreadPoolExecutor): runs the synchronous handlers.
+    :attrs wheel (TimerWheel): connection deadlines, ticked by the loop.
+    """
+
+    __attrs__ = [
+        "ip",
+        "port",
+        "server",
+        "routes",
+        "adapter_options",
+        "admission",
+        "executor",
+        "wheel",
+    ]
+
+    def __init__(self, ip, port, server, routes, adapter_options=None,
+                 executor_workers=DEFAULT_EXECUTOR_WORKERS):
+        """
+        Initialize a new AsyncServer instance.
+
+        :param ip (str): IP address the server is bound to.
+        :param port (int): Port number the server is listening on.
+        :param server (socket.socket): listening server socket.
+        :param routes (dict): Mapping of route paths to handler functions.
+        :param adapter_options (dict): settings passed to every HttpAdapter.
+        :param executor_workers (int): threads offloading synchronous handlers.
+        """
+        self.ip = ip
+        self.port = port
+        self.server = server
+        self.routes = Router.compile(routes)
+        self.adapter_options = adapter_options or {}
+        self.admission = self.adapter_options.get("admission")
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=executor_workers,
+            thread_name_prefix="weaprous")
+        self.wheel = TimerWheel()
+
+    async def serve_forever(self):
+        """Accept connections on the listening socket until cancelled."""
+        loop = asyncio.get_running_loop()
+
+        def tick():
+            self.wheel.advance()
+            loop.call_later(self.wheel.tick, tick)
+
+        loop.call_later(self.wheel.tick, tick)
+        srv = await asyncio.start_server(self.handle_connection, sock=self.server)
+        async with srv:
+            await srv.serve_forever()
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serve the requests of one connection, keeping it open between
+        requests as long as :meth:`HttpAdapter.should_keep_alive` allows.
+
+        :param reader (asyncio.StreamReader): client input stream.
+        :param writer (asyncio.StreamWriter): client output stream.
+        """
+        admission = self.admission
+        if admission is not None and not (admission.reserve() and admission.acquire(timeout=0)):
+            # The loop must not block, connections beyond the cap are shed at once.
+            await self.reject(reader, writer, admission)
+            return
+
+        addr = writer.get_extra_info("peername")
+        sock = writer.get_extra_info("socket")
+        adapter = HttpAdapter(self.ip, self.port, sock, addr, self.routes,
+                              **self.adapter_options)
+        deadline = adapter.make_deadline(
+            self.wheel, functools.partial(self.expire, reader, writer))
+        deadline.enter("header")
+        buf = bytearray()
+        served = 0
+
+        try:
+            while True:
+                try:
+                    parsed = await self.read_request(reader, buf, adapter, deadline)
+                except RequestError as e:
+                    print("[AsyncServer] Rejecting request from {}: {}".format(addr, e))
+                    await self.send_response(writer, adapter.build_error_response(e.status_code, e.reason), deadline)
+                    break
+                if parsed is None:
+                    break
+
+                deadline.cancel()
+                served += 1
+                response = await self.handle_request(adapter, *parsed)
+                keep_alive = adapter.should_keep_alive(adapter.request, response, served)
+                if response:
+                    await self.send_response(writer, adapter.set_connection_header(response, keep_alive), deadline)
+                if not keep_alive:
+                    break
+                deadline.arm("idle")
+        except asyncio.TimeoutError:
+            if deadline.expired in ("header", "body") and buf:
+                print("[AsyncServer] Request timeout from {}".format(addr))
+                try:
+                    writer.write(adapter.build_error_response(408, "Request Timeout"))
+                except (ConnectionError, RuntimeError):
+                    pass
+        except ConnectionError:
+            pass
+        except Exception as e:
+            print(f"[AsyncServer] Error in handle_connection: {e}")
+        finally:
+            deadline.cancel()
+            if admission is not None:
+                admission.release()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def reject(self, reader, writer, admission):
+        """
+        Answer a connection shed by admission control with 503.
+
+        The write side is half-closed and the request drained before closing,
+        so the client reads the reply instead of a connection reset.
+
+        :param reader (asyncio.StreamReader): client input stream.
+        :param writer (asyncio.StreamWriter): client output stream.
+        :param admission (AdmissionController): the admission control.
+        """
+        try:
+            writer.write(overload_response(admission.retry_after))
+            # A client that does not read must not keep the coroutine around.
+            await asyncio.wait_for(writer.drain(), 1.0)
+            writer.write_eof()
+            await asyncio.wait_for(reader.read(RECV_SIZE), 1.0)
+        except (asyncio.TimeoutError, ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    def expire(self, reader, writer, phase):
+        """
+        Deadline callback: fail the pending read with ``asyncio.TimeoutError``,
+        or abort the transport when a write stalled.
+
+        :param reader (asyncio.StreamReader): client input stream.
+        :param writer (asyncio.StreamWriter): client output stream.
+        :param phase (str): the phase that timed out.
+        """
+        if phase == "write":
+            writer.transport.abort()
+        else:
+            reader.set_exception(asyncio.TimeoutError())
+
+    async def send_response(self, writer, response, deadline):
+        """
+        Write a response, streaming the chunks of a ChunkedResponse.
+
+        Chunks are produced in the executor since generators and file reads
+        may block.
+
+        :param writer (asyncio.StreamWriter): client output stream.
+        :param response: response bytes, a :class:`ChunkedResponse <ChunkedResponse>`,
+                         a :class:`FileResponse <FileResponse>` or a
+                         :class:`RouteResponse <RouteResponse>`.
+        :param deadline (ConnectionDeadline): deadline re-armed for every write.
+        """
+        deadline.arm("write")
+        if isinstance(response, RouteResponse):
+            # The transport gathers the buffers (sendmsg) instead of joining them.
+            writer.writelines(response.buffers())
+            await writer.drain()
+            return
+        if isinstance(response, FileResponse):
+            await self.send_file(writer, response, deadline)
+            return
+        if not isinstance(response, ChunkedResponse):
+            writer.write(response)
+            await writer.drain()
+            return
+
+        loop = asyncio.get_running_loop()
+        chunks = iter(response)
+        try:
+            writer.write(response.head)
+            while True:
+                chunk = await loop.run_in_executor(self.executor, next, chunks, None)
+                if chunk is None:
+                    break
+                deadline.arm("write")
+                writer.write(chunk)
+                await writer.drain()
+        finally:
+            chunks.close()
+
+    async def send_file(self, writer, response, deadline):
+        """
+        Write a :class:`FileResponse <FileResponse>`: the head, then the body
+        with :meth:`loop.sendfile`, which uses ``os.sendfile`` and falls back
+        to buffered reads on transports that do not support it.
+
+        :param writer (asyncio.StreamWriter): client output stream.
+        :param response (FileResponse): the file response.
+        :param deadline (ConnectionDeadline): deadline re-armed for every block.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            writer.write(response.head)
+            await writer.drain()
+            while response.remaining > 0:
+                count = min(response.remaining, SENDFILE_BLOCK_SIZE)
+                sent = await loop.sendfile(writer.transport, response.file,
+                                           response.offset, count)
+                response.advance(sent)
+                deadline.arm("write")
+        finally:
+            response.close()
+
+    async def read_request(self, reader, buf, adapter, deadline):
+        """
+        Read one complete request through the connection buffer.
+
+        :param reader (asyncio.StreamReader): client input stream.
+        :param buf (bytearray): connection buffer kept between requests.
+        :param adapter (HttpAdapter): adapter holding the size caps.
+        :param deadline (ConnectionDeadline): moved to the ``header`` and
+                                              ``body`` phases as bytes arrive.
+
+        :rtype tuple: (head, body), the parsed head and the body bytes, or None
+                      once the client closed the connection.
+
+        :raises RequestError: If the request is malformed or exceeds a cap.
+        """
+        while True:
+            parsed = parse_request(buf, adapter.max_header_size, adapter.max_body_size)
+            if parsed is not None:
+                size, head, body = parsed
+                del buf[:size]
+                return head, body
+
+            if buf:
+                deadline.enter("body" if buf.find(b"\r\n\r\n") >= 0 else "header")
+            data = await reader.read(RECV_SIZE)
+            if not data:
+                if buf:
+                    raise RequestError(400, "Bad Request")
+                return None
+            buf += data
+
+    async def handle_request(self, adapter, head, body):
+        """
+        Asynchronous counterpart of :meth:`HttpAdapter.handle_request`.
+
+        :param adapter (HttpAdapter): adapter owning the request and response.
+        :param head (RequestHead): the parsed request line and headers.
+        :param body (bytes): the (de-chunked) request body.
+
+        :rtype bytes: the raw HTTP response.
+        """
+        loop = asyncio.get_running_loop()
+
+        try:
+            body = adapter.prepare_request(head, body, self.routes)
+            req = adapter.request
+            response = adapter.check_access(req, body)
+            if response is None:
+                response = adapter.build_method_response(req)
+
+            if response is None and req.hook:
+                if asyncio.iscoroutinefunction(req.hook):
+                    print("[AsyncServer] Awaiting hook for: {}".format(req.path))
+                    hook_result = await req.hook(**adapter.hook_arguments(req, body))
+                    response = adapter.build_hook_response(hook_result)
+                else:
+                    response = await loop.run_in_executor(
+                        self.executor, adapter.run_hook, req, body)
+
+            if response is None:
+                response = await loop.run_in_executor(
+                    self.executor, adapter.response.build_response, req)
+            return response
+        except RequestError as e:
+            print("[AsyncServer] Rejecting request: {}".format(e))
+            return adapter.build_error_response(e.status_code, e.reason)
+        except Exception as e:
+            print(f"[AsyncServer] Error in handle_request: {e}")
+            return adapter.build_server_error()
+
+
+def serve_asyncio(ip, port, server, routes, adapter_options=None,
+                  executor_workers=DEFAULT_EXECUTOR_WORKERS):
+    """
+    Accept loop of the ``asyncio`` engine.
+
+    :param ip (str): IP address the server is bound to.
+    :param port (int): Port number the server is listening on.
+    :param server (socket.socket): Listening server socket.
+    :param routes (dict): Dictionary of route handlers.
+    :param adapter_options (dict): settings passed to every HttpAdapter.
+    :param executor_workers (int): threads offloading synchronous handlers.
+    """
+    async_server = AsyncServer(ip, port, server, routes, adapter_options,
+                               executor_workers=executor_workers)
+    try:
+        asyncio.run(async_server.serve_forever())
+    finally:
+        async_server.executor.shutdown(wait=False)
@@ -23,6 +23,15 @@ Requirements:
 --------------
 - socket: provide socket networking interface.
 - threading: Enables concurrent client handling via threads.
+- workerpool: bounded, self-tuning pool of worker threads.
+- eventloop: single threaded selector (epoll) engine.
+- aioserver: asyncio engine awaiting ``async def`` route handlers.
+- prefork: supervisor forking several worker processes on one port.
+- admission: caps connections in flight and sheds the excess with 503.
+- router: radix tree of the route hooks, with typed path parameters.
+- staticcache: LRU cache of the static files, bounded in bytes.
+- manifest: index of the static files built at startup.
+- compression: gzip / deflate negotiation of static files and route replies.
 - response: response utilities.
 - httpadapter: the class for handling HTTP requests.
 - CaseInsensitiveDict: provides dictionary for managing headers or routes.
@@ -30,25 +39,57 @@ Requirements:
 
 Notes:
 ------
-- The server create daemon threads for client handling.
+- The server create daemon threads for client handling. The default ``thread``
+  engine spawns one thread per connection, the ``pool`` engine runs connections
+  on a :class:`WorkerPool <WorkerPool>` fed by a bounded accept queue and the
+  ``selector`` engine multiplexes every connection on one thread. The ``asyncio``
+  engine awaits coroutine handlers and offloads the others to an executor.
+- With ``workers`` greater than 1 the engine runs in that many forked processes,
+  each with its own ``SO_REUSEPORT`` listening socket, under a
+  :class:`Supervisor <Supervisor>` that restarts crashed workers.
+- With ``max_inflight`` set, at most that many connections are served at once,
+  ``max_queue`` more wait up to ``queue_timeout`` seconds and the rest are
+  answered ``503`` with ``Retry-After``. The limits apply per process.
 - The current implementation error handling is minimal, socket errors are printed to the console.
 - The actual request processing is delegated to the HttpAdapter class.
 
 Usage Example:
 --------------
 >>> create_backend("127.0.0.1", 9000, routes={})
+>>> create_backend("127.0.0.1", 9000, routes={}, engine="pool", max_workers=16)
+>>> create_backend("0.0.0.0", 9000, routes={}, engine="selector", workers=4)
 
 """
 
+import os
 import socket
 import threading
 import argparse
 
 from .response import *
-from .httpadapter import HttpAdapter
+from .httpadapter import HttpAdapter, ADAPTER_OPTIONS
 from .dictionary import CaseInsensitiveDict
+from .workerpool import (
+    WorkerPool,
+    DEFAULT_MIN_WORKERS,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_IDLE_TIMEOUT,
+)
+from .eventloop import serve_selector
+from .aioserver import serve_asyncio
+from .prefork import Supervisor
+from .admission import create_admission
+from .router import Router
+from .staticcache import configure_static_cache
+from .manifest import configure_asset_manifest
 
-def handle_client(ip, port, conn, addr, routes):
+#: Server engines understood by :func:`run_backend`.
+ENGINES = ("thread", "pool", "selector", "asyncio")
+#: Default length of the kernel listen backlog.
+DEFAULT_BACKLOG = 50
+
+def handle_client(ip, port, conn, addr, routes, adapter_options=None):
     """
     Initializes an HttpAdapter instance and delegates the client handling logic to it.
 
@@ -57,52 +98,268 @@ def handle_client(ip, port, conn, addr, routes):
     :param conn (socket.socket): Client connection socket.
     :param addr (tuple): client address (IP, port).
     :param routes (dict): Dictionary of route handlers.
+    :param adapter_options (dict): HttpAdapter settings, e.g. ``keepalive_timeout``.
+    """
+    adapter_options = adapter_options or {}
+    admission = adapter_options.get("admission")
+    if admission is not None:
+        # The accept loop reserved a place, wait for a slot to be served.
+        admission.serve(serve_client, conn, ip, port, conn, addr, routes, adapter_options)
+    else:
+        serve_client(ip, port, conn, addr, routes, adapter_options)
+
+def serve_client(ip, port, conn, addr, routes, adapter_options):
+    """
+    Serves the requests of one client connection with an HttpAdapter.
+
+    :param ip (str): IP address of the server.
+    :param port (int): Port number the server is listening on.
+    :param conn (socket.socket): Client connection socket.
+    :param addr (tuple): client address (IP, port).
+    :param routes (dict): Dictionary of route handlers.
+    :param adapter_options (dict): HttpAdapter settings.
     """
-    daemon = HttpAdapter(ip, port, conn, addr, routes)
+    daemon = HttpAdapter(ip, port, conn, addr, routes, **adapter_options)
 
     # Handle client
     daemon.handle_client(conn, addr, routes)
 
-def run_backend(ip, port, routes):
+def admit(conn, adapter_options):
     """
-    Starts the backend server, binds to the specified IP and port, and listens for incoming
-    connections. Each connection is handled in a separate thread. The backend accepts incoming
-    connections and spawns a thread for each client.
+    Reserves a place for a freshly accepted connection, answering ``503``
+    when the daemon is saturated.
+
+    :param conn (socket.socket): Client connection socket.
+    :param adapter_options (dict): HttpAdapter settings holding the admission control.
+
+    :rtype bool: True if the connection can be handed to :func:`handle_client`.
+    """
+    admission = (adapter_options or {}).get("admission")
+    if admission is None or admission.reserve():
+        return True
+    # The accept loop must not wait for a client that does not read.
+    admission.reject(conn, blocking=False)
+    return False
+
+def serve_threaded(ip, port, server, routes, adapter_options=None):
+    """
+    Accept loop of the ``thread`` engine: every accepted connection is handled
+    in a new daemon thread.
+
+    :param ip (str): IP address the server is bound to.
+    :param port (int): Port number the server is listening on.
+    :param server (socket.socket): Listening server socket.
+    :param routes (dict): Dictionary of route handlers.
+    :param adapter_options (dict): HttpAdapter settings.
+    """
+    while True:
+        conn, addr = server.accept()
+        if not admit(conn, adapter_options):
+            continue
+        #
+        #  TODO: implement the step of the client incomping connection
+        #        using multi-thread programming with the
+        #        provided handle_client routine
+        #
+        client_thread = threading.Thread(target=handle_client, args=(ip, port, conn, addr, routes, adapter_options), daemon = True)
+        client_thread.start()
+
+def serve_pool(ip, port, server, routes, adapter_options=None, min_workers=DEFAULT_MIN_WORKERS,
+               max_workers=DEFAULT_MAX_WORKERS, queue_size=DEFAULT_QUEUE_SIZE,
+               worker_idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """
+    Accept loop of the ``pool`` engine: accepted connections are queued to a
+    bounded :class:`WorkerPool <WorkerPool>`. When the queue is full the accept
+    loop blocks, leaving further clients in the kernel listen backlog.
+
+    :param ip (str): IP address the server is bound to.
+    :param port (int): Port number the server is listening on.
+    :param server (socket.socket): Listening server socket.
+    :param routes (dict): Dictionary of route handlers.
+    :param adapter_options (dict): HttpAdapter settings.
+    :param min_workers (int): Worker threads kept alive at all times.
+    :param max_workers (int): Maximum number of worker threads.
+    :param queue_size (int): Depth of the accept queue.
+    :param worker_idle_timeout (float): Idle seconds before an extra worker exits.
+    """
+    pool = WorkerPool(handle_client,
+                      min_workers=min_workers,
+                      max_workers=max_workers,
+                      queue_size=queue_size,
+                      idle_timeout=worker_idle_timeout)
+    pool.start()
+    print("[Backend] Worker pool min={} max={} queue={}".format(
+        min_workers, max_workers, queue_size))
+
+    try:
+        while True:
+            conn, addr = server.accept()
+            if admit(conn, adapter_options):
+                pool.submit(ip, port, conn, addr, routes, adapter_options)
+    finally:
+        pool.shutdown()
+
+def create_server_socket(ip, port, backlog=DEFAULT_BACKLOG, reuse_port=False, nodelay=False):
+    """
+    Creates, binds and starts listening on a TCP server socket.
+
+    :param ip (str): IP address to bind the server.
+    :param port (int): Port number to listen on.
+    :param backlog (int): Length of the kernel listen backlog.
+    :param reuse_port (bool): Set ``SO_REUSEPORT`` so that several processes
+                              can listen on the same port.
+    :param nodelay (bool): Disable Nagle's algorithm (``TCP_NODELAY``) on the
+                           accepted connections.
+
+    :rtype socket.socket: the listening socket.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        if nodelay:
+            # Accepted sockets inherit the option from the listening socket.
+            server.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        server.bind((ip, port))
+        server.listen(backlog)
+    except OSError:
+        server.close()
+        raise
+    return server
+
+def serve_engine(ip, port, server, routes, engine, adapter_options, options):
+    """
+    Runs the accept loop of the selected engine on a listening socket.
+
+    :param ip (str): IP address the server is bound to.
+    :param port (int): Port number the server is listening on.
+    :param server (socket.socket): Listening server socket.
+    :param routes (dict): Dictionary of route handlers, or the compiled
+                          :class:`Router <Router>`.
+    :param engine (str): Server engine, one of :data:`ENGINES`.
+    :param adapter_options (dict): HttpAdapter settings.
+    :param options (dict): engine specific settings.
+    """
+    # A no-op for the Router compiled by run_backend.
+    routes = Router.compile(routes)
+    if engine == "pool":
+        serve_pool(ip, port, server, routes, adapter_options, **options)
+    elif engine == "selector":
+        serve_selector(ip, port, server, routes, adapter_options)
+    elif engine == "asyncio":
+        serve_asyncio(ip, port, server, routes, adapter_options, **options)
+    else:
+        serve_threaded(ip, port, server, routes, adapter_options)
 
+def serve_prefork(ip, port, routes, engine, adapter_options, options, workers,
+                  backlog=DEFAULT_BACKLOG, nodelay=False):
+    """
+    Runs ``workers`` forked processes, each serving the engine on its own
+    ``SO_REUSEPORT`` socket, and supervises them.
 
     :param ip (str): IP address to bind the server.
     :param port (int): Port number to listen on.
     :param routes (dict): Dictionary of route handlers.
+    :param engine (str): Server engine, one of :data:`ENGINES`.
+    :param adapter_options (dict): HttpAdapter settings.
+    :param options (dict): engine specific settings.
+    :param workers (int): Number of worker processes.
+    :param backlog (int): Length of the listen backlog of each worker.
+    :param nodelay (bool): Set ``TCP_NODELAY`` on accepted connections.
     """
-    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("Multi-process mode requires SO_REUSEPORT")
+
+    # Bind once in the supervisor so that an unusable address fails fast
+    # instead of crash looping every worker.
+    create_server_socket(ip, port, backlog, reuse_port=True).close()
+
+    def worker(slot):
+        server = create_server_socket(ip, port, backlog, reuse_port=True, nodelay=nodelay)
+        print("[Backend] Worker {} (pid {}) listening on port {}".format(slot, os.getpid(), port))
+        serve_engine(ip, port, server, routes, engine, adapter_options, options)
+
+    Supervisor(worker, workers).run()
+
+def run_backend(ip, port, routes, engine="thread", workers=1, backlog=DEFAULT_BACKLOG,
+                nodelay=False, **options):
+    """
+    Starts the backend server, binds to the specified IP and port, and listens for incoming
+    connections. With the default ``thread`` engine each connection is handled in a separate
+    thread; the ``pool`` engine hands connections to a bounded worker pool instead and the
+    ``selector`` engine serves all of them from a single non-blocking event loop and the
+    ``asyncio`` engine runs them as coroutines. With ``workers`` greater than 1 the
+    engine is run in that many pre-forked processes sharing the port.
+
+
+    :param ip (str): IP address to bind the server.
+    :param port (int): Port number to listen on.
+    :param routes (dict): Dictionary of route handlers, compiled into a
+                          :class:`Router <Router>`.
+    :param engine (str): Server engine, one of :data:`ENGINES`.
+    :param workers (int): Number of server processes, 1 serves from this process.
+    :param backlog (int): Length of the kernel listen backlog.
+    :param nodelay (bool): Set ``TCP_NODELAY`` on accepted connections.
+    :param options: Connection settings shared by every engine (``keepalive_timeout``,
+                    ``max_keepalive_requests``, ``compress_min_size``), admission control (``max_inflight``,
+                    ``max_queue``, ``queue_timeout``, ``retry_after``), the static file cache
+                    (``static_cache_size``, ``static_revalidate``, ``cache_lifetimes``), the asset
+                    manifest (``asset_manifest``, ``asset_watch``) and engine
+                    specific settings, e.g.
+                    ``min_workers``, ``max_workers``, ``queue_size`` and
+                    ``worker_idle_timeout`` for the ``pool`` engine,
+                    ``executor_workers`` for the ``asyncio`` engine.
+    """
+    if engine not in ENGINES:
+        raise ValueError("Unknown backend engine: {}".format(engine))
+
+    # Compiled once here, every engine and worker shares the tree.
+    routes = Router.compile(routes)
+    adapter_options = {key: options.pop(key) for key in ADAPTER_OPTIONS if key in options}
+    admission = create_admission(options)
+    cache = configure_static_cache(options)
+    print("[Backend] Static cache {} bytes, revalidated every {}s".format(
+        cache.max_bytes, cache.revalidate_interval))
+    manifest = configure_asset_manifest(options)
+    if manifest is not None:
+        print("[Backend] Asset manifest {} files in {}, rescanned every {}s".format(
+            len(manifest), ", ".join(manifest.directories), manifest.watch_interval or "-"))
+    if admission is not None:
+        adapter_options["admission"] = admission
+        print("[Backend] Admission control inflight={} queue={}".format(
+            admission.max_inflight, admission.max_queue))
 
     try:
-        server.bind((ip, port))
-        server.listen(50)
-        print("[Backend] Listening on port {}".format(port))
-        if routes != {}:
+        if workers > 1:
+            print("[Backend] Starting {} workers on port {} ({} engine)".format(workers, port, engine))
+            if routes:
+                print("[Backend] route settings {}".format(routes))
+            serve_prefork(ip, port, routes, engine, adapter_options, options,
+                          workers, backlog=backlog, nodelay=nodelay)
+            return
+
+        server = create_server_socket(ip, port, backlog, nodelay=nodelay)
+        print("[Backend] Listening on port {} ({} engine)".format(port, engine))
+        if routes:
             print("[Backend] route settings {}".format(routes))
 
-        while True:
-            conn, addr = server.accept()
-            #
-            #  TODO: implement the step of the client incomping connection
-            #        using multi-thread programming with the
-            #        provided handle_client routine
-            #
-            client_thread = threading.Thread(target=handle_client, args=(ip, port, conn, addr, routes), daemon = True)
-            client_thread.start()
+        serve_engine(ip, port, server, routes, engine, adapter_options, options)
 
     except socket.error as e:
       print("Socket error: {}".format(e))
 
-def create_backend(ip, port, routes={}):
+def create_backend(ip, port, routes={}, engine="thread", **options):
     """
     Entry point for creating and running the backend server.
 
     :param ip (str): IP address to bind the server.
     :param port (int): Port number to listen on.
     :param routes (dict, optional): Dictionary of route handlers. Defaults to empty dict.
+    :param engine (str, optional): Server engine, ``thread`` (default), ``pool``,
+                                   ``selector`` or ``asyncio``.
+    :param options: Connection, process (``workers``, ``backlog``, ``nodelay``)
+                    and engine settings forwarded to :func:`run_backend`.
     """
 
-    run_backend(ip, port, routes)
\ No newline at end of file
+    run_backend(ip, port, routes, engine=engine, **options)
@@ -0,0 +1,365 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.balancer
+~~~~~~~~~~~~~~~~~
+
+This module provides the load balancing policies of the proxy, one
+:class:`Balancer <Balancer>` per virtual host choosing among its
+``proxy_pass`` members according to its ``dist_policy``:
+
+- ``round-robin`` (and its alias ``weighted-round-robin``): smooth weighted
+  round-robin, members with ``weight=N`` get N turns per cycle, interleaved
+  rather than in bursts. Without weights it is the plain rotation.
+- ``least_conn``: the member with the fewest requests in flight relative to
+  its weight, ties rotate.
+- ``p2c_ewma``: power of two choices, two random members are compared by
+  their exponentially weighted moving average of response time (time to the
+  first response byte) scaled by their load, the cheaper one wins. It adapts
+  to slow backends at the cost of two samples instead of a full scan.
+
+Members are written ``host:port`` with optional parameters, as parsed from
+``config/proxy.conf``::
+
+    proxy_pass http://192.168.1.12:9001 weight=3;
+
+Every policy only considers the members :meth:`Member.available` admits, the
+ones not ejected by the :class:`UpstreamHealth <UpstreamHealth>`; when none
+is, all of them are considered rather than failing every request. Ejection
+is a property of the backend address: the members of every virtual host
+pointing at the same ``host:port`` share one :class:`BackendHealth <BackendHealth>`.
+
+Usage Example:
+--------------
+>>> balancer = balancer_for("app2.local:8080", ["10.0.0.1:9002 weight=2", "10.0.0.2:9002"], "least_conn")
+>>> member = balancer.choose()
+>>> member.acquire()
+>>> member.release(latency=0.012)
+"""
+
+import random
+import threading
+import time
+
+#: Names accepted by ``dist_policy``.
+POLICIES = ("round-robin", "weighted-round-robin", "least_conn", "p2c_ewma")
+#: Weight of the newest response time in the moving average.
+DEFAULT_EWMA_ALPHA = 0.3
+#: Share of the traffic a member gets back as soon as its ejection ends.
+MIN_READMIT_SHARE = 0.1
+
+
+def parse_member(spec):
+    """
+    Parses a ``proxy_pass`` member.
+
+    :param spec (str): ``host:port`` followed by optional ``name=value``
+                       parameters, e.g. ``10.0.0.1:9002 weight=2``.
+
+    :rtype tuple: (host, port, parameters dict).
+
+    :raises ValueError: If the port or a weight is not a positive integer.
+    """
+    address, *params = spec.split()
+    host, _, port = address.rpartition(":")
+    settings = {}
+    for param in params:
+        name, _, value = param.partition("=")
+        settings[name] = value
+    port = int(port)
+    if "weight" in settings:
+        settings["weight"] = int(settings["weight"])
+        if settings["weight"] < 1:
+            raise ValueError("weight must be positive: {}".format(spec))
+    return host, port, settings
+
+
+class BackendHealth:
+    """The ejection state of one backend address, shared by the
+    :class:`Member <Member>` objects of every balancer pointing at it.
+
+    :attrs failures (int): consecutive failed requests or probes.
+    :attrs ejected_until (float): ``time.monotonic()`` the ejection ends.
+    :attrs recovered_at (float): ``time.monotonic()`` the backend gets its
+                                 full share of traffic back.
+    :attrs lock (threading.RLock): guards the three counters above.
+    """
+
+    __slots__ = ("failures", "ejected_until", "recovered_at", "lock")
+
+    def __init__(self):
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.recovered_at = 0.0
+        self.lock = threading.RLock()
+
+    def eject(self, cooldown, slow_start, now=None):
+        """
+        Take the backend out of rotation.
+
+        :param cooldown (float): seconds it receives no traffic.
+        :param slow_start (float): seconds over which its share of traffic
+                                   then grows back to the full one.
+        """
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self.failures = 0
+            self.ejected_until = now + cooldown
+            self.recovered_at = self.ejected_until + slow_start
+
+    def available(self, now=None):
+        """
+        Tells whether the backend may take the next request: never while
+        ejected, with a probability growing from :data:`MIN_READMIT_SHARE` to
+        1 while it recovers, always otherwise.
+
+        :rtype bool: True if it may be chosen.
+        """
+        now = time.monotonic() if now is None else now
+        if now < self.ejected_until:
+            return False
+        if now < self.recovered_at:
+            share = (now - self.ejected_until) / (self.recovered_at - self.ejected_until)
+            return random.random() < max(share, MIN_READMIT_SHARE)
+        return True
+
+    @property
+    def ejected(self):
+        """True while the backend receives no traffic."""
+        return time.monotonic() < self.ejected_until
+
+    @property
+    def recovering(self):
+        """True while the backend is re-admitted gradually."""
+        return self.ejected_until <= time.monotonic() < self.recovered_at
+
+
+class Member:
+    """A backend of a :class:`Balancer <Balancer>` and its live statistics.
+
+    :attrs host (str): backend address.
+    :attrs port (int): backend port.
+    :attrs weight (int): share of the requests, 1 by default.
+    :attrs inflight (int): requests currently forwarded to it.
+    :attrs ewma (float): moving average of its response time in seconds,
+                         None until a response was observed.
+    :attrs health (BackendHealth): ejection state of its address.
+    """
+
+    __slots__ = ("host", "port", "weight", "inflight", "ewma", "current",
+                 "health", "_lock")
+
+    def __init__(self, host, port, weight=1, health=None):
+        """
+        :param health (BackendHealth): state shared with the other members of
+                                       the address, a private one if omitted.
+        """
+        self.host = host
+        self.port = port
+        self.weight = weight
+        self.inflight = 0
+        self.ewma = None
+        # Running credit of the smooth weighted round-robin.
+        self.current = 0
+        self.health = health if health is not None else BackendHealth()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Account for a request forwarded to this member."""
+        with self._lock:
+            self.inflight += 1
+
+    def release(self, latency=None, alpha=DEFAULT_EWMA_ALPHA):
+        """
+        Account for the end of a request.
+
+        :param latency (float): observed response time in seconds, None when
+                                the request failed before any response.
+        :param alpha (float): weight of this sample in the moving average.
+        """
+        with self._lock:
+            self.inflight -= 1
+            if latency is not None:
+                self.ewma = latency if self.ewma is None else alpha * latency + (1 - alpha) * self.ewma
+
+    def eject(self, cooldown, slow_start, now=None):
+        """Take the address of the member out of rotation, see
+        :meth:`BackendHealth.eject`."""
+        self.health.eject(cooldown, slow_start, now)
+
+    def available(self, now=None):
+        """Tells whether the member may take the next request, see
+        :meth:`BackendHealth.available`."""
+        return self.health.available(now)
+
+    @property
+    def ejected(self):
+        """True while the member receives no traffic."""
+        return self.health.ejected
+
+    @property
+    def recovering(self):
+        """True while the member is re-admitted gradually."""
+        return self.health.recovering
+
+    def cost(self):
+        """Expected wait on this member, its average response time per
+        unit of weight times the requests that would share it."""
+        return (self.ewma or 0.0) * (self.inflight + 1) / self.weight
+
+    @property
+    def address(self):
+        return "{}:{}".format(self.host, self.port)
+
+    def __repr__(self):
+        return "<Member {} weight={} inflight={}>".format(self.address, self.weight, self.inflight)
+
+
+class Balancer:
+    """The :class:`Balancer <Balancer>` object, the choice of a member for
+    every request of one virtual host.
+
+    :attrs members (list): the :class:`Member <Member>` objects.
+    :attrs policy (str): one of :data:`POLICIES`, anything else always picks
+                         the first member.
+    """
+
+    __attrs__ = [
+        "members",
+        "policy",
+    ]
+
+    def __init__(self, members, policy="round-robin"):
+        """
+        Initialize a new Balancer instance.
+
+        :param members (list): :class:`Member <Member>` objects, at least one.
+        :param policy (str): the ``dist_policy``.
+        """
+        self.members = list(members)
+        self.policy = policy
+        self._next = 0
+        self._lock = threading.Lock()
+        self._choose = {
+            "round-robin": self._weighted_round_robin,
+            "weighted-round-robin": self._weighted_round_robin,
+            "least_conn": self._least_conn,
+            "p2c_ewma": self._p2c_ewma,
+        }.get(policy, self._first)
+
+    def choose(self, exclude=()):
+        """
+        Pick the member serving the next request among the available ones.
+
+        :param exclude (iterable): members already tried for this request,
+                                   skipped unless nothing else is left.
+
+        :rtype Member: the chosen member.
+        """
+        now = time.monotonic()
+        members = [member for member in self.members
+                   if member not in exclude and member.available(now)]
+        if not members:
+            # Everything is ejected: trying beats refusing every request.
+            members = [member for member in self.members if member not in exclude] or self.members
+        if len(members) == 1:
+            return members[0]
+        return self._choose(members)
+
+    def _first(self, members):
+        return members[0]
+
+    def _weighted_round_robin(self, members):
+        """Smooth weighted round-robin (as in nginx): every member earns its
+        weight, the richest one is picked and pays the total back."""
+        with self._lock:
+            total = 0
+            best = None
+            for member in members:
+                member.current += member.weight
+                total += member.weight
+                if best is None or member.current > best.current:
+                    best = member
+            best.current -= total
+            return best
+
+    def _least_conn(self, members):
+        """Fewest requests in flight per unit of weight, scanning from a
+        rotating start so ties are shared."""
+        with self._lock:
+            start = self._next
+            self._next = (start + 1) % len(members)
+        best = None
+        for i in range(len(members)):
+            member = members[(start + i) % len(members)]
+            if best is None or member.inflight * best.weight < best.inflight * member.weight:
+                best = member
+        return best
+
+    def _p2c_ewma(self, members):
+        """Power of two choices on the load scaled moving average."""
+        first, second = random.sample(members, 2)
+        if (second.cost(), second.inflight) < (first.cost(), first.inflight):
+            return second
+        return first
+
+
+_balancers = {}
+_balancers_lock = threading.Lock()
+#: (host, port) -> BackendHealth, kept across rebuilds of the balancers.
+_health = {}
+
+
+def balancer_for(hostname, proxy_map, policy):
+    """
+    Returns the balancer of a virtual host, built on first use and rebuilt
+    when its members or policy change, so statistics survive across requests.
+
+    :param hostname (str): the virtual host, a configured one or None for
+                           the default route of unknown hosts.
+    :param proxy_map (str or list): its ``proxy_pass`` members.
+    :param policy (str): its ``dist_policy``.
+
+    :rtype Balancer: the balancer, None if the host has no member.
+
+    :raises ValueError: If a member is malformed.
+    """
+    specs = (proxy_map,) if isinstance(proxy_map, str) else tuple(proxy_map)
+    if not specs:
+        return None
+    key = (specs, policy)
+    entry = _balancers.get(hostname)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    with _balancers_lock:
+        entry = _balancers.get(hostname)
+        if entry is None or entry[0] != key:
+            members = []
+            for spec in specs:
+                host, port, settings = parse_member(spec)
+                health = _health.get((host, port))
+                if health is None:
+                    health = _health[(host, port)] = BackendHealth()
+                members.append(Member(host, port, settings.get("weight", 1), health))
+            entry = _balancers[hostname] = (key, Balancer(members, policy))
+        return entry[1]
+
+
+def all_members():
+    """
+    Members of every balancer built so far, e.g. for health probes.
+
+    :rtype list: the :class:`Member <Member>` objects.
+    """
+    with _balancers_lock:
+        return [member for _, balancer in _balancers.values() for member in balancer.members]
@@ -0,0 +1,230 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.compression
+~~~~~~~~~~~~~~~~~
+
+This module provides the ``Content-Encoding`` negotiation of WeApRous, with
+``gzip`` and ``deflate`` from the standard :mod:`zlib`.
+
+- :func:`negotiate_encoding` picks the coding of a reply from the request
+  ``Accept-Encoding`` header and its q-values.
+- Static files are compressed once and the variant is kept next to the
+  original in the :class:`StaticCache <StaticCache>`. A ``.gz`` sibling
+  written beforehand by :func:`precompress` (e.g. ``--precompress`` at startup)
+  is served instead of compressing at run time.
+- :func:`compress_response` compresses the body of a serialized hook reply
+  (JSON peer lists, HTML pages) when it is larger than a threshold.
+
+Only textual types are compressed, images and archives are already compact.
+
+Usage Example:
+--------------
+>>> negotiate_encoding("gzip;q=0.5, deflate")
+'deflate'
+>>> body = compress(b"<p>peer</p>" * 100, "gzip")
+"""
+
+import mimetypes
+import os
+import zlib
+
+#: Codings offered to clients, preferred first when q-values tie.
+ENCODINGS = ("gzip", "deflate")
+#: zlib window bits of each coding, gzip adds its header and trailer.
+WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+#: Default zlib compression level, a good ratio at a fraction of level 9 cost.
+DEFAULT_LEVEL = 6
+#: Default smallest body compressed, smaller ones barely shrink.
+DEFAULT_MIN_SIZE = 1024
+#: Media types that are not ``text/*`` but compress well.
+COMPRESSIBLE_TYPES = (
+    "application/javascript",
+    "application/x-javascript",
+    "application/json",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+#: Statuses whose reply body is never encoded.
+UNENCODED_STATUSES = (b"204", b"206", b"304")
+
+
+def is_compressible(content_type):
+    """
+    Tells whether a media type is worth compressing.
+
+    :param content_type (str): ``Content-Type`` value, parameters allowed.
+
+    :rtype bool: True for text and the types of :data:`COMPRESSIBLE_TYPES`.
+    """
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Picks the content coding of a reply.
+
+    :param accept_encoding (str): the request ``Accept-Encoding`` value.
+
+    :rtype str: ``gzip`` or ``deflate``, or None to send the identity.
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        weight = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for coding in ENCODINGS:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(data, encoding, level=DEFAULT_LEVEL):
+    """
+    Compresses a body.
+
+    :param data (bytes): the identity body.
+    :param encoding (str): ``gzip`` or ``deflate`` (zlib format).
+    :param level (int): zlib compression level.
+
+    :rtype bytes: the encoded body.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, WBITS[encoding])
+    return compressor.compress(data) + compressor.flush()
+
+
+def merge_vary(vary):
+    """
+    Adds ``Accept-Encoding`` to a ``Vary`` value, keeping the fields it
+    already names.
+
+    :param vary (str): the current ``Vary`` value, or None.
+
+    :rtype str: the merged value, ``*`` stays as is.
+    """
+    fields = [field.strip() for field in (vary or "").split(",") if field.strip()]
+    if "*" in fields:
+        return "*"
+    if "accept-encoding" not in (field.lower() for field in fields):
+        fields.append("Accept-Encoding")
+    return ", ".join(fields)
+
+
+def compress_response(response, accept_encoding, min_size=DEFAULT_MIN_SIZE,
+                      level=DEFAULT_LEVEL):
+    """
+    Compresses the body of a serialized reply when the client accepts it.
+
+    Replies that are already encoded, have no ``Content-Length``, carry a
+    status without a full body, have an incompressible type, are smaller
+    than ``min_size`` or do not shrink are returned unchanged.
+
+    :param response (bytes): the raw HTTP response.
+    :param accept_encoding (str): the request ``Accept-Encoding`` value.
+    :param min_size (int): smallest body compressed.
+    :param level (int): zlib compression level.
+
+    :rtype bytes: the response, with ``Content-Encoding`` set and
+                  ``Accept-Encoding`` added to ``Vary`` when its body was
+                  compressed.
+    """
+    head_end = response.find(b"\r\n\r\n")
+    if head_end < 0 or len(response) - head_end - 4 < min_size:
+        return response
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None or response[9:12] in UNENCODED_STATUSES:
+        return response
+
+    lines = response[:head_end].split(b"\r\n")
+    content_type = None
+    has_length = False
+    for line in lines[1:]:
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name in (b"content-encoding", b"transfer-encoding"):
+            return response
+        if name == b"content-type":
+            content_type = value.strip().decode("latin-1")
+        elif name == b"content-length":
+            has_length = True
+    if not has_length or not is_compressible(content_type):
+        return response
+
+    body = compress(response[head_end + 4:], encoding, level)
+    if len(body) >= len(response) - head_end - 4:
+        return response
+
+    vary = ", ".join(line.partition(b":")[2].strip().decode("latin-1")
+                     for line in lines[1:] if line.lower().startswith(b"vary:"))
+    lines = [line for line in lines
+             if not line.lower().startswith((b"content-length:", b"vary:"))]
+    lines.append("Content-Encoding: {}".format(encoding).encode("latin-1"))
+    lines.append("Content-Length: {}".format(len(body)).encode("latin-1"))
+    lines.append("Vary: {}".format(merge_vary(vary)).encode("latin-1"))
+    return b"\r\n".join(lines) + b"\r\n\r\n" + body
+
+
+def precompress(directories, min_size=DEFAULT_MIN_SIZE, level=9):
+    """
+    Writes a ``.gz`` sibling next to every compressible file of ``directories``
+    whose sibling is missing or older, at the best compression level.
+
+    :param directories (iterable): directories to walk, e.g. ``www`` and ``static``.
+    :param min_size (int): smallest file compressed.
+    :param level (int): zlib compression level.
+
+    :rtype int: number of siblings written.
+    """
+    written = 0
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith(".gz"):
+                    continue
+                path = os.path.join(root, name)
+                if not is_compressible(mimetypes.guess_type(name)[0]):
+                    continue
+                target = path + ".gz"
+                try:
+                    stat = os.stat(path)
+                    if stat.st_size < min_size:
+                        continue
+                    if os.path.exists(target) and os.stat(target).st_mtime_ns >= stat.st_mtime_ns:
+                        continue
+                    with open(path, "rb") as f:
+                        data = compress(f.read(), "gzip", level)
+                    if len(data) >= stat.st_size:
+                        continue
+                    with open(target, "wb") as f:
+                        f.write(data)
+                    written += 1
+                except OSError as e:
+                    print("[Compression] Cannot precompress {}: {}".format(path, e))
+    return written
@@ -0,0 +1,369 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.eventloop
+~~~~~~~~~~~~~~~~~
+
+This module provides the ``selector`` engine of the backend daemon. Instead of
+one thread per connection, a single thread multiplexes every client socket
+with :mod:`selectors` (epoll on Linux, kqueue/poll/select elsewhere).
+
+Sockets are non-blocking. Incoming bytes are buffered per connection until a
+full request (headers plus a ``Content-Length`` or chunked body) is available, the
+request is then handed to :meth:`HttpAdapter.handle_request` and the reply is
+written back whenever the socket becomes writable. Keep-alive connections then
+return to reading the next request. Header, body, idle and write deadlines live
+on a :class:`TimerWheel <TimerWheel>` advanced by the loop itself.
+
+Notes:
+------
+- Route hooks run on the event loop thread, a slow hook delays every client.
+  Coroutine hooks (``async def``) are refused at startup, they need the
+  ``asyncio`` engine.
+- Idle clients only cost a selector registration and a small buffer.
+- With admission control, connections beyond ``max_inflight`` are answered
+  ``503`` at once, the loop cannot park them. The listen backlog is the queue.
+
+Usage Example:
+--------------
+>>> SelectorServer("0.0.0.0", 9000, server_socket, routes={}).serve_forever()
+"""
+
+import functools
+import inspect
+import selectors
+
+from .httpadapter import HttpAdapter
+from .response import ChunkedResponse, FileResponse, RouteResponse, HAS_SENDFILE
+from .reader import RECV_SIZE, RequestError, parse_request
+from .router import Router
+from .timeouts import TimerWheel
+
+
+class SelectorConnection:
+    """Per-client state kept by the :class:`SelectorServer <SelectorServer>`.
+
+    :attrs sock (socket.socket): non-blocking client socket.
+    :attrs addr (tuple): client address (IP, port).
+    :attrs adapter (HttpAdapter): adapter serving the requests of this client.
+    :attrs inbuf (bytearray): bytes received but not yet processed.
+    :attrs outbuf (memoryview): response bytes not yet written.
+    :attrs pending (iterator): chunks of a streamed response not yet produced.
+    :attrs file (FileResponse): file body sent with ``sendfile`` once ``outbuf`` drained.
+    :attrs vector (RouteResponse): head and body written together with ``sendmsg``.
+    :attrs served (int): number of requests answered on this connection.
+    :attrs keep_alive (bool): whether to keep reading once the reply is written.
+    :attrs deadline (ConnectionDeadline): deadline of the current phase.
+    """
+
+    __attrs__ = [
+        "sock",
+        "addr",
+        "adapter",
+        "inbuf",
+        "outbuf",
+        "pending",
+        "file",
+        "vector",
+        "served",
+        "keep_alive",
+        "deadline",
+    ]
+
+    def __init__(self, sock, addr, adapter):
+        self.sock = sock
+        self.addr = addr
+        self.adapter = adapter
+        self.inbuf = bytearray()
+        self.outbuf = memoryview(b"")
+        self.pending = None
+        self.file = None
+        self.vector = None
+        self.served = 0
+        self.keep_alive = False
+        self.deadline = None
+
+
+class SelectorServer:
+    """The :class:`SelectorServer <SelectorServer>` object, a readiness driven
+    HTTP server running every connection on one thread.
+
+    Connections are persistent like with the threaded engines: once a reply is
+    written the connection goes back to reading, pipelined requests are
+    answered in order and idle keep-alive connections are closed after
+    ``keepalive_timeout`` seconds.
+
+    :attrs ip (str): IP address the server is bound to.
+    :attrs port (int): Port number the server is listening on.
+    :attrs server (socket.socket): listening server socket.
+    :attrs routes (dict): Mapping of route paths to handler functions.
+    :attrs adapter_options (dict): settings passed to every HttpAdapter.
+    :attrs admission (AdmissionController): admission control, if enabled.
+    :attrs selector (selectors.BaseSelector): the readiness selector.
+    :attrs wheel (TimerWheel): connection deadlines, advanced by the loop.
+    """
+
+    __attrs__ = [
+        "ip",
+        "port",
+        "server",
+        "routes",
+        "adapter_options",
+        "admission",
+        "selector",
+        "wheel",
+    ]
+
+    def __init__(self, ip, port, server, routes, adapter_options=None):
+        """
+        Initialize a new SelectorServer instance.
+
+        :param ip (str): IP address the server is bound to.
+        :param port (int): Port number the server is listening on.
+        :param server (socket.socket): listening server socket.
+        :param routes (dict): Mapping of route paths to handler functions.
+        :param adapter_options (dict): settings passed to every HttpAdapter.
+
+        :raises ValueError: If a route hook is a coroutine function.
+        """
+        routes = Router.compile(routes)
+        coroutines = sorted("{} {}".format(method, path)
+                            for (method, path), hook in routes.routes.items()
+                            if inspect.iscoroutinefunction(hook))
+        if coroutines:
+            raise ValueError("async def hooks need the asyncio engine: {}".format(
+                ", ".join(coroutines)))
+        self.ip = ip
+        self.port = port
+        self.server = server
+        self.routes = routes
+        self.adapter_options = adapter_options or {}
+        self.admission = self.adapter_options.get("admission")
+        self.selector = selectors.DefaultSelector()
+        self.wheel = TimerWheel()
+
+    def serve_forever(self):
+        """Run the event loop until the listening socket fails."""
+        self.server.setblocking(False)
+        self.selector.register(self.server, selectors.EVENT_READ, None)
+        print("[Backend] Selector engine using {}".format(type(self.selector).__name__))
+
+        try:
+            while True:
+                for key, mask in self.selector.select(timeout=self.wheel.tick):
+                    if key.data is None:
+                        self.accept()
+                        continue
+                    conn = key.data
+                    if mask & selectors.EVENT_READ:
+                        self.on_readable(conn)
+                    if mask & selectors.EVENT_WRITE and conn.sock.fileno() != -1:
+                        self.on_writable(conn)
+                self.wheel.advance()
+        finally:
+            self.selector.close()
+
+    def accept(self):
+        """Accept every pending connection on the listening socket."""
+        while True:
+            try:
+                sock, addr = self.server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            if self.admission is not None and not (
+                    self.admission.reserve() and self.admission.acquire(timeout=0)):
+                self.admission.reject(sock, blocking=False)
+                continue
+            sock.setblocking(False)
+            adapter = HttpAdapter(self.ip, self.port, sock, addr, self.routes,
+                                  **self.adapter_options)
+            conn = SelectorConnection(sock, addr, adapter)
+            conn.deadline = adapter.make_deadline(self.wheel, functools.partial(self.expire, conn))
+            conn.deadline.enter("header")
+            self.selector.register(sock, selectors.EVENT_READ, conn)
+
+    def on_readable(self, conn):
+        """
+        Buffer incoming bytes and dispatch the request once it is complete.
+
+        :param conn (SelectorConnection): the readable connection.
+        """
+        try:
+            data = conn.sock.recv(RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self.close(conn)
+            return
+        if not data:
+            self.close(conn)
+            return
+
+        conn.inbuf += data
+        self.process(conn)
+
+    def process(self, conn):
+        """
+        Answer the next buffered request, if a complete one is available.
+
+        :param conn (SelectorConnection): the connection to serve.
+        """
+        adapter = conn.adapter
+        try:
+            parsed = parse_request(conn.inbuf, adapter.max_header_size, adapter.max_body_size)
+        except RequestError as e:
+            print("[Backend] Rejecting request from {}: {}".format(conn.addr, e))
+            conn.keep_alive = False
+            conn.outbuf = memoryview(adapter.build_error_response(e.status_code, e.reason))
+            conn.deadline.arm("write")
+            self.selector.modify(conn.sock, selectors.EVENT_WRITE, conn)
+            return
+        if parsed is None:
+            if conn.inbuf:
+                conn.deadline.enter("body" if conn.inbuf.find(b"\r\n\r\n") >= 0 else "header")
+            return
+
+        size, head, body = parsed
+        del conn.inbuf[:size]
+        conn.deadline.cancel()
+
+        conn.served += 1
+        response = adapter.handle_request(head, body, self.routes)
+        if not response:
+            self.close(conn)
+            return
+
+        conn.keep_alive = adapter.should_keep_alive(adapter.request, response, conn.served)
+        response = adapter.set_connection_header(response, conn.keep_alive)
+        if isinstance(response, RouteResponse):
+            # Head and body stay two buffers, gathered by sendmsg.
+            conn.vector = response
+            response = b""
+        elif isinstance(response, FileResponse):
+            if HAS_SENDFILE:
+                conn.file = response
+            else:
+                conn.pending = iter(response)
+            response = response.head
+        elif isinstance(response, ChunkedResponse):
+            # Streamed bodies are pulled one chunk at a time as the socket drains.
+            conn.pending = iter(response)
+            response = response.head
+        conn.outbuf = memoryview(response)
+        conn.deadline.arm("write")
+        self.selector.modify(conn.sock, selectors.EVENT_WRITE, conn)
+
+    def on_writable(self, conn):
+        """
+        Write as much of the pending response as the socket accepts.
+
+        :param conn (SelectorConnection): the writable connection.
+        """
+        try:
+            if conn.vector is not None:
+                sent = conn.vector.sendmsg(conn.sock)
+                if conn.vector.remaining <= 0:
+                    conn.vector = None
+            elif conn.outbuf or conn.file is None:
+                sent = conn.sock.send(conn.outbuf)
+            else:
+                # The head is out, the kernel copies the file body itself.
+                sent = conn.file.sendfile(conn.sock)
+                if conn.file.remaining <= 0:
+                    conn.file.close()
+                    conn.file = None
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self.close(conn)
+            return
+
+        conn.outbuf = conn.outbuf[sent:]
+        if sent:
+            # The write deadline bounds stalls, not the length of the reply.
+            conn.deadline.arm("write")
+        while not conn.outbuf and conn.pending is not None:
+            try:
+                conn.outbuf = memoryview(next(conn.pending))
+            except StopIteration:
+                conn.pending = None
+            except Exception as e:
+                print("[Backend] Error while streaming to {}: {}".format(conn.addr, e))
+                self.close(conn)
+                return
+        if conn.outbuf or conn.file is not None or conn.vector is not None:
+            return
+        if not conn.keep_alive:
+            self.close(conn)
+            return
+
+        conn.deadline.arm("idle")
+        self.selector.modify(conn.sock, selectors.EVENT_READ, conn)
+        # A pipelined request may already be waiting in the buffer.
+        self.process(conn)
+
+    def expire(self, conn, phase):
+        """
+        Deadline callback: close a connection whose ``phase`` timed out,
+        answering ``408`` first to a client stuck sending its request.
+
+        :param conn (SelectorConnection): the timed out connection.
+        :param phase (str): the phase that timed out.
+        """
+        if phase in ("header", "body") and conn.inbuf and not conn.outbuf:
+            print("[Backend] Request timeout from {}".format(conn.addr))
+            try:
+                conn.sock.send(conn.adapter.build_error_response(408, "Request Timeout"))
+            except OSError:
+                pass
+        self.close(conn)
+
+    def close(self, conn):
+        """
+        Unregister and close a client connection.
+
+        :param conn (SelectorConnection): the connection to close.
+        """
+        if conn.deadline is not None:
+            conn.deadline.cancel()
+        if conn.pending is not None:
+            conn.pending.close()
+            conn.pending = None
+        if conn.file is not None:
+            conn.file.close()
+            conn.file = None
+        conn.vector = None
+        try:
+            self.selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        else:
+            if self.admission is not None:
+                self.admission.release()
+        try:
+            conn.sock.close()
+        except OSError:
+            pass
+
+
+def serve_selector(ip, port, server, routes, adapter_options=None):
+    """
+    Accept loop of the ``selector`` engine.
+
+    :param ip (str): IP address the server is bound to.
+    :param port (int): Port number the server is listening on.
+    :param server (socket.socket): Listening server socket.
+    :param routes (dict): Dictionary of route handlers.
+    :param adapter_options (dict): settings passed to every HttpAdapter.
+    """
+    SelectorServer(ip, port, server, routes, adapter_options).serve_forever()
@@ -0,0 +1,220 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.health
+~~~~~~~~~~~~~~~~~
+
+This module provides the health of the proxy backends, an
+:class:`UpstreamHealth <UpstreamHealth>` deciding when a backend address
+leaves and rejoins the rotation of every balancer it is a
+:class:`Member <Member>` of.
+
+- Passive checks: every forwarded request reports its outcome. After
+  ``max_fails`` consecutive failures (refused connect, reset, timeout before
+  any response) the member is ejected for ``cooldown`` seconds, and the
+  balancers stop choosing it.
+- Gradual re-admission: once the cool-down ends the member gets a growing
+  share of its traffic back over ``slow_start`` seconds, so a backend that
+  just restarted is not flooded. A single failure meanwhile ejects it again.
+- Active checks: with an ``interval``, a background thread probes every known
+  backend, by a TCP connect or, with a ``path``, by an HTTP ``GET`` whose
+  status must be below 500. A failed probe counts like a failed request, so a
+  dead backend is ejected before clients hit it.
+
+Usage Example:
+--------------
+>>> health = UpstreamHealth(max_fails=3, cooldown=10, interval=5, path="/health")
+>>> health.start()
+>>> health.report(member, ok=False)
+"""
+
+import socket
+import threading
+
+from .balancer import all_members
+
+#: Option names consumed by :func:`configure_upstream_health`.
+HEALTH_OPTIONS = ("health_max_fails", "health_cooldown", "health_slow_start",
+                  "health_interval", "health_path", "health_timeout")
+#: Default consecutive failures ejecting a backend.
+DEFAULT_MAX_FAILS = 3
+#: Default seconds an ejected backend receives no traffic.
+DEFAULT_COOLDOWN = 10.0
+#: Default seconds over which a backend gets its full traffic back.
+DEFAULT_SLOW_START = 10.0
+#: Default seconds allowed to a probe.
+DEFAULT_PROBE_TIMEOUT = 2.0
+
+
+class UpstreamHealth:
+    """The :class:`UpstreamHealth <UpstreamHealth>` object, the passive and
+    active health checks of the backends.
+
+    :attrs max_fails (int): consecutive failures ejecting a backend.
+    :attrs cooldown (float): seconds an ejected backend receives no traffic.
+    :attrs slow_start (float): seconds over which it gets its traffic back.
+    :attrs interval (float): seconds between two probe rounds, None to only
+                             check passively.
+    :attrs path (str): path probed with ``GET``, None for a TCP connect.
+    :attrs timeout (float): seconds allowed to a probe.
+    """
+
+    __attrs__ = [
+        "max_fails",
+        "cooldown",
+        "slow_start",
+        "interval",
+        "path",
+        "timeout",
+    ]
+
+    def __init__(self, max_fails=DEFAULT_MAX_FAILS, cooldown=DEFAULT_COOLDOWN,
+                 slow_start=DEFAULT_SLOW_START, interval=None, path=None,
+                 timeout=DEFAULT_PROBE_TIMEOUT):
+        """
+        Initialize a new UpstreamHealth instance.
+
+        :param max_fails (int): consecutive failures ejecting a backend,
+                                0 disables ejection.
+        :param cooldown (float): seconds an ejected backend receives no traffic.
+        :param slow_start (float): seconds over which it gets its traffic back.
+        :param interval (float): seconds between two probe rounds, None to
+                                 only check passively.
+        :param path (str): path probed with ``GET``, None for a TCP connect.
+        :param timeout (float): seconds allowed to a probe.
+        """
+        self.max_fails = max_fails
+        self.cooldown = cooldown
+        self.slow_start = slow_start
+        self.interval = interval
+        self.path = path
+        self.timeout = timeout
+
+        self._thread = None
+        self._stop = threading.Event()
+
+    def report(self, member, ok):
+        """
+        Account for the outcome of a request or probe.
+
+        :param member (Member): the backend.
+        :param ok (bool): whether it answered.
+        """
+        health = member.health
+        with health.lock:
+            if ok:
+                health.failures = 0
+                return
+            if not self.max_fails:
+                return
+            health.failures += 1
+            # A recovering backend is given no second chance.
+            if health.failures < self.max_fails and not health.recovering:
+                return
+            if not health.ejected:
+                print("[Health] Ejecting {} for {}s after {} failure(s)".format(
+                    member.address, self.cooldown, health.failures))
+            health.eject(self.cooldown, self.slow_start)
+
+    def probe(self, host, port):
+        """
+        Check one backend.
+
+        :param host (str): backend address.
+        :param port (int): backend port.
+
+        :rtype bool: True if it accepts connections (and answers the probe
+                     path below 500).
+        """
+        try:
+            with socket.create_connection((host, port), timeout=self.timeout) as sock:
+                if self.path is None:
+                    return True
+                sock.sendall((
+                    "GET {} HTTP/1.1\r\n"
+                    "Host: {}:{}\r\n"
+                    "Connection: close\r\n"
+                    "\r\n"
+                ).format(self.path, host, port).encode("utf-8"))
+                status_line = sock.recv(64).split(b"\r\n", 1)[0].split()
+        except OSError:
+            return False
+        return len(status_line) >= 2 and status_line[1].isdigit() and int(status_line[1]) < 500
+
+    def check(self):
+        """
+        Run one probe round over every known backend, each address once:
+        the members of an address share its health.
+
+        :rtype dict: address -> probe outcome.
+        """
+        members = {}
+        for member in all_members():
+            members.setdefault((member.host, member.port), member)
+        results = {}
+        for (host, port), member in members.items():
+            ok = self.probe(host, port)
+            results[member.address] = ok
+            self.report(member, ok)
+        return results
+
+    def start(self):
+        """Start the probe thread, if an interval is set."""
+        if not self.interval or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="upstream-health", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the probe thread."""
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print("[Health] Probe round failed: {}".format(e))
+
+
+_upstream_health = UpstreamHealth()
+
+
+def upstream_health():
+    """
+    Returns the process wide health checks used by the proxy.
+
+    :rtype UpstreamHealth: the shared health checks.
+    """
+    return _upstream_health
+
+
+def configure_upstream_health(options):
+    """
+    Replaces the shared health checks according to the ``health_max_fails``,
+    ``health_cooldown``, ``health_slow_start``, ``health_interval``,
+    ``health_path`` and ``health_timeout`` entries of ``options``, removing
+    them from it, and starts the probes when an interval is set.
+
+    :param options (dict): proxy settings.
+
+    :rtype UpstreamHealth: the shared health checks.
+    """
+    global _upstream_health
+    settings = {key: options.pop(key) for key in HEALTH_OPTIONS if key in options}
+    settings = {key[len("health_"):]: value for key, value in settings.items() if value is not None}
+    if settings:
+        _upstream_health.stop()
+        _upstream_health = UpstreamHealth(**settings)
+    _upstream_health.start()
+    return _upstream_health
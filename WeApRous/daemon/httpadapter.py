@@ -20,9 +20,70 @@ raw URL paths and RESTful route definitions, and integrates with
 Request and Response objects to handle client-server communication.
 """
 
+import asyncio
+import inspect
+import threading
+
+import socket
+
 from .request import Request
-from .response import Response
+from .router import wants_request
+from .staticcache import static_cache
+from .response import Response, ChunkedResponse, FileResponse, RouteResponse
 from .dictionary import CaseInsensitiveDict
+from .compression import compress_response, DEFAULT_MIN_SIZE
+from .reader import (
+    RequestReader,
+    RequestError,
+    DEFAULT_MAX_HEADER_SIZE,
+    DEFAULT_MAX_BODY_SIZE,
+)
+from .timeouts import (
+    ConnectionDeadline,
+    default_wheel,
+    shutdown_on_expire,
+    DEFAULT_HEADER_TIMEOUT,
+    DEFAULT_BODY_TIMEOUT,
+    DEFAULT_WRITE_TIMEOUT,
+)
+
+#: Default seconds an idle keep-alive connection waits for its next request.
+DEFAULT_KEEPALIVE_TIMEOUT = 5.0
+#: Default number of requests served on one connection before it is closed.
+DEFAULT_MAX_KEEPALIVE_REQUESTS = 100
+
+#: Keyword settings accepted by :class:`HttpAdapter <HttpAdapter>`, the backend
+#: picks them out of its options and hands them to every adapter.
+ADAPTER_OPTIONS = (
+    "keepalive_timeout",
+    "max_keepalive_requests",
+    "max_header_size",
+    "max_body_size",
+    "header_timeout",
+    "body_timeout",
+    "write_timeout",
+    "compress_min_size",
+)
+
+_hook_loop = None
+_hook_loop_lock = threading.Lock()
+
+
+def hook_loop():
+    """
+    Returns the event loop running the coroutine hooks of the thread and
+    pool engines, started in a daemon thread on first use. One loop serves
+    the whole process instead of a new loop per request.
+
+    :rtype asyncio.AbstractEventLoop: the running loop.
+    """
+    global _hook_loop
+    with _hook_loop_lock:
+        if _hook_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="hook-loop", daemon=True).start()
+            _hook_loop = loop
+        return _hook_loop
 
 class HttpAdapter:
     """
@@ -42,6 +103,16 @@ class HttpAdapter:
         routes (dict): Mapping of route paths to handler functions.
         request (Request): Request object for parsing incoming data.
         response (Response): Response object for building and sending replies.
+        keepalive_timeout (float): idle seconds allowed between two requests.
+        max_keepalive_requests (int): requests served before closing the connection.
+        max_header_size (int): cap on the request line plus headers, in bytes.
+        max_body_size (int): cap on the request body, in bytes.
+        header_timeout (float): seconds allowed to receive the request headers.
+        body_timeout (float): seconds allowed to receive the request body.
+        write_timeout (float): seconds allowed to send a response or a chunk.
+        compress_min_size (int): smallest hook reply body compressed, None disables it.
+        admission (AdmissionController): admission control of the daemon, if any.
+        deadline (ConnectionDeadline): deadline of the connection being served.
     """
 
     __attrs__ = [
@@ -52,9 +123,28 @@ class HttpAdapter:
         "routes",
         "request",
         "response",
+        "keepalive_timeout",
+        "max_keepalive_requests",
+        "max_header_size",
+        "max_body_size",
+        "header_timeout",
+        "body_timeout",
+        "write_timeout",
+        "compress_min_size",
+        "admission",
+        "deadline",
     ]
 
-    def __init__(self, ip, port, conn, connaddr, routes):
+    def __init__(self, ip, port, conn, connaddr, routes,
+                 keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+                 max_keepalive_requests=DEFAULT_MAX_KEEPALIVE_REQUESTS,
+                 max_header_size=DEFAULT_MAX_HEADER_SIZE,
+                 max_body_size=DEFAULT_MAX_BODY_SIZE,
+                 header_timeout=DEFAULT_HEADER_TIMEOUT,
+                 body_timeout=DEFAULT_BODY_TIMEOUT,
+                 write_timeout=DEFAULT_WRITE_TIMEOUT,
+                 compress_min_size=DEFAULT_MIN_SIZE,
+                 admission=None):
         """
         Initialize a new HttpAdapter instance.
 
@@ -63,6 +153,20 @@ class HttpAdapter:
         :param conn (socket): Active socket connection.
         :param connaddr (tuple): Address of the connected client.
         :param routes (dict): Mapping of route paths to handler functions.
+        :param keepalive_timeout (float): idle seconds allowed between two requests.
+        :param max_keepalive_requests (int): requests served before closing the
+                                             connection, 1 disables keep-alive.
+        :param max_header_size (int): cap on the request line plus headers, in bytes.
+        :param max_body_size (int): cap on the request body, in bytes.
+        :param header_timeout (float): seconds allowed to receive the request headers.
+        :param body_timeout (float): seconds allowed to receive the request body.
+        :param write_timeout (float): seconds allowed to send a response or a chunk.
+        :param compress_min_size (int): smallest hook reply body compressed for
+                                        clients accepting gzip or deflate,
+                                        None disables the compression.
+        :param admission (AdmissionController): admission control of the daemon,
+                                                keep-alive is cut short while
+                                                connections wait for a slot.
         """
 
         #: IP address.
@@ -79,6 +183,42 @@ class HttpAdapter:
         self.request = Request()
         #: Response
         self.response = Response()
+        #: Keep-alive idle timeout
+        self.keepalive_timeout = keepalive_timeout
+        #: Keep-alive request limit
+        self.max_keepalive_requests = max_keepalive_requests
+        #: Request header size cap
+        self.max_header_size = max_header_size
+        #: Request body size cap
+        self.max_body_size = max_body_size
+        #: Request header read timeout
+        self.header_timeout = header_timeout
+        #: Request body read timeout
+        self.body_timeout = body_timeout
+        #: Response write timeout
+        self.write_timeout = write_timeout
+        #: Hook reply compression threshold
+        self.compress_min_size = compress_min_size
+        #: Admission control
+        self.admission = admission
+        #: Connection deadline
+        self.deadline = None
+
+    def make_deadline(self, wheel, on_expire):
+        """
+        Build the deadline of a connection from the adapter timeouts, the
+        keep-alive timeout bounding the ``idle`` phase.
+
+        :param wheel (TimerWheel): wheel the deadline is scheduled on.
+        :param on_expire (callable): called with the phase that timed out.
+
+        :rtype ConnectionDeadline: the deadline, not armed yet.
+        """
+        return ConnectionDeadline(wheel, on_expire,
+                                  header_timeout=self.header_timeout,
+                                  body_timeout=self.body_timeout,
+                                  idle_timeout=self.keepalive_timeout,
+                                  write_timeout=self.write_timeout)
 
     def handle_login(self, req, resp, body):
         """
@@ -87,15 +227,8 @@ class HttpAdapter:
         - If admin/password, returns 200 OK, index.html, and Set-Cookie
         - Otherwise, returns 401 Unauthorized
         """
-        creds = {}
-        # Parse simple form body (from the raw body text)
-        for pair in body.split("&"):
-            if "=" in pair:
-                try:
-                    k, v = pair.split("=", 1)
-                    creds[k] = v
-                except ValueError:
-                    pass # ignore malformed pairs
+        # Form fields are parsed (and URL decoded) once, by the request
+        creds = req.form
 
         print(f"[HttpAdapter] Login attempt with creds: {creds}")
 
@@ -106,8 +239,7 @@ class HttpAdapter:
             # Get the index.html content
             try:
                 # Assumes the server is run from the `http_daemon` root directory
-                with open('www/index.html', 'rb') as f:
-                    html_content = f.read()
+                html_content = static_cache().read('www/index.html')
             except Exception as e:
                 print(f"[HttpAdapter] ERROR: Could not read www/index.html: {e}")
                 html_content = b"<html><body>Login OK but no index.html found.</body></html>"
@@ -130,7 +262,7 @@ class HttpAdapter:
             response = (
                 "HTTP/1.1 401 Unauthorized\r\n"
                 "Content-Type: text/html\r\n"
-                "Content-Length: 22\r\n"
+                "Content-Length: 25\r\n"
                 "Connection: close\r\n"
                 "\r\n"
                 "<h1>401 Unauthorized</h1>"
@@ -140,106 +272,437 @@ class HttpAdapter:
     def handle_client(self, conn, addr, routes):
         """
         Handle an incoming client connection.
+
+        Requests are served in a loop while the connection stays persistent
+        (HTTP/1.1 keep-alive). Pipelined requests already buffered are answered
+        in the order they arrived. The connection is closed when the client asks
+        for it, when the idle timeout expires or after ``max_keepalive_requests``.
+        Reading headers, reading the body and writing the reply are each bounded
+        by a deadline on the shared timer wheel.
         """
 
         # Connection handler.
         self.conn = conn        
         # Connection address.
         self.connaddr = addr
-        # Request handler
-        req = self.request
-        # Response handler
-        resp = self.response
 
+        self.deadline = self.make_deadline(default_wheel(), shutdown_on_expire(conn))
+        reader = RequestReader(conn, self.max_header_size, self.max_body_size, self.deadline)
+        self.deadline.enter("header")
+        served = 0
+        # Once part of a reply is on the wire a 500 can no longer be sent.
+        replying = False
         try:
-            # Handle the request
-            msg = conn.recv(1024).decode()
-
-            body = ""
-            if "\r\n\r\n" in msg:
-                parts = msg.split("\r\n\r\n", 1)
-                if len(parts) > 1:
-                    body = parts[1]
-                    
-            req.prepare(msg, routes)
-
-            # ---  TASK 1A (Login Bypass) ---
-            # Check for POST /login *before* the cookie guard
-            if req.method == "POST" and req.path == "/login.html":
-                print("[HttpAdapter] TASK 1A: Handling /login bypass")
-                # Call our new login handler
-                login_response = self.handle_login(req, resp, body)
-                conn.sendall(login_response)
+            while True:
+                # Handle the request
+                try:
+                    request = reader.read_request()
+                except RequestError as e:
+                    print("[HttpAdapter] Rejecting request from {}: {}".format(addr, e))
+                    self.send_response(conn, self.build_error_response(e.status_code, e.reason))
+                    break
+                if request is None:
+                    break
+
+                # Route hooks are not bounded by the connection deadlines.
+                self.deadline.cancel()
+                served += 1
+                response = self.handle_request(*request, routes)
+                keep_alive = self.should_keep_alive(self.request, response, served)
+                if response:
+                    replying = True
+                    self.send_response(conn, self.set_connection_header(response, keep_alive))
+                    replying = False
+                if not keep_alive:
+                    break
+
+                self.deadline.arm("idle")
+        except Exception as e:
+            if self.deadline.expired:
+                print("[HttpAdapter] {} timeout for {}".format(self.deadline.expired, addr))
+            else:
+                print(f"[HttpAdapter] Error in handle_client: {e}")
+            try:
+                if not replying:
+                    conn.sendall(self.build_server_error())
+            except:
+                pass # Connection may be dead
+        finally:
+            self.deadline.cancel()
+            try:
                 conn.close()
-                return # Login handled, we are done.
+            except:
+                pass
 
-            # --- TASK 1B: COOKIE-BASED ACCESS CONTROL ---
-            # This code is now only reached if the request is NOT POST /login.
-            
-            protected_path = '/index.html' 
-            if req.path == '/':
-                req.path = '/index.html'
-                
-            if req.path == protected_path:
-                # req.cookies is populated by req.prepare()
-                if req.cookies.get('auth') != 'true':
-                    print("[HttpAdapter] TASK 1B: UNAUTHORIZED access to {}. Missing or invalid cookie.".format(req.path))
-                    
-                    # Send 401 Unauthorized page (as per Task 1B)
-                    response = (
-                        "HTTP/1.1 401 Unauthorized\r\n"
-                        "Content-Type: text/html\r\n"
-                        "Content-Length: 22\r\n"
-                        "Connection: close\r\n"
-                        "\r\n"
-                        "<h1>401 Unauthorized</h1>"
-                    ).encode('utf-8')
-                    
-                    conn.sendall(response)
-                    conn.close()
-                    return
-
-            # --- Handle other hooks (if any) or static files ---
-            
-            # Check for other hooks (that were not /login)
-            if req.hook: 
-                print("[HttpAdapter] Handling other hook for: {}".format(req.path))
-                hook_result = req.hook(headers=req.headers, body=body)
-                if hook_result is not None:
-                    if isinstance(hook_result, bytes):
-                        conn.sendall(hook_result)
-                    elif isinstance(hook_result, str):
-                        conn.sendall(hook_result.encode('utf-8'))
-                    conn.close()
-                    return
+    def handle_request(self, head, body, routes):
+        """
+        Process one complete HTTP request and build the reply.
+
+        This is the socket independent part of :meth:`handle_client`, so server
+        engines that buffer requests themselves (e.g. the selector engine) can
+        reuse the login, cookie guard, route hook and static file logic.
+
+        :param head (RequestHead): the parsed request line and headers.
+        :param body (bytes): the (de-chunked) request body.
+        :param routes (dict): Mapping of route paths to handler functions.
+
+        :rtype bytes: the raw HTTP response to send back to the client, or a
+                      :class:`ChunkedResponse <ChunkedResponse>` for streamed bodies.
+        """
+
+        try:
+            body = self.prepare_request(head, body, routes)
+            return self.dispatch(self.request, body)
+        except RequestError as e:
+            print("[HttpAdapter] Rejecting request: {}".format(e))
+            return self.build_error_response(e.status_code, e.reason)
+        except Exception as e:
+            print(f"[HttpAdapter] Error in handle_request: {e}")
+            return self.build_server_error()
+
+    def prepare_request(self, head, body, routes):
+        """
+        Load the parsed request into a fresh :attr:`request` and decode its body.
+
+        A new :class:`Request <Request>` and :class:`Response <Response>` pair is
+        created for every request, so nothing leaks between requests served on
+        the same keep-alive connection. Only the body is decoded here, the head
+        was parsed once by the reader and its header values decode on access.
+
+        :param head (RequestHead): the parsed request line and headers.
+        :param body (bytes): the (de-chunked) request body.
+        :param routes (dict): Mapping of route paths to handler functions.
+
+        :rtype str: the request body.
+
+        :raises RequestError: If the request line is malformed.
+        """
+        self.request = Request()
+        self.response = Response()
+
+        self.request.prepare(head, routes)
+        self.request.body = body.decode('utf-8', errors='replace') if body else ""
+        return self.request.body
+
+    def dispatch(self, req, body):
+        """
+        Build the reply of a prepared request: access checks first, then the
+        route hook (or the automatic 405 / ``OPTIONS`` reply), then the static
+        file handler.
+
+        :param req (Request): the prepared :class:`Request <Request>`.
+        :param body (str): the request body.
 
+        :rtype bytes: the raw HTTP response.
+        """
+        response = self.check_access(req, body)
+        if response is None:
+            response = self.build_method_response(req)
+
+        # --- Handle other hooks (if any) or static files ---
+        if response is None and req.hook:
+            response = self.run_hook(req, body)
+
+        if response is None:
             # Build response for static files
             # (This will now correctly serve /index.html if cookie was valid)
-            response = resp.build_response(req)
+            response = self.response.build_response(req)
+        return response
 
-            #print(response)
-            conn.sendall(response)
+    def check_access(self, req, body):
+        """
+        Apply the login bypass and the cookie guard of Task 1.
+
+        :param req (Request): the prepared :class:`Request <Request>`.
+        :param body (str): the request body.
+
+        :rtype bytes: the login or 401 response, or None if the request may proceed.
+        """
+        # ---  TASK 1A (Login Bypass) ---
+        # Check for POST /login *before* the cookie guard
+        if req.method == "POST" and req.path == "/login.html":
+            print("[HttpAdapter] TASK 1A: Handling /login bypass")
+            # Call our new login handler
+            return self.handle_login(req, self.response, body)
+
+        # --- TASK 1B: COOKIE-BASED ACCESS CONTROL ---
+        # This code is now only reached if the request is NOT POST /login.
+        
+        protected_path = '/index.html' 
+        if req.path == '/':
+            req.path = '/index.html'
             
-        except Exception as e:
-            print(f"[HttpAdapter] Error in handle_client: {e}")
-            # Send a 500
-            try:
-                error_response = (
-                    "HTTP/1.1 500 Internal Server Error\r\n"
+        if req.path == protected_path:
+            # req.cookies is populated by req.prepare()
+            if req.cookies.get('auth') != 'true':
+                print("[HttpAdapter] TASK 1B: UNAUTHORIZED access to {}. Missing or invalid cookie.".format(req.path))
+                
+                # Send 401 Unauthorized page (as per Task 1B)
+                return (
+                    "HTTP/1.1 401 Unauthorized\r\n"
                     "Content-Type: text/html\r\n"
-                    "Content-Length: 22\r\n"
+                    "Content-Length: 25\r\n"
                     "Connection: close\r\n"
                     "\r\n"
-                    "<h1>500 Server Error</h1>"
+                    "<h1>401 Unauthorized</h1>"
                 ).encode('utf-8')
-                conn.sendall(error_response)
-            except:
-                pass # Connection may be dead
-        finally:
-            try:
-                conn.close()
-            except:
-                pass
+        return None
+
+    def build_method_response(self, req):
+        """
+        Answer a request whose path has routes but none for its method:
+        ``OPTIONS`` gets ``204 No Content``, any other method gets
+        ``405 Method Not Allowed``, both listing the declared methods in ``Allow``.
+
+        :param req (Request): the prepared :class:`Request <Request>`.
+
+        :rtype bytes: the raw HTTP response, or None if the request has a hook
+                      or no route matches its path.
+        """
+        if req.hook or not req.allowed:
+            return None
+        allow = ", ".join(req.allowed)
+        if req.method == "OPTIONS":
+            return (
+                "HTTP/1.1 204 No Content\r\n"
+                "Allow: {}\r\n"
+                "Content-Length: 0\r\n"
+                "\r\n"
+            ).format(allow).encode('utf-8')
+
+        body = "405 Method Not Allowed"
+        return (
+            "HTTP/1.1 405 Method Not Allowed\r\n"
+            "Allow: {}\r\n"
+            "Content-Type: text/plain\r\n"
+            "Content-Length: {}\r\n"
+            "\r\n"
+            "{}"
+        ).format(allow, len(body), body).encode('utf-8')
+
+    def run_hook(self, req, body):
+        """
+        Call the route hook of the request from synchronous code.
+
+        Coroutine hooks (``async def``) are run on the shared
+        :func:`hook_loop` while the calling thread waits for their result, so
+        they also work with the thread and pool engines. The selector engine
+        refuses them, waiting would stall its event loop.
+
+        :param req (Request): the prepared :class:`Request <Request>`.
+        :param body (str): the request body.
+
+        :rtype bytes: the hook response, or None to fall back to static files.
+        """
+        print("[HttpAdapter] Handling other hook for: {}".format(req.path))
+        hook_result = req.hook(**self.hook_arguments(req, body))
+        if inspect.isawaitable(hook_result):
+            hook_result = asyncio.run_coroutine_threadsafe(hook_result, hook_loop()).result()
+        return self.build_hook_response(hook_result)
+
+    def hook_arguments(self, req, body):
+        """
+        Keyword arguments of a route hook call: the path parameters plus the
+        :class:`Request <Request>` itself, or the legacy ``headers`` and ``body``.
+
+        :param req (Request): the prepared :class:`Request <Request>`.
+        :param body (str): the request body.
+
+        :rtype dict: the keyword arguments.
+        """
+        if wants_request(req.hook):
+            return dict(req.params, request=req)
+        return dict(req.params, headers=req.headers, body=body)
+
+    def build_hook_response(self, hook_result):
+        """
+        Convert the value returned by a route hook into response bytes.
+
+        Generators, iterators and file-like objects are not read here; they are
+        wrapped in a :class:`ChunkedResponse <ChunkedResponse>` and streamed.
+        A :class:`RouteResponse <RouteResponse>`, a ``(status, headers, body)``
+        tuple or a ``dict`` / ``list`` (sent as JSON) is serialized by the
+        response itself. Buffered replies are compressed when the client
+        accepts it and the body reaches :attr:`compress_min_size`.
+
+        :param hook_result: the hook return value (bytes, str, RouteResponse,
+                            tuple, dict, ChunkedResponse, iterator, file-like
+                            object or None).
+
+        :rtype bytes: the raw HTTP response, a RouteResponse, a ChunkedResponse,
+                      or None if the hook returned None.
+        """
+        if hook_result is None:
+            return None
+        if isinstance(hook_result, bytes):
+            return self.compress(hook_result)
+        elif isinstance(hook_result, str):
+            return self.compress(hook_result.encode('utf-8'))
+        elif isinstance(hook_result, ChunkedResponse):
+            return hook_result
+        elif isinstance(hook_result, (RouteResponse, tuple, dict, list)):
+            return self.compress(RouteResponse.coerce(hook_result)).to_wire()
+        elif ChunkedResponse.is_streamable(hook_result):
+            return ChunkedResponse(hook_result)
+        return b""
+
+    def compress(self, response):
+        """
+        Compress a hook reply for the current request.
+
+        :param response: the raw HTTP response, or a RouteResponse.
+
+        :rtype: the response, encoded if the client accepts gzip or deflate.
+        """
+        headers = self.request.headers
+        if self.compress_min_size is None or not headers:
+            return response
+        if isinstance(response, RouteResponse):
+            return response.compress(headers.get('accept-encoding'), self.compress_min_size)
+        return compress_response(response, headers.get('accept-encoding'), self.compress_min_size)
+
+    def send_response(self, conn, response):
+        """
+        Write a response on a blocking socket.
+
+        :param conn (socket): the client socket.
+        :param response: response bytes, a :class:`ChunkedResponse <ChunkedResponse>`,
+                         whose chunks are written as they are produced, a
+                         :class:`FileResponse <FileResponse>` sent with ``sendfile``
+                         or a :class:`RouteResponse <RouteResponse>` written with
+                         ``sendmsg``.
+        """
+        deadline = self.deadline
+        if deadline is not None:
+            deadline.arm("write")
+        if isinstance(response, RouteResponse):
+            for _ in response.send(conn):
+                if deadline is not None:
+                    deadline.arm("write")
+        elif isinstance(response, FileResponse):
+            conn.sendall(response.head)
+            for _ in response.send(conn):
+                if deadline is not None:
+                    deadline.arm("write")
+        elif isinstance(response, ChunkedResponse):
+            conn.sendall(response.head)
+            for chunk in response:
+                if deadline is not None:
+                    # A slow stream is fine as long as every chunk goes out in time.
+                    deadline.arm("write")
+                conn.sendall(chunk)
+        else:
+            conn.sendall(response)
+
+    def should_keep_alive(self, req, response, served):
+        """
+        Decide whether the connection stays open after this response.
+
+        HTTP/1.1 connections are persistent unless the client sends
+        ``Connection: close``; HTTP/1.0 clients must ask for ``keep-alive``.
+        A response without ``Content-Length`` or chunked encoding cannot be
+        delimited, so it always ends the connection, except ``204`` and
+        ``304`` which never have a body. Streamed bodies are only chunked for
+        HTTP/1.1 clients, older ones read them until the connection closes.
+
+        :param req (Request): the request just served.
+        :param response (bytes): the raw HTTP response or a ChunkedResponse.
+        :param served (int): number of requests served on this connection.
+
+        :rtype bool: True to keep the connection open.
+        """
+        if not response or served >= self.max_keepalive_requests:
+            return False
+        if self.admission is not None and self.admission.busy():
+            # Hand the slot over to a waiting connection.
+            return False
+        if not req.headers or not req.version:
+            return False
+
+        connection = req.headers.get('connection', '').lower()
+        if req.version == 'HTTP/1.1':
+            keep_alive = 'close' not in connection
+        else:
+            keep_alive = 'keep-alive' in connection
+        if not keep_alive:
+            return False
+        if isinstance(response, ChunkedResponse):
+            return response.length is not None or req.version == 'HTTP/1.1'
+        if isinstance(response, (FileResponse, RouteResponse)):
+            return True
+
+        head = response.split(b"\r\n\r\n", 1)[0].lower()
+        return b"\r\ncontent-length:" in head or head[9:12] in (b"204", b"304")
+
+    def set_connection_header(self, response, keep_alive):
+        """
+        Replace the ``Connection`` header of a serialized response.
+
+        Handlers and the static builder emit ``Connection: close`` by habit; the
+        adapter owns the connection, so it rewrites the header to match the
+        keep-alive decision. A streamed body for a client older than HTTP/1.1
+        loses its chunked framing here, see :meth:`ChunkedResponse.close_delimited`.
+
+        :param response (bytes): the raw HTTP response, or a ChunkedResponse,
+                                 FileResponse or RouteResponse whose head is
+                                 rewritten in place.
+        :param keep_alive (bool): whether the connection stays open.
+
+        :rtype bytes: the response with an accurate ``Connection`` header.
+        """
+        if isinstance(response, ChunkedResponse) and getattr(self.request, 'version', None) != 'HTTP/1.1':
+            response.close_delimited()
+        if isinstance(response, (ChunkedResponse, FileResponse, RouteResponse)):
+            response.head = self.set_connection_header(response.head, keep_alive)
+            return response
+
+        head_end = response.find(b"\r\n\r\n")
+        if head_end < 0:
+            return response
+
+        lines = [line for line in response[:head_end].split(b"\r\n")
+                 if not line.lower().startswith((b"connection:", b"keep-alive:"))]
+        if keep_alive:
+            lines.append(b"Connection: keep-alive")
+            lines.append("Keep-Alive: timeout={}, max={}".format(
+                int(self.keepalive_timeout), self.max_keepalive_requests).encode())
+        else:
+            lines.append(b"Connection: close")
+        return b"\r\n".join(lines) + response[head_end:]
+
+    def build_error_response(self, status_code, reason):
+        """
+        Constructs a minimal HTTP error response that closes the connection.
+
+        :param status_code (int): HTTP status code, e.g. 400 or 413.
+        :param reason (str): matching reason phrase.
+
+        :rtype bytes: Encoded error response.
+        """
+        body = "<h1>{} {}</h1>".format(status_code, reason)
+        return (
+            "HTTP/1.1 {} {}\r\n"
+            "Content-Type: text/html\r\n"
+            "Content-Length: {}\r\n"
+            "Connection: close\r\n"
+            "\r\n"
+            "{}"
+        ).format(status_code, reason, len(body), body).encode('utf-8')
+
+    def build_server_error(self):
+        """
+        Constructs a standard 500 Internal Server Error HTTP response.
+
+        :rtype bytes: Encoded 500 response.
+        """
+        return (
+            "HTTP/1.1 500 Internal Server Error\r\n"
+            "Content-Type: text/html\r\n"
+            "Content-Length: 25\r\n"
+            "Connection: close\r\n"
+            "\r\n"
+            "<h1>500 Server Error</h1>"
+        ).encode('utf-8')
 
     @property
     def extract_cookies(self, req, resp):
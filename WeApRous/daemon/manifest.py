@@ -0,0 +1,243 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.manifest
+~~~~~~~~~~~~~~~~~
+
+This module provides the :class:`AssetManifest <AssetManifest>`, the index of
+the static files of a WeApRous application, built once at startup.
+
+The manifest walks ``www/``, ``static/`` and ``apps/`` and records, for every
+URL path that resolves to one of their files, the MIME type and the location
+on disk. Sizes and validators are left to the
+:class:`StaticCache <StaticCache>`, which revalidates them. Serving a static file is then a single dict lookup
+instead of a MIME guess, the directory branching of :func:`locate` and a path
+join; a path missing from the manifest is answered ``404`` without touching
+the filesystem (which also rules out ``..`` escapes).
+
+Files added or removed while the server runs are picked up when a watch
+interval is set: the manifest rescans its directories, from the request path,
+at most once per interval. Changes to the content of a known file are already
+caught by the :class:`StaticCache <StaticCache>` revalidation.
+
+Usage Example:
+--------------
+>>> manifest = AssetManifest(watch_interval=5)
+>>> asset = manifest.get("/css/styles.css")
+>>> asset.path, asset.mime_type
+('static/css/styles.css', 'text/css')
+"""
+
+import mimetypes
+import os
+import threading
+import time
+from urllib.parse import unquote
+
+#: Option names consumed by :func:`configure_asset_manifest`.
+ASSET_MANIFEST_OPTIONS = ("asset_manifest", "asset_watch")
+#: Directories indexed by default, the ones :func:`locate` serves from.
+DEFAULT_ASSET_DIRS = ("www", "static", "apps")
+
+
+def locate(mime_type):
+    """
+    Resolves the directory serving a MIME type: pages from ``www/``, styles,
+    scripts, images and other assets from ``static/``.
+
+    :param mime_type (str): MIME type of the requested resource.
+
+    :rtype tuple: (content type to send, base directory with a trailing slash).
+    """
+    main_type, _, sub_type = mime_type.partition('/')
+
+    if main_type == 'text':
+        if sub_type == 'html':
+            return mime_type, "www/"
+        # text/css, text/javascript, text/plain and other text types
+        return mime_type, "static/"
+
+    if main_type == 'application':
+        if sub_type in ('javascript', 'x-javascript'):
+            return 'application/javascript', "static/"
+        # e.g. application/json, application/octet-stream
+        return mime_type, "apps/"
+
+    # image/png, image/x-icon, image/svg+xml... and unknown main types
+    return mime_type, "static/"
+
+
+def guess_mime_type(path):
+    """
+    MIME type of a path from its extension.
+
+    :param path (str): URL path or file name.
+
+    :rtype str: the MIME type, ``application/octet-stream`` if unknown.
+    """
+    try:
+        mime_type, _ = mimetypes.guess_type(path)
+    except Exception:
+        return 'application/octet-stream'
+    return mime_type or 'application/octet-stream'
+
+
+class Asset:
+    """A static file listed in the :class:`AssetManifest <AssetManifest>`.
+
+    :attrs url (str): URL path, e.g. ``/css/styles.css``.
+    :attrs path (str): location on disk, e.g. ``static/css/styles.css``.
+    :attrs mime_type (str): ``Content-Type`` of the file.
+    """
+
+    __slots__ = ("url", "path", "mime_type")
+
+    def __init__(self, url, path, mime_type):
+        self.url = url
+        self.path = path
+        self.mime_type = mime_type
+
+    def __repr__(self):
+        return "<Asset {} -> {} ({})>".format(self.url, self.path, self.mime_type)
+
+
+class AssetManifest:
+    """The :class:`AssetManifest <AssetManifest>` object, a URL path ->
+    :class:`Asset <Asset>` index of the static directories.
+
+    :attrs directories (tuple): indexed directories.
+    :attrs watch_interval (float): seconds between two rescans, None to
+                                   index once.
+    """
+
+    __attrs__ = [
+        "directories",
+        "watch_interval",
+    ]
+
+    def __init__(self, directories=DEFAULT_ASSET_DIRS, watch_interval=None):
+        """
+        Initialize a new AssetManifest instance and index the directories.
+
+        :param directories (iterable): directories to index, relative to the
+                                       working directory like the responses.
+        :param watch_interval (float): seconds between two rescans, None to
+                                       index once.
+        """
+        self.directories = tuple(directories)
+        self.watch_interval = watch_interval
+
+        self._assets = {}
+        self._scanned = 0.0
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def get(self, url):
+        """
+        Look a URL path up.
+
+        :param url (str): request path, a query string is ignored.
+
+        :rtype Asset: the file serving this path, None if there is none.
+        """
+        if self.watch_interval and time.monotonic() - self._scanned >= self.watch_interval:
+            self.refresh(wait=False)
+        return self._assets.get(unquote(url.split('?', 1)[0]))
+
+    def refresh(self, wait=True):
+        """
+        Rescan the directories and swap the index in one assignment, so
+        lookups never see a half built manifest.
+
+        :param wait (bool): False to skip the rescan if another thread is
+                            already running one.
+
+        :rtype int: number of indexed files.
+        """
+        if not self._lock.acquire(blocking=wait):
+            return len(self._assets)
+        try:
+            self._assets = self.scan()
+            self._scanned = time.monotonic()
+            return len(self._assets)
+        finally:
+            self._lock.release()
+
+    def scan(self):
+        """
+        Walk the directories.
+
+        A file is indexed under ``/`` + its path relative to its directory,
+        only if that URL resolves back to this directory (e.g. a page of
+        ``static/`` is not reachable, :func:`locate` serves pages from ``www/``).
+        Empty files are skipped, they are answered ``404``, and so are
+        ``__pycache__`` directories.
+
+        :rtype dict: URL path -> :class:`Asset <Asset>`.
+        """
+        assets = {}
+        for directory in self.directories:
+            base = directory.rstrip('/') + '/'
+            for root, dirs, files in os.walk(directory):
+                dirs[:] = [name for name in dirs if name != "__pycache__"]
+                for name in files:
+                    path = os.path.join(root, name)
+                    url = '/' + os.path.relpath(path, directory).replace(os.sep, '/')
+                    mime_type, base_dir = locate(guess_mime_type(url))
+                    if base_dir != base or url in assets:
+                        continue
+                    try:
+                        size = os.path.getsize(path)
+                    except OSError:
+                        continue
+                    if size:
+                        assets[url] = Asset(url, os.path.normpath(path), mime_type)
+        return assets
+
+    def __len__(self):
+        return len(self._assets)
+
+    def __contains__(self, url):
+        return self.get(url) is not None
+
+
+_asset_manifest = None
+
+
+def asset_manifest():
+    """
+    Returns the process wide manifest used by :class:`Response <Response>`.
+
+    :rtype AssetManifest: the shared manifest, None when static files are
+                          resolved on the filesystem for every request.
+    """
+    return _asset_manifest
+
+
+def configure_asset_manifest(options):
+    """
+    Builds the shared manifest according to the ``asset_manifest`` (bool,
+    on by default) and ``asset_watch`` (seconds between rescans) entries of
+    ``options``, removing them from it.
+
+    :param options (dict): daemon settings.
+
+    :rtype AssetManifest: the shared manifest, None if disabled.
+    """
+    global _asset_manifest
+    settings = {key: options.pop(key) for key in ASSET_MANIFEST_OPTIONS if key in options}
+    if settings.get("asset_manifest", True):
+        _asset_manifest = AssetManifest(watch_interval=settings.get("asset_watch"))
+    else:
+        _asset_manifest = None
+    return _asset_manifest
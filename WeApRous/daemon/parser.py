@@ -0,0 +1,190 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.parser
+~~~~~~~~~~~~~~~~~
+
+This module provides the single pass parser of HTTP request heads.
+
+The head is scanned once with ``bytes.find`` from a moving offset: every
+line end and first colon is located in place and only the fields that are
+kept (request line parts, header names and values) are sliced out, the lines
+themselves are never copied. Header names are lowercased, values are kept as
+raw ``bytes`` and only stripped and decoded (ISO-8859-1) the first time they
+are read from :class:`Headers <Headers>`. Compared to decoding the whole
+request to ``str`` and splitting it several times, one request costs one pass
+over the head and no decoding of unused headers.
+
+Obsolete line folding (a line starting with a space or a tab continues the
+previous header) is unfolded and repeated headers are combined as RFC 7230
+prescribes, with ``", "`` (``"; "`` for ``Cookie``).
+
+Usage Example:
+--------------
+>>> head = parse_head(b"GET / HTTP/1.1\\r\\nHost: a\\r\\nAccept: x\\r\\nAccept: y\\r\\n\\r\\n")
+>>> head.method, head.target, head.headers['accept']
+('GET', '/', 'x, y')
+"""
+
+from .dictionary import CaseInsensitiveDict
+
+#: Separator used to combine repeated headers of a given name.
+COMBINE_SEPARATORS = {"cookie": "; "}
+
+
+def decode_value(name, value):
+    """
+    Decode the raw value(s) of a header.
+
+    :param name (str): lowercase header name.
+    :param value: raw ``bytes``, or a ``list`` of them for a repeated header.
+
+    :rtype str: the header value.
+    """
+    if type(value) is bytes:
+        return value.strip().decode("latin-1")
+    sep = COMBINE_SEPARATORS.get(name, ", ")
+    return sep.join(part.strip().decode("latin-1") for part in value)
+
+
+class Headers(CaseInsensitiveDict):
+    """The :class:`Headers <Headers>` object, a case insensitive header
+    mapping whose values are decoded on first access.
+
+    Keys are stored lowercase. Values parsed by :func:`parse_head` stay raw
+    (``bytes``, or a ``list`` of ``bytes`` for a repeated header) until they
+    are read, string values assigned afterwards are kept as given.
+    """
+
+    def __getitem__(self, key):
+        key = key.lower()
+        value = self.store[key]
+        if type(value) is bytes or type(value) is list:
+            value = self.store[key] = decode_value(key, value)
+        return value
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class RequestHead:
+    """The :class:`RequestHead <RequestHead>` object, a parsed request line
+    and header block.
+
+    :attrs raw (bytes): the head exactly as received.
+    :attrs method (str): HTTP method.
+    :attrs target (str): request target (path and query).
+    :attrs version (str): HTTP version, e.g. ``HTTP/1.1``.
+    :attrs headers (Headers): the request headers.
+    """
+
+    __attrs__ = [
+        "raw",
+        "method",
+        "target",
+        "version",
+        "headers",
+    ]
+
+    def __init__(self, raw, method, target, version, headers):
+        self.raw = raw
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+
+    def framing(self):
+        """
+        Body framing announced by the headers.
+
+        :rtype tuple: (content_length, chunked).
+
+        :raises ValueError: If ``Content-Length`` is not a valid integer.
+        """
+        chunked = self.headers.get("transfer-encoding", "").rstrip().lower().endswith("chunked")
+        length = self.headers.get("content-length")
+        if length is None or chunked:
+            return 0, chunked
+        length = int(length)
+        if length < 0:
+            raise ValueError("Negative Content-Length")
+        return length, False
+
+
+def parse_head(head):
+    """
+    Parses a request head in a single pass.
+
+    :param head (bytes): request line and headers, with or without the final
+                         empty line. A ``str`` is encoded, a ``bytearray`` or
+                         ``memoryview`` copied once, to be kept as
+                         :attr:`RequestHead.raw`.
+
+    :rtype RequestHead: the parsed head.
+
+    :raises ValueError: If the request line is malformed.
+    """
+    if isinstance(head, str):
+        head = head.encode("utf-8")
+    elif not isinstance(head, bytes):
+        head = bytes(head)
+
+    end = len(head)
+    eol = head.find(b"\r\n")
+    if eol < 0:
+        eol = end
+    parts = head[:eol].split()
+    if len(parts) != 3:
+        raise ValueError("Malformed request line")
+    method, target, version = parts
+
+    headers = Headers()
+    store = headers.store
+    last = None
+    pos = eol + 2
+    while pos < end:
+        eol = head.find(b"\r\n", pos)
+        if eol < 0:
+            eol = end
+        if eol == pos:
+            break
+        if head[pos] in (32, 9):
+            # Obsolete line folding: continue the previous header value.
+            if last is not None:
+                value = store[last]
+                folded = head[pos:eol].strip()
+                if type(value) is list:
+                    value[-1] = value[-1].rstrip() + b" " + folded
+                else:
+                    store[last] = value.rstrip() + b" " + folded
+            pos = eol + 2
+            continue
+
+        colon = head.find(b":", pos, eol)
+        if colon <= pos:
+            # Not a header line (no colon, or no name), ignored like before.
+            pos = eol + 2
+            continue
+        last = head[pos:colon].decode("latin-1").lower()
+        value = head[colon + 1:eol]
+        previous = store.get(last)
+        if previous is None:
+            store[last] = value
+        elif type(previous) is list:
+            previous.append(value)
+        else:
+            store[last] = [previous, value]
+        pos = eol + 2
+
+    return RequestHead(head, method.decode("latin-1"), target.decode("latin-1"),
+                       version.decode("latin-1"), headers)
@@ -0,0 +1,173 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.prefork
+~~~~~~~~~~~~~~~~~
+
+This module provides the pre-fork process supervisor of the backend daemon.
+
+One CPython process only runs Python code on one core at a time. The
+:class:`Supervisor <Supervisor>` forks ``workers`` processes that each run a
+complete server engine. With ``SO_REUSEPORT`` every worker binds its own
+listening socket on the same port and the kernel spreads incoming
+connections between them.
+
+The supervisor stays in the parent process: it restarts a worker that exits
+unexpectedly (backing off when a worker keeps crashing right after start)
+and terminates every worker on ``SIGINT`` / ``SIGTERM``.
+
+Notes:
+------
+- Workers do not share memory, application state kept in module globals
+  (e.g. the tracker peer list) is per worker.
+- Requires :func:`os.fork`, i.e. a POSIX system.
+
+Usage Example:
+--------------
+>>> Supervisor(lambda slot: serve(), workers=4).run()
+"""
+
+import os
+import signal
+import time
+
+#: Seconds a worker must stay up to be considered healthy.
+MIN_UPTIME = 1.0
+#: Initial delay before restarting a worker that crashed right after start.
+DEFAULT_RESTART_DELAY = 0.5
+#: Upper bound of the restart back-off, in seconds.
+MAX_RESTART_DELAY = 30.0
+
+
+class Supervisor:
+    """The :class:`Supervisor <Supervisor>` object, which forks and watches
+    a fixed number of worker processes.
+
+    :attrs target (callable): function run in each worker, called with the worker slot number.
+    :attrs workers (int): number of worker processes.
+    :attrs restart_delay (float): initial back-off for crash looping workers.
+    :attrs children (dict): pid -> slot of the running workers.
+    :attrs running (bool): False once a shutdown was requested.
+    """
+
+    __attrs__ = [
+        "target",
+        "workers",
+        "restart_delay",
+        "children",
+        "running",
+    ]
+
+    def __init__(self, target, workers, restart_delay=DEFAULT_RESTART_DELAY):
+        """
+        Initialize a new Supervisor instance.
+
+        :param target (callable): function run in each worker, called with the slot number.
+        :param workers (int): number of worker processes.
+        :param restart_delay (float): initial back-off for crash looping workers.
+
+        :raises ValueError: If ``workers`` is lower than 1.
+        :raises RuntimeError: If the platform cannot fork.
+        """
+        if workers < 1:
+            raise ValueError("Invalid number of workers: {}".format(workers))
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Multi-process mode requires os.fork")
+
+        self.target = target
+        self.workers = workers
+        self.restart_delay = restart_delay
+        self.children = {}
+        self.running = False
+
+        self._started = {}
+        self._delays = {}
+
+    def run(self):
+        """Fork the workers and supervise them until asked to stop."""
+        self.running = True
+        previous = {sig: signal.signal(sig, self.stop)
+                    for sig in (signal.SIGINT, signal.SIGTERM)}
+        try:
+            for slot in range(self.workers):
+                self.spawn(slot)
+            self.watch()
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def spawn(self, slot):
+        """
+        Fork one worker process for ``slot``.
+
+        :param slot (int): worker number, from 0 to ``workers - 1``.
+        """
+        pid = os.fork()
+        if pid == 0:
+            # Child: die quietly on the signals the supervisor relays.
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                self.target(slot)
+            except BaseException as e:
+                print("[Supervisor] Worker {} failed: {}".format(slot, e))
+                code = 1
+            finally:
+                os._exit(code)
+
+        self.children[pid] = slot
+        self._started[slot] = time.monotonic()
+        print("[Supervisor] Started worker {} (pid {})".format(slot, pid))
+
+    def watch(self):
+        """Reap exited workers and restart them while running."""
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            slot = self.children.pop(pid, None)
+            if slot is None or not self.running:
+                continue
+
+            print("[Supervisor] Worker {} (pid {}) exited with status {}".format(
+                slot, pid, os.waitstatus_to_exitcode(status)))
+            self.backoff(slot)
+            if self.running:
+                self.spawn(slot)
+
+    def backoff(self, slot):
+        """
+        Sleep before restarting a worker that died right after starting,
+        doubling the delay each time it happens again.
+
+        :param slot (int): slot of the exited worker.
+        """
+        uptime = time.monotonic() - self._started.get(slot, 0.0)
+        if uptime >= MIN_UPTIME:
+            self._delays[slot] = self.restart_delay
+            return
+        delay = self._delays.get(slot, self.restart_delay)
+        print("[Supervisor] Worker {} is crash looping, restarting in {:.1f}s".format(slot, delay))
+        time.sleep(delay)
+        self._delays[slot] = min(delay * 2, MAX_RESTART_DELAY)
+
+    def stop(self, signum=None, frame=None):
+        """Stop restarting workers and terminate the running ones."""
+        self.running = False
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
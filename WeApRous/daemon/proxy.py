@@ -25,6 +25,14 @@ Requirement:
 - response: customized :class: `Response <Response>` utilities.
 - httpadapter: :class: `HttpAdapter <HttpAdapter >` adapter for HTTP request processing.
 - dictionary: :class: `CaseInsensitiveDict <CaseInsensitiveDict>` for managing headers and cookies.
+- reader: :class: `RequestReader <RequestReader>` buffered, size capped request reader.
+- admission: :class: `AdmissionController <AdmissionController>` load shedding in the accept loop.
+- timeouts: :class: `ConnectionDeadline <ConnectionDeadline>` read and write deadlines of clients.
+- upstream: :class: `UpstreamPool <UpstreamPool>` keep-alive connections to the backends.
+- relay: :class: `Relay <Relay>` streams responses from the backends to the clients.
+- balancer: :class: `Balancer <Balancer>` dist_policy of the virtual hosts.
+- health: :class: `UpstreamHealth <UpstreamHealth>` ejection and probes of the backends.
+- proxycache: :class: `ProxyCache <ProxyCache>` HTTP cache of the backend responses.
 
 """
 import socket
@@ -32,6 +40,28 @@ import threading
 from .response import *
 from .httpadapter import HttpAdapter
 from .dictionary import CaseInsensitiveDict
+from .reader import (
+    RequestReader,
+    RequestError,
+    DEFAULT_MAX_HEADER_SIZE,
+    DEFAULT_MAX_BODY_SIZE,
+)
+from .admission import create_admission
+from .timeouts import (
+    socket_deadline,
+    DEFAULT_HEADER_TIMEOUT,
+    DEFAULT_BODY_TIMEOUT,
+    DEFAULT_WRITE_TIMEOUT,
+)
+from .upstream import (
+    upstream_pools,
+    configure_upstream_pools,
+    UpstreamError,
+)
+from .relay import Relay, DEFAULT_RELAY_BUFFER_SIZE
+from .balancer import balancer_for, Member, POLICIES
+from .health import upstream_health, configure_upstream_health
+from .proxycache import proxy_cache, configure_proxy_cache
 
 #: A dictionary mapping hostnames to backend IP and port tuples.
 #: Used to determine routing targets for incoming requests.
@@ -41,90 +71,50 @@ PROXY_PASS = {
     "app2.local": ('192.168.56.103', 9002),
 }
 
-rr_index = {}
-rr_lock = threading.Lock()
-
-def forward_request(host, port, request):
-    """
-    Forwards an HTTP request to a backend server and retrieves the response.
-
-    :params host (str): IP address of the backend server.
-    :params port (int): port number of the backend server.
-    :params request (str): incoming HTTP request.
-
-    :rtype bytes: Raw HTTP response from the backend server. If the connection
-                  fails, returns a 404 Not Found response.
+def resolve_backend(hostname, routes, exclude=()):
     """
+    Applies the ``dist_policy`` of a hostname to its ``proxy_pass`` members
+    (see :class:`Balancer <Balancer>`) and returns the chosen one. Members
+    ejected by the :class:`UpstreamHealth <UpstreamHealth>` are skipped.
 
-    backend = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-
-    try:
-        backend.connect((host, port))
-        backend.sendall(request.encode())
-        response = b""
-        while True:
-            chunk = backend.recv(4096)
-            if not chunk:
-                break
-            response += chunk
-        return response
-    except socket.error as e:
-      print("Socket error: {}".format(e))
-      return (
-            "HTTP/1.1 404 Not Found\r\n"
-            "Content-Type: text/plain\r\n"
-            "Content-Length: 13\r\n"
-            "Connection: close\r\n"
-            "\r\n"
-            "404 Not Found"
-        ).encode('utf-8')
-
-
-def resolve_routing_policy(hostname, routes):
-    """
-    Handles an routing policy to return the matching proxy_pass.
-    It determines the target backend to forward the request to.
-
-    :params host (str): IP address of the request target server.
-    :params port (int): port number of the request target server.
+    :params hostname (str): Host header of the request.
     :params routes (dict): dictionary mapping hostnames and location.
+    :params exclude (iterable): members already tried for this request.
+
+    :rtype Member: the backend to forward the request to, one of ``exclude``
+                   when no other is left.
     """
 
-    print(hostname)
-    proxy_map, policy = routes.get(hostname,('127.0.0.1:9000','round-robin'))
-    print (proxy_map)
-    print (policy)
-
-    proxy_host = ''
-    proxy_port = '9000'
-    if isinstance(proxy_map, list):
-        if len(proxy_map) == 0:
-            print("[Proxy] Emtpy resolved routing of hostname {}".format(hostname))
-            print ("Empty proxy_map result")
-            # TODO: implement the error handling for non mapped host
-            #       the policy is design by team, but it can be 
-            #       basic default host in your self-defined system
-            # Use a dummy host to raise an invalid connection
-            proxy_host = '127.0.0.1'
-            proxy_port = '9000'
-        elif len(proxy_map) == 1:
-            proxy_host, proxy_port = proxy_map[0].split(":", 2)
-        elif len(proxy_map) > 1 and policy == "round-robin":
-            print("[Proxy] resolve route of hostname {} is a round-robin to".format(hostname))
-            with rr_lock:
-                index = rr_index.get(hostname, 0)
-                proxy_host, proxy_port = proxy_map[index].split(":", 2)
-                rr_index[hostname] = (index + 1) % len(proxy_map)
-        else:
-            print("[Proxy] Multiple backends found, picking first: {}".format(proxy_map[0]))
-            proxy_host, proxy_port = proxy_map[0].split(":", 2)
+    if hostname in routes:
+        proxy_map, policy = routes[hostname]
+        vhost = hostname
     else:
-        print("[Proxy] resolve route of hostname {} is a singulair to".format(hostname))
-        proxy_host, proxy_port = proxy_map.split(":", 2)
-
-    return proxy_host, proxy_port
-
-def handle_client(ip, port, conn, addr, routes):
+        # The client picks the Host header: every unknown one shares the
+        # default balancer instead of adding one of its own.
+        proxy_map, policy = ('127.0.0.1:9000','round-robin')
+        vhost = None
+    try:
+        balancer = balancer_for(vhost, proxy_map, policy)
+    except ValueError as e:
+        print("[Proxy] Invalid proxy_pass of hostname {}: {}".format(hostname, e))
+        balancer = None
+
+    if balancer is None:
+        print("[Proxy] Emtpy resolved routing of hostname {}".format(hostname))
+        # Use a dummy host to raise an invalid connection
+        return Member('127.0.0.1', 9000)
+    if policy not in POLICIES and len(balancer.members) > 1:
+        print("[Proxy] Unknown dist_policy {}, picking first: {}".format(
+            policy, balancer.members[0].address))
+
+    member = balancer.choose(exclude)
+    print("[Proxy] resolve route of hostname {} is a {} to {}".format(hostname, policy, member.address))
+    return member
+
+def handle_client(ip, port, conn, addr, routes, max_header_size=DEFAULT_MAX_HEADER_SIZE,
+                  max_body_size=DEFAULT_MAX_BODY_SIZE, header_timeout=DEFAULT_HEADER_TIMEOUT,
+                  body_timeout=DEFAULT_BODY_TIMEOUT, write_timeout=DEFAULT_WRITE_TIMEOUT,
+                  relay_buffer_size=DEFAULT_RELAY_BUFFER_SIZE):
     """
     Handles an individual client connection by parsing the request,
     determining the target backend, and forwarding the request.
@@ -133,92 +123,254 @@ def handle_client(ip, port, conn, addr, routes):
     matches the hostname against known routes. In the matching
     condition,it forwards the request to the appropriate backend.
 
-    The handler sends the backend response back to the client or
-    returns 404 if the hostname is unreachable or is not recognized.
+    The handler streams the backend response back to the client through a
+    :class:`Relay <Relay>` as it arrives, or returns 502 if no backend of
+    the hostname answered (see :func:`forward_to_backend`).
+    Cacheable requests are answered or revalidated through the
+    :class:`ProxyCache <ProxyCache>` first.
 
     :params ip (str): IP address of the proxy server.
     :params port (int): port number of the proxy server.
     :params conn (socket.socket): client connection socket.
     :params addr (tuple): client address (IP, port).
     :params routes (dict): dictionary mapping hostnames and location.
+    :params max_header_size (int): cap on the request line plus headers, in bytes.
+    :params max_body_size (int): cap on the request body, in bytes.
+    :params header_timeout (float): seconds allowed to receive the request headers.
+    :params body_timeout (float): seconds allowed to receive the request body.
+    :params write_timeout (float): seconds allowed to send the response.
+    :params relay_buffer_size (int): response bytes buffered for the client
+                                     before the backend is no longer read.
     """
 
-    request = conn.recv(1024).decode()
-    hostname = None
-    # Extract hostname
-    for line in request.splitlines():
-        if line.lower().startswith('host:'):
-            hostname = line.split(':', 1)[1].strip()
+    deadline = socket_deadline(conn, header_timeout=header_timeout,
+                               body_timeout=body_timeout, write_timeout=write_timeout)
+    # Read the whole request (headers plus body), it is forwarded unchanged
+    try:
+        deadline.enter("header")
+        reader = RequestReader(conn, max_header_size, max_body_size, deadline)
+        request = reader.read_raw_request()
+    except RequestError as e:
+        print("[Proxy] Rejecting request from {}: {}".format(addr, e))
+        body = "{} {}".format(e.status_code, e.reason)
+        deadline.arm("write")
+        try:
+            conn.sendall((
+                "HTTP/1.1 {}\r\n"
+                "Content-Type: text/plain\r\n"
+                "Content-Length: {}\r\n"
+                "Connection: close\r\n"
+                "\r\n"
+                "{}"
+            ).format(body, len(body), body).encode('utf-8'))
+        except socket.error:
+            pass
+        finally:
+            deadline.cancel()
+            conn.close()
+        return
+    except socket.error as e:
+        print("Socket error: {}".format(e))
+        deadline.cancel()
+        conn.close()
+        return
+    # The backend round trip is not bounded by the client deadlines.
+    deadline.cancel()
+    if request is None:
+        conn.close()
+        return
+
+    # Extract hostname, the reader already parsed the head
+    hostname = reader.head.headers.get('host')
 
     print("[Proxy] {} at Host: {}".format(addr, hostname))
 
-    # Resolve the matching destination in routes and need conver port
-    # to integer value
-    resolved_host, resolved_port = resolve_routing_policy(hostname, routes)
+    bad_gateway = (
+        "HTTP/1.1 502 Bad Gateway\r\n"
+        "Content-Type: text/plain\r\n"
+        "Content-Length: 15\r\n"
+        "Connection: close\r\n"
+        "\r\n"
+        "502 Bad Gateway"
+    ).encode('utf-8')
+
+    # Answer from the cache, or revalidate the cached copy, when possible
+    head = reader.head
+    cache = proxy_cache()
+    entry, fresh = cache.lookup(hostname, head) if cache is not None else (None, False)
+    capture = None
+    if entry is not None and not fresh:
+        request = cache.conditional(request, entry)
+    elif entry is None and cache is not None and head.method == "GET" and not cache.bypassed(head):
+        capture = cache.max_entry_size
+
     try:
-        resolved_port = int(resolved_port)
-    except ValueError:
-        print("Not a valid integer")
+        if entry is not None and fresh:
+            print("[Proxy] Host name {} served {} from the cache".format(hostname, head.target))
+            response = cache.serve(entry, head)
+        else:
+            response = forward_to_backend(hostname, routes, conn, request, head, entry,
+                                          capture, relay_buffer_size, deadline) or bad_gateway
+        if response is not True:
+            deadline.arm("write")
+            conn.sendall(response)
+    except socket.error as e:
+        print("[Proxy] Failed to send the response to {}: {}".format(addr, e))
+    finally:
+        deadline.cancel()
+        conn.close()
 
-    if resolved_host:
-        print("[Proxy] Host name {} is forwarded to {}:{}".format(hostname,resolved_host, resolved_port))
-        response = forward_request(resolved_host, resolved_port, request)        
-    else:
-        response = (
-            "HTTP/1.1 404 Not Found\r\n"
-            "Content-Type: text/plain\r\n"
-            "Content-Length: 13\r\n"
-            "Connection: close\r\n"
-            "\r\n"
-            "404 Not Found"
-        ).encode('utf-8')
-    conn.sendall(response)
-    conn.close()
-
-def run_proxy(ip, port, routes):
+def forward_to_backend(hostname, routes, conn, request, head, entry, capture,
+                       relay_buffer_size, deadline):
+    """
+    Forwards a request to a backend chosen by :func:`resolve_backend`,
+    streaming the response to the client.
+
+    Every outcome is reported to the :class:`UpstreamHealth <UpstreamHealth>`,
+    and a request no backend connection could be opened for is tried on the
+    other members.
+
+    :params hostname (str): Host header of the request.
+    :params routes (dict): dictionary mapping hostnames and location.
+    :params conn (socket.socket): client connection socket.
+    :params request (bytes): the raw request.
+    :params head (RequestHead): the parsed request.
+    :params entry (CacheEntry): stale cached copy the request revalidates,
+                                the response is then buffered up to the
+                                cache ``max_entry_size``, streamed past it.
+    :params capture (int): most response bytes copied for the cache, None
+                           when the response is not cacheable.
+    :params relay_buffer_size (int): response bytes buffered for the client.
+    :params deadline (ConnectionDeadline): write deadline of the client.
+
+    :rtype bytes: the response left to send, True if it was streamed, None
+                  if no backend answered.
+    """
+    cache = proxy_cache()
+    health = upstream_health()
+    member = resolve_backend(hostname, routes)
+    response = None
+    tried = []
+    while member not in tried:
+        tried.append(member)
+        print("[Proxy] Host name {} is forwarded to {}".format(hostname, member.address))
+        relay = Relay(upstream_pools().get(member.host, member.port), conn,
+                      relay_buffer_size, deadline, capture)
+        member.acquire()
+        try:
+            if entry is not None:
+                response = relay.fetch(request, cache.max_entry_size)
+                if response is None:
+                    # Too large to cache, it was streamed to the client.
+                    cache.remove(entry)
+                    response = True
+                else:
+                    response = cache.revalidated(entry, hostname, head, response)
+            else:
+                relay.run(request)
+                response = True
+                if relay.captured is not None:
+                    cache.store(hostname, head, bytes(relay.captured))
+        except (socket.error, UpstreamError) as e:
+            print("[Proxy] Relay to {} failed: {}".format(member.address, e))
+            if relay.sent:
+                # Part of the response is out, only closing can tell the client.
+                response = True
+            elif entry is not None and not entry.must_revalidate:
+                # The backend is unreachable, a stale copy beats an error.
+                response = cache.serve(entry, head)
+        finally:
+            member.release(relay.latency)
+            health.report(member, relay.latency is not None)
+        if relay.connected:
+            break
+        # Nothing reached this backend, another one can take the request.
+        member = resolve_backend(hostname, routes, tried)
+    return response
+
+def run_proxy(ip, port, routes, **options):
     """
     Starts the proxy server and listens for incoming connections. 
 
     The process dinds the proxy server to the specified IP and port.
     In each incomping connection, it accepts the connections and
     spawns a new thread for each client using `handle_client`.
+    With ``max_inflight`` set, connections beyond the cap wait in a bounded
+    queue and are answered ``503`` with ``Retry-After`` once it is full.
  
 
     :params ip (str): IP address to bind the proxy server.
     :params port (int): port number to listen on.
     :params routes (dict): dictionary mapping hostnames and location.
+    :params options: client handling settings, ``max_header_size``,
+                     ``max_body_size``, ``header_timeout``, ``body_timeout`` and
+                     ``write_timeout`` and ``relay_buffer_size``, admission control settings,
+                     ``max_inflight``, ``max_queue``, ``queue_timeout`` and
+                     ``retry_after``, and backend pool settings,
+                     ``upstream_max_idle``, ``upstream_max_connections``,
+                     ``upstream_idle_timeout`` and ``upstream_timeout``, and backend
+                     health settings, ``health_max_fails``, ``health_cooldown``,
+                     ``health_slow_start``, ``health_interval``, ``health_path``
+                     and ``health_timeout``, and response cache settings,
+                     ``proxy_cache_size`` and ``proxy_cache_max_entry``.
 
     """
 
+    admission = create_admission(options)
+    pools = configure_upstream_pools(options)
+    health = configure_upstream_health(options)
+    cache = configure_proxy_cache(options)
     proxy = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
     try:
         proxy.bind((ip, port))
         proxy.listen(50)
         print("[Proxy] Listening on IP {} port {}".format(ip,port))
+        if admission is not None:
+            print("[Proxy] Admission control inflight={} queue={}".format(
+                admission.max_inflight, admission.max_queue))
+        print("[Proxy] Backend pools max_idle={} max_connections={}".format(
+            pools.settings["max_idle"], pools.settings["max_connections"]))
+        print("[Proxy] Backend health max_fails={} cooldown={}s probes={}".format(
+            health.max_fails, health.cooldown,
+            "every {}s {}".format(health.interval, health.path or "TCP") if health.interval else "off"))
+        if cache is not None:
+            print("[Proxy] Response cache {} bytes, entries up to {} bytes".format(
+                cache.max_bytes, cache.max_entry_size))
         while True:
             conn, addr = proxy.accept()
+            if admission is not None and not admission.reserve():
+                admission.reject(conn, blocking=False)
+                continue
             #
             #  TODO: implement the step of the client incomping connection
             #        using multi-thread programming with the
             #        provided handle_client routine
             #
+            if admission is not None:
+                target = admission.serve
+                args = (handle_client, conn, ip, port, conn, addr, routes)
+            else:
+                target = handle_client
+                args = (ip, port, conn, addr, routes)
             client_thread = threading.Thread(
-                target=handle_client,
-                args=(ip, port, conn, addr, routes),
+                target=target,
+                args=args,
+                kwargs=options,
                 daemon=True
             )
             client_thread.start()
     except socket.error as e:
       print("Socket error: {}".format(e))
 
-def create_proxy(ip, port, routes):
+def create_proxy(ip, port, routes, **options):
     """
     Entry point for launching the proxy server.
 
     :params ip (str): IP address to bind the proxy server.
     :params port (int): port number to listen on.
     :params routes (dict): dictionary mapping hostnames and location.
+    :params options: client handling settings forwarded to :func:`run_proxy`.
     """
 
-    run_proxy(ip, port, routes)
+    run_proxy(ip, port, routes, **options)
@@ -0,0 +1,536 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.proxycache
+~~~~~~~~~~~~~~~~~
+
+This module provides the HTTP cache of the proxy, a :class:`ProxyCache
+<ProxyCache>` answering repeated ``GET`` and ``HEAD`` requests without
+touching the backends, as a shared cache per RFC 9111. It is off unless a
+``proxy_cache_size`` is configured: a shared cache in front of backends that
+were not written with one in mind can serve a response to the wrong client.
+
+- Responses are stored by virtual host, method and request target, plus the
+  values of the request headers named by their ``Vary`` (e.g. one entry per
+  ``Accept-Encoding``), in least recently used order up to a byte budget.
+- A response is stored when it has an explicit lifetime (``s-maxage``,
+  ``max-age`` or ``Expires``) or a validator (``ETag``, ``Last-Modified``) to
+  revalidate it with. ``no-store``, ``private``, ``Vary: *`` and
+  ``Set-Cookie`` keep it out, as does a request with ``Authorization``.
+- A fresh entry is answered from memory, with an ``Age`` header, or ``304``
+  when the client validators match it.
+- A stale entry (or ``no-cache``) is revalidated with a conditional request;
+  a ``304`` from the backend refreshes it and it is answered from memory,
+  anything else replaces it.
+- ``POST``, ``PUT``, ``DELETE``... invalidate the entries of their target.
+
+Usage Example:
+--------------
+>>> cache = ProxyCache(max_bytes=16 * 1024 * 1024)
+>>> entry, fresh = cache.lookup("app1.local:8080", head)
+>>> if entry is not None and fresh:
+>>>     conn.sendall(cache.serve(entry, head))
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+
+from .serializer import serialize_head
+from .upstream import parse_response_head, UpstreamError
+
+#: Option names consumed by :func:`configure_proxy_cache`.
+PROXY_CACHE_OPTIONS = ("proxy_cache_size", "proxy_cache_max_entry")
+#: Default total size of the cached responses, in bytes.
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+#: Default size above which a response is not cached.
+DEFAULT_MAX_ENTRY_SIZE = 1024 * 1024
+#: Statuses stored by the cache. Not 404: the static 404 of the backend
+#: carries a day long ``max-age`` and would outlive the file being added.
+CACHEABLE_STATUSES = (200, 203, 300, 301, 308, 410)
+#: Methods answered from the cache, the others invalidate their target.
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+#: Response headers repeated in a 304 built from an entry.
+NOT_MODIFIED_HEADERS = (b"cache-control", b"content-location", b"etag", b"expires",
+                        b"last-modified", b"vary")
+#: Headers of a backend 304 that update the stored response.
+REFRESHED_HEADERS = (b"cache-control", b"date", b"etag", b"expires", b"last-modified")
+#: Spelling of the header names that ``str.title`` gets wrong.
+HEADER_NAMES = {b"etag": "ETag"}
+
+
+def parse_cache_control(value):
+    """
+    Parses a ``Cache-Control`` header.
+
+    :param value (str): the header value, may be empty.
+
+    :rtype dict: lowercase directive -> value, True for directives without one.
+    """
+    directives = {}
+    for item in (value or "").split(","):
+        name, sep, arg = item.partition("=")
+        name = name.strip().lower()
+        if name:
+            directives[name] = arg.strip().strip('"') if sep else True
+    return directives
+
+
+def seconds(directives, name):
+    """
+    Delta-seconds argument of a directive.
+
+    :rtype int: the seconds, None if the directive is absent or invalid.
+    """
+    try:
+        return max(int(directives[name]), 0)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def http_timestamp(value):
+    """
+    Parses an HTTP date.
+
+    :rtype float: POSIX timestamp, None if the date is invalid.
+    """
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def header_name(name):
+    """Canonical spelling of a lowercase header name, e.g. ``ETag``."""
+    return HEADER_NAMES.get(name) or name.decode("latin-1").title()
+
+
+class CacheEntry:
+    """A response held by the :class:`ProxyCache <ProxyCache>`.
+
+    :attrs key (tuple): cache key, primary key plus varying header values.
+    :attrs status (int): response status code.
+    :attrs head (bytes): status line and headers, without ``Connection``,
+                         ``Age`` and the final empty line.
+    :attrs body (bytes): the body, as framed by the backend.
+    :attrs headers (dict): lowercase header name -> value, as bytes.
+    :attrs stored (float): ``time.monotonic()`` of the last validation.
+    :attrs age (int): ``Age`` of the response when stored.
+    :attrs lifetime (int): freshness lifetime in seconds.
+    :attrs must_revalidate (bool): whether a stale copy may never be served.
+    """
+
+    __slots__ = ("key", "status", "head", "body", "headers", "stored", "age",
+                 "lifetime", "must_revalidate")
+
+    @property
+    def etag(self):
+        value = self.headers.get(b"etag")
+        return value.decode("latin-1") if value is not None else None
+
+    @property
+    def last_modified(self):
+        value = self.headers.get(b"last-modified")
+        return value.decode("latin-1") if value is not None else None
+
+    @property
+    def size(self):
+        return len(self.head) + len(self.body)
+
+    def current_age(self, now=None):
+        """Seconds since the backend produced the response."""
+        now = time.monotonic() if now is None else now
+        return self.age + int(now - self.stored)
+
+    def fresh(self, now=None):
+        """True while the entry may be served without revalidation."""
+        return self.current_age(now) < self.lifetime
+
+
+def freshness(headers, directives):
+    """
+    Freshness lifetime of a response, ``s-maxage`` first as the proxy is a
+    shared cache, then ``max-age``, then ``Expires`` minus ``Date``.
+
+    :param headers (dict): lowercase header name -> bytes value.
+    :param directives (dict): its parsed ``Cache-Control``.
+
+    :rtype int: seconds, None without an explicit lifetime.
+    """
+    if "no-cache" in directives:
+        return 0
+    for name in ("s-maxage", "max-age"):
+        lifetime = seconds(directives, name)
+        if lifetime is not None:
+            return lifetime
+    expires = headers.get(b"expires")
+    if expires is not None:
+        expires = http_timestamp(expires.decode("latin-1"))
+        if expires is None:
+            # An invalid Expires means already expired.
+            return 0
+        date = headers.get(b"date")
+        date = http_timestamp(date.decode("latin-1")) if date is not None else None
+        return max(int(expires - (date if date is not None else time.time())), 0)
+    return None
+
+
+class ProxyCache:
+    """The :class:`ProxyCache <ProxyCache>` object, a thread safe LRU cache
+    of backend responses bounded by a byte budget.
+
+    :attrs max_bytes (int): total size of the cached responses.
+    :attrs max_entry_size (int): largest response cached.
+    """
+
+    __attrs__ = [
+        "max_bytes",
+        "max_entry_size",
+    ]
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entry_size=DEFAULT_MAX_ENTRY_SIZE):
+        """
+        Initialize a new ProxyCache instance.
+
+        :param max_bytes (int): total size of the cached responses.
+        :param max_entry_size (int): largest response cached.
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_size = min(max_entry_size, max_bytes)
+
+        self._entries = OrderedDict()
+        # Primary key -> names of the request headers its responses vary on,
+        # and how many of its variants are cached (the key goes with the last).
+        self._vary = {}
+        self._variants = {}
+        self._used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def used(self):
+        """Bytes of responses currently cached."""
+        return self._used
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def primary_key(hostname, head):
+        """Host, method and target; ``HEAD`` shares the ``GET`` entries."""
+        method = "GET" if head.method == "HEAD" else head.method
+        return (hostname or "", method, head.target)
+
+    @staticmethod
+    def bypassed(head):
+        """
+        Tells whether a request must go to the backend and its response stay
+        out of the cache.
+
+        :param head (RequestHead): the parsed request.
+
+        :rtype bool: True for unsafe methods, ``no-store`` and ``Authorization``.
+        """
+        if head.method not in ("GET", "HEAD"):
+            return True
+        if "authorization" in head.headers:
+            return True
+        return "no-store" in parse_cache_control(head.headers.get("cache-control"))
+
+    def lookup(self, hostname, head):
+        """
+        Find the entry answering a request.
+
+        :param hostname (str): the virtual host.
+        :param head (RequestHead): the parsed request.
+
+        :rtype tuple: (entry, fresh); entry is None on a miss, fresh is False
+                      when it must be revalidated first (stale, or the
+                      request asks for ``no-cache`` or ``max-age=0``).
+        """
+        if head.method not in SAFE_METHODS:
+            self.invalidate(self.primary_key(hostname, head)[0], head.target)
+            return None, False
+        if self.bypassed(head):
+            return None, False
+
+        primary = self.primary_key(hostname, head)
+        with self._lock:
+            names = self._vary.get(primary)
+            if names is None:
+                return None, False
+            key = primary + tuple(head.headers.get(name, "") for name in names)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            self._entries.move_to_end(key)
+
+        directives = parse_cache_control(head.headers.get("cache-control"))
+        if "no-cache" in directives or "no-cache" in head.headers.get("pragma", "").lower():
+            return entry, False
+        max_age = seconds(directives, "max-age")
+        if max_age is not None and entry.current_age() > max_age:
+            return entry, False
+        return entry, entry.fresh()
+
+    def conditional(self, request, entry):
+        """
+        Turn a request into the revalidation of an entry.
+
+        :param request (bytes): the raw request.
+        :param entry (CacheEntry): the stale entry.
+
+        :rtype bytes: the request with the entry validators instead of the
+                      client ones.
+        """
+        head_end = request.find(b"\r\n\r\n")
+        lines = [line for line in request[:head_end].split(b"\r\n")
+                 if not line.lower().startswith((b"if-none-match:", b"if-modified-since:"))]
+        if entry.etag is not None:
+            lines.append(b"If-None-Match: " + entry.headers[b"etag"])
+        if entry.last_modified is not None:
+            lines.append(b"If-Modified-Since: " + entry.headers[b"last-modified"])
+        return b"\r\n".join(lines) + request[head_end:]
+
+    def store(self, hostname, head, response):
+        """
+        Cache a response if it is allowed to and small enough.
+
+        :param hostname (str): the virtual host.
+        :param head (RequestHead): the request it answers.
+        :param response (bytes): the raw response.
+
+        :rtype CacheEntry: the new entry, None if the response is not cached.
+        """
+        if response is None or head.method != "GET" or self.bypassed(head) \
+                or len(response) > self.max_entry_size:
+            return None
+        head_end = response.find(b"\r\n\r\n")
+        if head_end < 0:
+            return None
+        try:
+            _, status, headers = parse_response_head(response[:head_end])
+        except UpstreamError:
+            return None
+        if status not in CACHEABLE_STATUSES or b"set-cookie" in headers:
+            return None
+
+        directives = parse_cache_control(headers.get(b"cache-control", b"").decode("latin-1"))
+        if "no-store" in directives or "private" in directives:
+            return None
+        vary = headers.get(b"vary", b"").decode("latin-1")
+        names = tuple(sorted({name.strip().lower() for name in vary.split(",") if name.strip()}))
+        if "*" in names:
+            return None
+        lifetime = freshness(headers, directives)
+        if lifetime is None:
+            if b"etag" not in headers and b"last-modified" not in headers:
+                return None
+            # Validators only: kept to be revalidated cheaply.
+            lifetime = 0
+
+        entry = CacheEntry()
+        lines = [line for line in response[:head_end].split(b"\r\n")
+                 if not line.lower().startswith((b"connection:", b"keep-alive:", b"age:"))]
+        entry.head = b"\r\n".join(lines)
+        entry.body = response[head_end + 4:]
+        entry.status = status
+        entry.headers = headers
+        entry.stored = time.monotonic()
+        entry.age = seconds({"age": headers.get(b"age", b"0").decode("latin-1")}, "age") or 0
+        entry.lifetime = lifetime
+        entry.must_revalidate = "must-revalidate" in directives or "proxy-revalidate" in directives
+
+        primary = self.primary_key(hostname, head)
+        entry.key = primary + tuple(head.headers.get(name, "") for name in names)
+        with self._lock:
+            if self._vary.get(primary) != names:
+                # The backend changed its Vary, the old variants cannot be found.
+                self._drop(primary)
+                self._vary[primary] = names
+            previous = self._entries.pop(entry.key, None)
+            if previous is not None:
+                self._used -= previous.size
+            else:
+                self._variants[primary] = self._variants.get(primary, 0) + 1
+            self._entries[entry.key] = entry
+            self._used += entry.size
+            while self._used > self.max_bytes and self._entries:
+                self._forget(*self._entries.popitem(last=False))
+        return entry
+
+    def revalidated(self, entry, hostname, head, response):
+        """
+        Handle the backend answer to a conditional request.
+
+        :param entry (CacheEntry): the revalidated entry.
+        :param hostname (str): the virtual host.
+        :param head (RequestHead): the client request.
+        :param response (bytes): the raw backend response.
+
+        :rtype bytes: the response for the client, from the refreshed entry
+                      on ``304``, the backend one otherwise.
+        """
+        head_end = response.find(b"\r\n\r\n")
+        try:
+            _, status, headers = parse_response_head(response[:head_end])
+        except UpstreamError:
+            return response
+        if status != 304:
+            if self.store(hostname, head, response) is None:
+                self.remove(entry)
+            return response
+
+        self._refresh(entry, headers)
+        return self.serve(entry, head)
+
+    def _refresh(self, entry, headers):
+        """Apply the metadata of a backend ``304`` to an entry."""
+        updates = {name: headers[name] for name in REFRESHED_HEADERS if name in headers}
+        with self._lock:
+            if updates:
+                lines = [line for line in entry.head.split(b"\r\n")
+                         if line.split(b":", 1)[0].strip().lower() not in updates]
+                lines.extend(header_name(name).encode("latin-1") + b": " + value
+                             for name, value in updates.items())
+                cached = self._entries.get(entry.key) is entry
+                if cached:
+                    self._used -= entry.size
+                entry.head = b"\r\n".join(lines)
+                entry.headers = dict(entry.headers)
+                entry.headers.update(updates)
+                if cached:
+                    self._used += entry.size
+            directives = parse_cache_control(entry.headers.get(b"cache-control", b"").decode("latin-1"))
+            lifetime = freshness(entry.headers, directives)
+            entry.lifetime = lifetime if lifetime is not None else 0
+            entry.stored = time.monotonic()
+            entry.age = 0
+
+    def serve(self, entry, head):
+        """
+        Answer a request from an entry.
+
+        :param entry (CacheEntry): a fresh or just revalidated entry.
+        :param head (RequestHead): the client request.
+
+        :rtype bytes: the response, ``304`` when the client validators match
+                      the entry, without a body for ``HEAD``.
+        """
+        age = entry.current_age()
+        if self.not_modified(entry, head):
+            pairs = [(header_name(name), value.decode("latin-1"))
+                     for name, value in entry.headers.items() if name in NOT_MODIFIED_HEADERS]
+            pairs.append(("Age", str(age)))
+            pairs.append(("Connection", "close"))
+            return serialize_head(304, None, pairs)
+        response = b"%s\r\nAge: %d\r\nConnection: close\r\n\r\n" % (entry.head, age)
+        if head.method != "HEAD":
+            response += entry.body
+        return response
+
+    @staticmethod
+    def not_modified(entry, head):
+        """True if the client copy, as told by its validators, is current."""
+        if entry.status != 200:
+            return False
+        if_none_match = head.headers.get("if-none-match")
+        if if_none_match is not None:
+            etag = entry.etag
+            if etag is None:
+                return False
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags or "W/" + etag in tags
+        if_modified_since = head.headers.get("if-modified-since")
+        return if_modified_since is not None and if_modified_since == entry.last_modified
+
+    def remove(self, entry):
+        """Drop one entry."""
+        with self._lock:
+            if self._entries.get(entry.key) is entry:
+                self._forget(entry.key, self._entries.pop(entry.key))
+
+    def invalidate(self, hostname, target):
+        """
+        Drop every variant of a target.
+
+        :param hostname (str): the virtual host, ``""`` for requests without
+                               a ``Host`` header.
+        :param target (str): the request target.
+        """
+        with self._lock:
+            self._drop((hostname, "GET", target))
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._vary.clear()
+            self._variants.clear()
+            self._used = 0
+
+    def _forget(self, key, entry):
+        """Account for an entry taken out of the cache, lock held."""
+        self._used -= entry.size
+        primary = key[:3]
+        left = self._variants.get(primary, 1) - 1
+        if left:
+            self._variants[primary] = left
+        else:
+            self._variants.pop(primary, None)
+            self._vary.pop(primary, None)
+
+    def _drop(self, primary):
+        """Drop the variants of a primary key, lock held."""
+        self._vary.pop(primary, None)
+        self._variants.pop(primary, None)
+        for key in [key for key in self._entries if key[:3] == primary]:
+            self._used -= self._entries.pop(key).size
+
+
+_proxy_cache = None
+
+
+def proxy_cache():
+    """
+    Returns the process wide cache used by the proxy.
+
+    :rtype ProxyCache: the shared cache, None when caching is disabled.
+    """
+    return _proxy_cache
+
+
+def configure_proxy_cache(options):
+    """
+    Replaces the shared cache according to the ``proxy_cache_size`` (bytes,
+    0 or unset disables caching) and ``proxy_cache_max_entry`` (bytes)
+    entries of ``options``, removing them from it. Nothing changes when none
+    is set.
+
+    :param options (dict): proxy settings.
+
+    :rtype ProxyCache: the shared cache, None if disabled.
+    """
+    global _proxy_cache
+    settings = {key: options.pop(key) for key in PROXY_CACHE_OPTIONS if key in options}
+    settings = {key: value for key, value in settings.items() if value is not None}
+    if not settings:
+        return _proxy_cache
+    max_bytes = settings.get("proxy_cache_size", 0)
+    if not max_bytes:
+        _proxy_cache = None
+    else:
+        _proxy_cache = ProxyCache(
+            max_bytes=max_bytes,
+            max_entry_size=settings.get("proxy_cache_max_entry", DEFAULT_MAX_ENTRY_SIZE))
+    return _proxy_cache
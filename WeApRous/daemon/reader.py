@@ -0,0 +1,231 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.reader
+~~~~~~~~~~~~~~~~~
+
+This module provides the buffered request reader shared by the server engines
+and the proxy.
+
+Bytes are accumulated until the end of the header block (an empty line), which
+is parsed once by :func:`parse_head <parse_head>`. The body is then framed by ``Content-Length`` or, for ``Transfer-Encoding:
+chunked``, decoded chunk by chunk. Anything after the request stays buffered
+and belongs to the next, pipelined, request on the same connection. Header and
+body sizes are capped; oversized or malformed requests raise
+:class:`RequestError <RequestError>` carrying the HTTP status to answer with.
+Given a :class:`ConnectionDeadline <ConnectionDeadline>`, the reader moves it
+through the ``header`` and ``body`` phases and answers ``408`` once it expires.
+
+Usage Example:
+--------------
+>>> reader = RequestReader(conn, max_body_size=1 << 20)
+>>> head, body = reader.read_request()
+>>> head.method, head.headers.get('host')
+"""
+
+from .parser import parse_head
+
+#: Maximum number of bytes read from a client socket in one call.
+RECV_SIZE = 65536
+#: Default cap on the request line plus headers, in bytes.
+DEFAULT_MAX_HEADER_SIZE = 16 * 1024
+#: Default cap on a request body, in bytes.
+DEFAULT_MAX_BODY_SIZE = 1024 * 1024
+
+
+class RequestError(Exception):
+    """Raised when a request cannot be framed.
+
+    :attrs status_code (int): HTTP status to answer with (400, 408, 413, 431).
+    :attrs reason (str): matching reason phrase.
+    """
+
+    def __init__(self, status_code, reason):
+        super().__init__("{} {}".format(status_code, reason))
+        self.status_code = status_code
+        self.reason = reason
+
+
+def decode_chunked(buf, start, max_body_size):
+    """
+    Decodes a chunked body starting at ``start`` in ``buf``.
+
+    :param buf (bytes): buffered bytes received from the client.
+    :param start (int): offset of the first chunk size line.
+    :param max_body_size (int): cap on the decoded body.
+
+    :rtype tuple: (end, body) with ``end`` the offset past the final CRLF,
+                  or None if more bytes are needed.
+
+    :raises RequestError: If a chunk is malformed or the body is too large.
+    """
+    body = bytearray()
+    pos = start
+    while True:
+        line_end = buf.find(b"\r\n", pos)
+        if line_end < 0:
+            return None
+        size_field = bytes(buf[pos:line_end]).split(b";", 1)[0].strip()
+        try:
+            size = int(size_field, 16)
+        except ValueError:
+            raise RequestError(400, "Bad Request")
+        pos = line_end + 2
+
+        if size == 0:
+            # Optional trailers end with an empty line.
+            if buf[pos:pos + 2] == b"\r\n":
+                return pos + 2, bytes(body)
+            trailer_end = buf.find(b"\r\n\r\n", pos)
+            if trailer_end < 0:
+                return None
+            return trailer_end + 4, bytes(body)
+
+        if len(body) + size > max_body_size:
+            raise RequestError(413, "Payload Too Large")
+        if len(buf) < pos + size + 2:
+            return None
+        if buf[pos + size:pos + size + 2] != b"\r\n":
+            raise RequestError(400, "Bad Request")
+        body += buf[pos:pos + size]
+        pos += size + 2
+
+
+def parse_request(buf, max_header_size=DEFAULT_MAX_HEADER_SIZE,
+                  max_body_size=DEFAULT_MAX_BODY_SIZE):
+    """
+    Frames the first complete HTTP request in a buffer.
+
+    :param buf (bytes): buffered bytes received from the client.
+    :param max_header_size (int): cap on the request line plus headers.
+    :param max_body_size (int): cap on the request body.
+
+    :rtype tuple: (size, head, body) where ``size`` is the number of bytes the
+                  request occupies in ``buf``, ``head`` the parsed
+                  :class:`RequestHead <RequestHead>` and ``body`` the de-chunked
+                  body, or None if more bytes are needed.
+
+    :raises RequestError: If the request is malformed or exceeds a cap.
+    """
+    head_end = buf.find(b"\r\n\r\n")
+    if head_end < 0:
+        if len(buf) > max_header_size:
+            raise RequestError(431, "Request Header Fields Too Large")
+        return None
+    if head_end > max_header_size:
+        raise RequestError(431, "Request Header Fields Too Large")
+    head_end += 4
+
+    try:
+        head = parse_head(memoryview(buf)[:head_end])
+        length, chunked = head.framing()
+    except ValueError:
+        raise RequestError(400, "Bad Request")
+
+    if chunked:
+        decoded = decode_chunked(buf, head_end, max_body_size)
+        if decoded is None:
+            return None
+        end, body = decoded
+        return end, head, body
+
+    if length > max_body_size:
+        raise RequestError(413, "Payload Too Large")
+    if len(buf) < head_end + length:
+        return None
+    return head_end + length, head, bytes(buf[head_end:head_end + length])
+
+
+class RequestReader:
+    """The :class:`RequestReader <RequestReader>` object, which reads whole
+    requests from a blocking socket through a persistent buffer.
+
+    :attrs conn (socket.socket): the client socket.
+    :attrs buf (bytearray): bytes received but not yet consumed.
+    :attrs max_header_size (int): cap on the request line plus headers.
+    :attrs max_body_size (int): cap on the request body.
+    :attrs deadline (ConnectionDeadline): read deadlines of the connection, if any.
+    :attrs head (RequestHead): head of the last request read.
+    """
+
+    __attrs__ = [
+        "conn",
+        "buf",
+        "max_header_size",
+        "max_body_size",
+        "deadline",
+        "head",
+    ]
+
+    def __init__(self, conn, max_header_size=DEFAULT_MAX_HEADER_SIZE,
+                 max_body_size=DEFAULT_MAX_BODY_SIZE, deadline=None):
+        self.conn = conn
+        self.buf = bytearray()
+        self.max_header_size = max_header_size
+        self.max_body_size = max_body_size
+        self.deadline = deadline
+        self.head = None
+
+    def _read(self):
+        """Receive until a full request is buffered, return its framing."""
+        while True:
+            parsed = parse_request(self.buf, self.max_header_size, self.max_body_size)
+            if parsed is not None:
+                return parsed
+
+            if self.deadline is not None and self.buf:
+                # An empty buffer keeps the caller's phase (header or idle).
+                self.deadline.enter("body" if self.buf.find(b"\r\n\r\n") >= 0 else "header")
+            chunk = self.conn.recv(RECV_SIZE)
+            if not chunk:
+                if self.buf:
+                    if self.deadline is not None and self.deadline.expired in ("header", "body"):
+                        raise RequestError(408, "Request Timeout")
+                    raise RequestError(400, "Bad Request")
+                return None
+            self.buf += chunk
+
+    def read_request(self):
+        """
+        Reads one complete request, de-chunking its body if needed.
+
+        :rtype tuple: (head, body), the parsed :class:`RequestHead <RequestHead>`
+                      and the body bytes, or None if the peer closed the
+                      connection between requests.
+
+        :raises RequestError: If the request is malformed or exceeds a cap.
+        """
+        parsed = self._read()
+        if parsed is None:
+            return None
+        size, self.head, body = parsed
+        del self.buf[:size]
+        return self.head, body
+
+    def read_raw_request(self):
+        """
+        Reads one complete request exactly as it was received on the wire,
+        e.g. to forward it unchanged to a backend. The parsed head is kept in
+        :attr:`head`.
+
+        :rtype bytes: the raw request, or None if the peer closed the connection.
+
+        :raises RequestError: If the request is malformed or exceeds a cap.
+        """
+        parsed = self._read()
+        if parsed is None:
+            return None
+        self.head = parsed[1]
+        raw = bytes(self.buf[:parsed[0]])
+        del self.buf[:parsed[0]]
+        return raw
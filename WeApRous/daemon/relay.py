@@ -0,0 +1,283 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.relay
+~~~~~~~~~~~~~~~~~
+
+This module provides the streaming relay of the proxy, a :class:`Relay <Relay>`
+moving one request to a backend and its response back to the client as the
+bytes arrive, instead of buffering the whole response first.
+
+Both sockets are non-blocking and multiplexed by one :mod:`selectors` selector:
+
+- the request is written to the backend as fast as it accepts it;
+- response bytes are passed through a
+  :class:`ResponseFramer <ResponseFramer>`, which finds the end of the
+  response (so the backend connection goes back to its pool) and rewrites the
+  head to announce ``Connection: close`` to the client;
+- at most ``buffer_size`` bytes wait for the client. When it reads slower than
+  the backend writes, the relay stops reading the backend, whose TCP window
+  then fills up: backpressure instead of proxy memory.
+
+The time to first byte is the backend one and a response of any size costs
+the proxy one bounded buffer. The client write deadline is armed only while
+bytes wait for the client, a slow backend is bounded by the pool ``timeout``.
+
+With ``capture`` the relay also keeps a copy of the response, given up past
+``capture`` bytes, for the :class:`ProxyCache <ProxyCache>`; :meth:`Relay.fetch`
+buffers a response instead of streaming it, e.g. to revalidate a cached one,
+and falls back to streaming once it outgrows its ``limit``.
+
+Usage Example:
+--------------
+>>> relay = Relay(upstream_pools().get("127.0.0.1", 9000), conn)
+>>> relay.run(b"GET / HTTP/1.1\\r\\nHost: a\\r\\n\\r\\n")
+"""
+
+import selectors
+import time
+
+from .reader import RECV_SIZE
+from .upstream import (
+    ResponseFramer,
+    UpstreamError,
+    request_method,
+    set_connection_header,
+)
+
+#: Default bytes waiting for the client before the backend is no longer read.
+DEFAULT_RELAY_BUFFER_SIZE = 64 * 1024
+
+
+def close_connection(head):
+    """Announce the close of the client connection in a relayed head."""
+    return set_connection_header(head, b"close")
+
+
+class Relay:
+    """The :class:`Relay <Relay>` object, the exchange of one request between
+    a client and a backend pool.
+
+    :attrs pool (UpstreamPool): pool of the backend.
+    :attrs client (socket.socket): client connection.
+    :attrs buffer_size (int): bytes waiting for the client at most.
+    :attrs deadline (ConnectionDeadline): write deadline of the client.
+    :attrs sent (int): response bytes sent to the client.
+    :attrs latency (float): seconds from the request to the first response
+                            byte, None until it arrived.
+    :attrs connected (bool): whether a backend connection was obtained,
+                             False means the request reached no backend.
+    :attrs capture (int): most response bytes copied, None to copy nothing.
+    :attrs captured (bytearray): copy of the relayed response, None when not
+                                 wanted or larger than ``capture``.
+    """
+
+    __attrs__ = [
+        "pool",
+        "client",
+        "buffer_size",
+        "deadline",
+        "sent",
+        "latency",
+        "connected",
+        "capture",
+        "captured",
+    ]
+
+    def __init__(self, pool, client, buffer_size=DEFAULT_RELAY_BUFFER_SIZE, deadline=None,
+                 capture=None):
+        """
+        Initialize a new Relay instance.
+
+        :param pool (UpstreamPool): pool of the backend.
+        :param client (socket.socket): client connection.
+        :param buffer_size (int): bytes waiting for the client at most.
+        :param deadline (ConnectionDeadline): write deadline of the client,
+                                              armed while bytes wait for it.
+        :param capture (int): most response bytes copied to :attr:`captured`,
+                              None to copy nothing.
+        """
+        self.pool = pool
+        self.client = client
+        self.buffer_size = buffer_size
+        self.deadline = deadline
+        self.sent = 0
+        self.latency = None
+        self.connected = False
+        self.capture = capture
+        self.captured = bytearray() if capture is not None else None
+        # Client a fetch streams to once the response outgrows its limit.
+        self._spill = None
+
+    def run(self, request):
+        """
+        Send a request to the backend and stream its response to the client.
+
+        A reused backend connection found dead before the first response
+        byte is replaced once, for idempotent methods, like
+        :meth:`UpstreamPool.request <UpstreamPool.request>`.
+
+        :param request (bytes): raw HTTP request.
+
+        :rtype int: response bytes sent to the client.
+
+        :raises UpstreamError: If the backend answers garbage or times out.
+        :raises OSError: If either side fails, check :attr:`sent` to know
+                         whether the client already got part of a response.
+        """
+        method = request_method(request)
+        request = self.pool.prepare(request)
+        started = time.monotonic()
+        while True:
+            conn, reused = self.pool.acquire()
+            self.connected = True
+            framer = ResponseFramer(method, close_connection)
+            try:
+                conn.requests += 1
+                sent_all = self._pump(conn.sock, request, framer, started)
+            except (OSError, UpstreamError):
+                self.pool.release(conn, False)
+                if self.pool.retryable(reused, framer, method):
+                    continue
+                raise
+            except BaseException:
+                self.pool.release(conn, False)
+                raise
+            self.pool.release(conn, framer.keep_alive and sent_all)
+            return self.sent
+
+    def fetch(self, request, limit=None):
+        """
+        Send a request to the backend and buffer its response, nothing is
+        sent to the client unless the response outgrows ``limit``: it is then
+        streamed to the client like with :meth:`run`, the buffered part first.
+
+        :param request (bytes): raw HTTP request.
+        :param limit (int): most response bytes buffered, None for no limit.
+
+        :rtype bytes: the response, its head announcing ``Connection: close``,
+                      None if it was larger than ``limit``.
+
+        :raises UpstreamError: If the backend answers garbage or times out.
+        :raises OSError: If either side fails.
+        """
+        client, self.client = self.client, None
+        capture, self.capture, self.captured = self.capture, limit, bytearray()
+        self._spill = client
+        try:
+            self.run(request)
+            return bytes(self.captured) if self.captured is not None else None
+        finally:
+            self.client, self.capture, self._spill = client, capture, None
+
+    def _pump(self, upstream, request, framer, started):
+        """
+        Move bytes until the response is complete and delivered.
+
+        :rtype bool: whether the whole request was sent, a backend answering
+                     early leaves the rest unsent and its connection unusable.
+        """
+        client = self.client
+        client_timeout = client.gettimeout() if client is not None else None
+        upstream_timeout = upstream.gettimeout()
+        pending = memoryview(request)
+        outbox = bytearray()
+        selector = selectors.DefaultSelector()
+        masks = {upstream: 0, client: 0}
+
+        def watch(sock, mask):
+            if mask == masks[sock]:
+                return
+            if not masks[sock]:
+                selector.register(sock, mask)
+            elif not mask:
+                selector.unregister(sock)
+            else:
+                selector.modify(sock, mask)
+            masks[sock] = mask
+
+        upstream.setblocking(False)
+        if client is not None:
+            client.setblocking(False)
+        try:
+            while not framer.done or outbox:
+                mask = 0
+                if pending and not framer.done:
+                    mask |= selectors.EVENT_WRITE
+                if not framer.done and len(outbox) < self.buffer_size:
+                    mask |= selectors.EVENT_READ
+                watch(upstream, mask)
+                if client is not None:
+                    watch(client, selectors.EVENT_WRITE if outbox else 0)
+
+                events = selector.select(self.pool.timeout)
+                if not events:
+                    raise UpstreamError("Relay stalled for {}s".format(self.pool.timeout))
+                for key, events_mask in events:
+                    if key.fileobj is client:
+                        self._deliver(outbox)
+                        continue
+                    if events_mask & selectors.EVENT_WRITE and pending:
+                        try:
+                            pending = pending[upstream.send(pending[:RECV_SIZE]):]
+                        except (BlockingIOError, InterruptedError):
+                            pass
+                    if events_mask & selectors.EVENT_READ:
+                        try:
+                            data = upstream.recv(min(RECV_SIZE, self.buffer_size - len(outbox)))
+                        except (BlockingIOError, InterruptedError):
+                            continue
+                        if not data:
+                            framer.finish()
+                            continue
+                        if self.latency is None:
+                            self.latency = time.monotonic() - started
+                        chunk = framer.feed(data)
+                        if self.captured is not None:
+                            if self.capture is not None and len(self.captured) + len(chunk) > self.capture:
+                                if client is None and self._spill is not None:
+                                    # Too large to buffer: stream it after all.
+                                    chunk = bytes(self.captured) + chunk
+                                    client = self.client = self._spill
+                                    client_timeout = client.gettimeout()
+                                    client.setblocking(False)
+                                    masks[client] = 0
+                                self.captured = None
+                            else:
+                                self.captured += chunk
+                        if client is None:
+                            continue
+                        waiting = bool(outbox)
+                        outbox += chunk
+                        if outbox and not waiting and self.deadline is not None:
+                            self.deadline.arm("write")
+            return not pending
+        finally:
+            selector.close()
+            upstream.settimeout(upstream_timeout)
+            if client is not None:
+                client.settimeout(client_timeout)
+
+    def _deliver(self, outbox):
+        """Send what the client accepts, re-arming its deadline on progress."""
+        try:
+            sent = self.client.send(outbox)
+        except (BlockingIOError, InterruptedError):
+            return
+        del outbox[:sent]
+        self.sent += sent
+        if self.deadline is not None:
+            if outbox:
+                self.deadline.arm("write")
+            else:
+                self.deadline.cancel()
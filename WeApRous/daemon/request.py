@@ -16,8 +16,20 @@ daemon.request
 
 This module provides a Request object to manage and persist 
 request settings (cookies, auth, proxies).
+
+The request head is parsed once by :func:`parse_head <parse_head>`; header
+values are only decoded when they are read. Likewise ``cookies``, ``query``,
+``form`` and ``json`` are parsed on first access and then memoized, a route
+that never reads them never pays for them.
 """
+import json
+from functools import cached_property
+from urllib.parse import parse_qsl
+
 from .dictionary import CaseInsensitiveDict
+from .parser import parse_head, RequestHead
+from .reader import RequestError
+from .router import Router
 
 class Request():
     """The fully mutable "class" `Request <Request>` object,
@@ -46,6 +58,8 @@ class Request():
         "body",
         "routes",
         "hook",
+        "params",
+        "allowed",
     ]
 
     def __init__(self):
@@ -57,20 +71,21 @@ class Request():
         self.headers = None
         #: HTTP path
         self.path = None        
-        # The cookies set used to create Cookie header
-        self.cookies = None
         #: request body to send to the server.
         self.body = None
         #: Routes
         self.routes = {}
         #: Hook point for routed mapped-path
         self.hook = None
+        #: Path parameters of the matched route
+        self.params = {}
+        #: Methods declared for the path when the request method is not
+        self.allowed = ()
 
     def extract_request_line(self, request):
         try:
-            lines = request.splitlines()
-            first_line = lines[0]
-            method, path, version = first_line.split()
+            head = request if isinstance(request, RequestHead) else parse_head(request)
+            method, path, version = head.method, head.target, head.version
 
             if path == '/':
                 path = '/index.html'
@@ -82,20 +97,30 @@ class Request():
         return method, path, version
              
     def prepare_headers(self, request):
-        """Prepares the given HTTP headers."""
-        lines = request.split('\r\n')
-        headers = {}
-        for line in lines[1:]:
-            if ': ' in line:
-                key, val = line.split(': ', 1)
-                headers[key.lower()] = val
-        return headers
+        """Prepares the given HTTP headers, a lazily decoded :class:`Headers <Headers>`."""
+        head = request if isinstance(request, RequestHead) else parse_head(request)
+        return head.headers
 
     def prepare(self, request, routes=None):
-        """Prepares the entire request with the given parameters."""
+        """Prepares the entire request with the given parameters.
+
+        :param request: the parsed :class:`RequestHead <RequestHead>`, or the
+                        raw head as ``bytes`` / ``str``.
+        :param routes (Router): the :class:`Router <Router>` compiled once
+                                when the server starts, see :meth:`Router.compile`.
+
+        :raises RequestError: If the request line is malformed (400).
+        :raises TypeError: If ``routes`` is an uncompiled mapping.
+        """
+        if not isinstance(request, RequestHead):
+            try:
+                request = parse_head(request)
+            except ValueError:
+                raise RequestError(400, "Bad Request")
 
         # Prepare the request line from the request header
         self.method, self.path, self.version = self.extract_request_line(request)
+        self.url = request.target
         print("[Request] {} path {} version {}".format(self.method, self.path, self.version))
 
         #
@@ -105,35 +130,81 @@ class Request():
         # TODO manage the webapp hook in this mounting point
         #
         
-        if not routes == {}:
+        if routes:
+            if not isinstance(routes, Router):
+                # Compiling here would rebuild the tree for every request.
+                raise TypeError("routes must be compiled once with Router.compile")
             self.routes = routes
-            self.hook = routes.get((self.method, self.path))
+            match = routes.match(self.method, self.path)
+            if match is not None:
+                self.hook, self.params, self.allowed = match.hook, match.params, match.allowed
             #
             # self.hook manipulation goes here
             # ...
             #
 
         self.headers = self.prepare_headers(request)
-        cookie_str = self.headers.get('cookie', '')
-            #
-            #  TODO: implement the cookie function here
-            #        by parsing the header            #
-        self.cookies = {} # Use a simple dict
-        
-        if cookie_str:
-            try:
-                pairs = cookie_str.split(';')
-                for pair in pairs:
-                    if '=' not in pair: continue
-                    key, value = pair.strip().split('=', 1)
-                    self.cookies[key] = value
-                print("[Request] Parsed cookies: {}".format(self.cookies))
-            except Exception as e:
-                print("[Request] Error parsing cookies: {}".format(e))
-        # --- End of FIX ---
-
         return
 
+    @cached_property
+    def cookies(self):
+        """Cookies sent in the ``Cookie`` header, parsed on first access.
+
+        :rtype dict: cookie name -> value.
+        """
+        cookies = {}
+        for pair in self.headers.get('cookie', '').split(';'):
+            if '=' not in pair:
+                continue
+            key, value = pair.strip().split('=', 1)
+            cookies[key] = value
+        return cookies
+
+    @cached_property
+    def query(self):
+        """Parameters of the query string, parsed on first access.
+
+        :rtype dict: name -> value, the last one wins for repeated names.
+        """
+        _, _, query = (self.url or '').partition('?')
+        return dict(parse_qsl(query, keep_blank_values=True))
+
+    @cached_property
+    def form(self):
+        """Fields of an ``application/x-www-form-urlencoded`` body (also
+        assumed when no ``Content-Type`` is sent), parsed on first access.
+
+        :rtype dict: name -> value, empty for other content types.
+        """
+        content_type = self.headers.get('content-type', '') if self.headers else ''
+        if content_type and not content_type.lower().startswith('application/x-www-form-urlencoded'):
+            return {}
+        return dict(parse_qsl(self.body or '', keep_blank_values=True))
+
+    @cached_property
+    def _json(self):
+        """Outcome of parsing the body, (document, error), kept so that a
+        malformed body is not parsed again on every access."""
+        if not self.body:
+            return {}, None
+        try:
+            return json.loads(self.body), None
+        except ValueError as e:
+            return None, e
+
+    @property
+    def json(self):
+        """The JSON document of the body, parsed on first access.
+
+        :rtype: the decoded document, an empty dict for an empty body.
+
+        :raises ValueError: If the body is not valid JSON.
+        """
+        document, error = self._json
+        if error is not None:
+            raise error.with_traceback(None)
+        return document
+
     def prepare_body(self, data, files, json=None):
         self.prepare_content_length(self.body)
         self.body = data
@@ -18,15 +18,119 @@ This module provides a :class: `Response <Response>` object to manage and persis
 response settings (cookies, auth, proxies), and to construct HTTP responses
 based on incoming requests. 
 
-The current version supports MIME type detection, content loading and header formatting
+The current version supports MIME type detection, content loading and header formatting,
+and :class:`ChunkedResponse <ChunkedResponse>` for bodies streamed from generators,
+iterators or file-like objects. Static files are read through the in-memory
+:class:`StaticCache <StaticCache>`; files too large to be cached are answered
+with a :class:`FileResponse <FileResponse>` whose body goes from the page cache
+to the socket with ``sendfile``, never through Python memory.
+
+Static files are sent with ``ETag`` / ``Last-Modified`` validators and the
+``Cache-Control`` lifetime of their directory; ``If-None-Match`` and
+``If-Modified-Since`` requests for an unchanged file get ``304 Not Modified``.
+Static files are resolved through the :class:`AssetManifest <AssetManifest>`
+built at startup when there is one, by MIME type and path otherwise.
+
+``Range`` requests (guarded by ``If-Range``) get ``206 Partial Content``, as a
+``multipart/byteranges`` body when several ranges are asked for, or ``416``
+when none of them is satisfiable.
+
+Text files are sent ``gzip`` or ``deflate`` encoded to clients that accept
+it (``Accept-Encoding``), from the compressed variants kept by the cache.
+
+Route hooks reply with a :class:`RouteResponse <RouteResponse>` (or a
+``(status, headers, body)`` tuple, or a ``dict`` sent as JSON). Its head is
+built from cached status lines and written together with the body by one
+``sendmsg`` call, without concatenating them into a new buffer.
+
+Every head is assembled by :mod:`daemon.serializer <daemon.serializer>` from
+pre-encoded fragments and a ``Date`` refreshed once per second.
 """
+import binascii
 import datetime
+import json
 import os
 import mimetypes
+import socket
+from email.utils import parsedate_to_datetime
 from .dictionary import CaseInsensitiveDict
+from .staticcache import static_cache
+from .manifest import asset_manifest, guess_mime_type, locate
+from .compression import compress, is_compressible, merge_vary, negotiate_encoding
+from .serializer import serialize_head
 
 BASE_DIR = ""
 
+#: Size of the blocks read from file-like bodies while streaming.
+STREAM_BLOCK_SIZE = 65536
+#: Bytes handed to one ``sendfile`` call, the write deadline is re-armed between calls.
+SENDFILE_BLOCK_SIZE = 1024 * 1024
+#: Whether the platform offers the ``sendfile`` system call.
+HAS_SENDFILE = hasattr(os, "sendfile")
+#: Most byte ranges answered in one response, a longer ``Range`` is ignored.
+MAX_RANGES = 16
+#: Whether sockets offer scatter-gather writes (``sendmsg``).
+HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+#: Statuses whose reply never has a body nor a ``Content-Length``.
+BODYLESS_STATUSES = (204, 304)
+
+
+def parse_status(status):
+    """
+    Splits a hook status into code and reason.
+
+    :param status: ``200``, ``"404"`` or ``"500 Error"``.
+
+    :rtype tuple: (status code, reason phrase or None for the standard one).
+
+    :raises ValueError: If the status code is not a number.
+    """
+    if isinstance(status, int):
+        return int(status), None
+    code, _, reason = str(status).strip().partition(" ")
+    return int(code), reason.strip() or None
+
+
+def parse_range(header, size):
+    """
+    Parses a ``Range`` header against a representation of ``size`` bytes.
+
+    :param header (str): the header value, e.g. ``bytes=0-99,-500``.
+    :param size (int): length of the representation.
+
+    :rtype list: (first, last) inclusive positions of the satisfiable ranges,
+                 empty if none is satisfiable, or None if the header is
+                 malformed or uses another unit and must be ignored.
+    """
+    unit, _, spec = header.partition('=')
+    items = [item.strip() for item in spec.split(',') if item.strip()]
+    if unit.strip().lower() != 'bytes' or not items or len(items) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for item in items:
+        first, sep, last = item.partition('-')
+        first, last = first.strip(), last.strip()
+        if not sep or (first and not first.isdigit()) or (last and not last.isdigit()):
+            return None
+        if not first:
+            # Suffix range: the last N bytes.
+            if not last:
+                return None
+            if int(last) > 0:
+                ranges.append((max(size - int(last), 0), size - 1))
+            continue
+        first = int(first)
+        if not last:
+            last = size - 1
+        elif int(last) < first:
+            return None
+        else:
+            last = int(last)
+        if first < size:
+            ranges.append((first, min(last, size - 1)))
+    return ranges
+
 class Response():   
     """The :class:`Response <Response>` object, which contains a
     server's response to an HTTP request.
@@ -128,11 +232,7 @@ class Response():
         :rtype str: MIME type string (e.g., 'text/html', 'image/png').
         """
 
-        try:
-            mime_type, _ = mimetypes.guess_type(path)
-        except Exception:
-            return 'application/octet-stream'
-        return mime_type or 'application/octet-stream'
+        return guess_mime_type(path)
 
 
     def prepare_content_type(self, mime_type='text/html'):
@@ -146,56 +246,21 @@ class Response():
 
         :raises ValueError: If the MIME type is unsupported.
         """
-        
-        base_dir = ""
 
         # Processing mime_type based on main_type and sub_type
         main_type, sub_type = mime_type.split('/', 1)
         print("[Response] processing MIME main_type={} sub_type={}".format(main_type,sub_type))
-        
-        # Set the content type header regardless of type
-        self.headers['Content-Type'] = mime_type
-        
-        
-
-        if main_type == 'text':
-            if sub_type == 'html':
-                base_dir = BASE_DIR + "www/"
-            elif sub_type in ('css', 'javascript', 'plain'):
-                base_dir = BASE_DIR + "static/"
-            else:
-                # --- FIX: Replaced handle_text_other ---
-                # Default to static for other text types (e.g., text/xml)
-                base_dir = BASE_DIR + "static/"
-                
-        elif main_type == 'image':
-            # (e.g., image/png, image/jpeg, image/x-icon, image/svg+xml)
-            base_dir = BASE_DIR + "static/"
-            
-        elif main_type == 'application':
-            if sub_type in ('javascript', 'x-javascript'):
-                # Handle application/javascript
-                self.headers['Content-Type'] = 'application/javascript'
-                base_dir = BASE_DIR + "static/"
-            else:
-                # (e.g., application/json, application/octet-stream)
-                base_dir = BASE_DIR + "apps/" # or static/, depends on dev's choice
-        
-        #
-        #  TODO: process other mime_type
-        #
-        else:
-            # --- FIX: Use Python 3 print() ---
-            print("[Response] Warning: Unsupported MIME main_type: {}".format(main_type))
-            # Default to static for unknown main types
-            base_dir = BASE_DIR + "static/"
 
-        return base_dir
+        # Pages come from www/, styles, scripts and images from static/
+        content_type, base_dir = locate(mime_type)
+        self.headers['Content-Type'] = content_type
+        return BASE_DIR + base_dir
 
 
     def build_content(self, path, base_dir):
         """
-        Loads the objects file from storage space.
+        Loads the objects file from storage space, through the shared
+        :class:`StaticCache <StaticCache>` so hot files are served from memory.
 
         :params path (str): relative path to the file.
         :params base_dir (str): base directory where the file is located.
@@ -211,8 +276,7 @@ class Response():
             #        store in the return value of content
             #
         try: 
-            with open(filepath, 'rb') as f:
-                content = f.read()
+            content = static_cache().read(filepath)
             return len(content), content
         except FileNotFoundError:
             print("[Response] File not found: {}".format(filepath))
@@ -222,69 +286,319 @@ class Response():
             return 0, b"" # Return empty content on error
 
 
-    def build_response_header(self, request):
+    def lookup_content(self, path, base_dir):
         """
-        Constructs the HTTP response headers based on the class:`Request <Request>
-        and internal attributes.
+        Looks a static file up in the shared :class:`StaticCache <StaticCache>`.
+
+        :params path (str): relative path to the file.
+        :params base_dir (str): base directory where the file is located.
+
+        :rtype StaticFile: the file, its ``content`` is None when it is too large
+                           to be held in memory; None if it cannot be read.
+        """
+        filepath = os.path.join(base_dir, path.lstrip('/'))
+        print("[Response] serving the object at location {}".format(filepath))
+        try:
+            return static_cache().lookup(filepath)
+        except FileNotFoundError:
+            print("[Response] File not found: {}".format(filepath))
+        except Exception as e:
+            print("[Response] Error reading file {}: {}".format(filepath, e))
+        return None
+
+    def lookup_asset(self, asset):
+        """
+        Looks a file of the :class:`AssetManifest <AssetManifest>` up in the
+        shared :class:`StaticCache <StaticCache>` and sets its Content-Type.
+
+        :params asset (Asset): the manifest entry of the requested path.
+
+        :rtype StaticFile: the file, None if it cannot be read (e.g. it was
+                           removed since the manifest was built).
+        """
+        self.headers['Content-Type'] = asset.mime_type
+        try:
+            return static_cache().lookup(asset.path)
+        except OSError as e:
+            print("[Response] Error reading file {}: {}".format(asset.path, e))
+        return None
+
+    def find_content(self, request):
+        """
+        Resolves a static file without manifest: MIME type from the path,
+        base directory from the MIME type, then a cache lookup.
 
         :params request (class:`Request <Request>`): incoming request object.
 
-        :rtypes bytes: encoded HTTP response header.
+        :rtype StaticFile: the file, None if it cannot be found.
         """
-        reqhdr = request.headers
-        rsphdr = self.headers
-
-        #Build dynamic headers
-        headers = {
-                "Accept": "{}".format(reqhdr.get("Accept", "application/json")),
-                "Accept-Language": "{}".format(reqhdr.get("Accept-Language", "en-US,en;q=0.9")),
-                "Authorization": "{}".format(reqhdr.get("Authorization", "Basic <credentials>")),
-                "Cache-Control": "no-cache",
-                "Content-Type": "{}".format(self.headers['Content-Type']),
-                "Content-Length": "{}".format(len(self._content)),
-#                "Cookie": "{}".format(reqhdr.get("Cookie", "sessionid=xyz789")), #dummy cooki
-        #
-        # TODO prepare the request authentication
-        #
-	# self.auth = ...
-                "Date": "{}".format(datetime.datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT")),
-                "Max-Forward": "10",
-                "Pragma": "no-cache",
-                "Proxy-Authorization": "Basic dXNlcjpwYXNz",  # example base64
-                "Warning": "199 Miscellaneous warning",
-                "User-Agent": "{}".format(reqhdr.get("User-Agent", "Chrome/123.0.0.0")),
-            }
-
-        # Header text alignment
-            #
-            #  TODO: implement the header building to create formated
-            #        header from the provied headers
-            #
+        path = request.path
+
+        mime_type = self.get_mime_type(path)
+        print("[Response] Method: {} path {} mime_type {}".format(request.method, request.path, mime_type))
+
+        base_dir = ""
+
+        #If HTML, parse and serve embedded objects
+        try:
+            # This will correctly route 'text/html' to 'www/'
+            # and 'text/css', 'image/png', etc. to 'static/'
+            base_dir = self.prepare_content_type(mime_type=mime_type)
+        except ValueError as e:
+            # Handle unsupported MIME types if prepare_content_type raises an error
+            print(f"[Response] Unsupported MIME type or error: {e}")
+            return None
         #
-        # TODO prepare the request authentication
+        # TODO: add support objects
         #
-	# self.auth = ...
+        print("[Response] base_dir {}".format(base_dir))
+        print("[Response] path {}".format(path))
 
-        # Set status line first. Assume 200 OK for now.
-        # Task 1 will require changing this for 401.    
-        self.status_code = 200
-        self.reason = "OK"
+        return self.lookup_content(path, base_dir)
 
-        fmt_header = "HTTP/1.1 {} {}\r\n".format(self.status_code, self.reason)
+    def build_response_header(self, request, content_length=None):
+        """
+        Constructs the HTTP response headers based on the class:`Request <Request>
+        and internal attributes.
 
-        # Add all headers from the dictionary
-        for key, value in headers.items():
-            fmt_header += "{}: {}\r\n".format(key, value)
+        Only response headers are sent: request headers (``Accept``,
+        ``Authorization``, ``User-Agent``...) are not echoed back. The head is
+        joined once from cached fragments, see :func:`serialize_head`.
+
+        :params request (class:`Request <Request>`): incoming request object.
+        :params content_length (int): body size, ``len(self._content)`` if omitted.
+
+        :rtypes bytes: encoded HTTP response header.
+        """
+        # Set status line first. Assume 200 OK unless a partial reply was prepared.
+        # Task 1 will require changing this for 401.
+        if self.status_code is None:
+            self.status_code = 200
+            self.reason = "OK"
+
+        cache_control = self.headers.get('Cache-Control', 'no-cache')
+        headers = [
+            ("Cache-Control", cache_control),
+            ("Content-Type", self.headers['Content-Type']),
+        ]
+        if cache_control == "no-cache":
+            # Only for HTTP/1.0 caches, it would override a max-age.
+            headers.append(("Pragma", "no-cache"))
+
+        # Validators, ranges and coding of static files (conditional GET,
+        # partial content, compression)
+        for key in ('ETag', 'Last-Modified', 'Accept-Ranges', 'Content-Range',
+                    'Content-Encoding', 'Vary'):
+            if self.headers.get(key):
+                headers.append((key, self.headers[key]))
 
         # Add the Set-Cookie header if it exists (for Task 1A)
         if self.headers.get('Set-Cookie'):
-            fmt_header += "Set-Cookie: {}\r\n".format(self.headers['Set-Cookie'])
+            headers.append(("Set-Cookie", self.headers['Set-Cookie']))
 
-        # Final blank line to separate headers from body
-        fmt_header += "\r\n"
-        return str(fmt_header).encode('utf-8')
+        return serialize_head(self.status_code, self.reason, headers,
+                              len(self._content) if content_length is None else content_length)
 
 
+    def select_variant(self, request, entry):
+        """
+        Negotiates the content coding of a static file. Compressible files
+        vary on ``Accept-Encoding``; the compressed variant is served when
+        the client accepts it and the cache has one.
+
+        :params request (class:`Request <Request>`): incoming request object.
+        :params entry (StaticFile): the file being served.
+
+        :rtype StaticFile: the variant to send, ``entry`` itself for the identity.
+        """
+        if not is_compressible(self.headers.get('Content-Type')):
+            return entry
+        self.headers['Vary'] = merge_vary(self.headers.get('Vary'))
+        encoding = negotiate_encoding(request.headers.get('accept-encoding')) if request.headers else None
+        if encoding is None:
+            return entry
+        variant = static_cache().variant(entry, encoding)
+        if variant is None:
+            return entry
+        self.headers['Content-Encoding'] = encoding
+        return variant
+
+    def prepare_validators(self, entry):
+        """
+        Sets the ``ETag``, ``Last-Modified`` and ``Cache-Control`` headers of a
+        static file.
+
+        :params entry (StaticFile): the file being served.
+        """
+        self.headers['ETag'] = entry.etag
+        self.headers['Last-Modified'] = entry.last_modified
+        self.headers['Accept-Ranges'] = 'bytes'
+        if entry.max_age > 0:
+            self.headers['Cache-Control'] = "public, max-age={}".format(entry.max_age)
+        else:
+            # Cached, but revalidated with the validators on every use.
+            self.headers['Cache-Control'] = "no-cache"
+
+    def is_not_modified(self, request, entry):
+        """
+        Evaluates the conditional headers of a GET or HEAD request.
+        ``If-None-Match`` takes precedence over ``If-Modified-Since``.
+
+        :params request (class:`Request <Request>`): incoming request object.
+        :params entry (StaticFile): the file being served.
+
+        :rtype bool: True if the client copy is still valid (answer 304).
+        """
+        if request.method not in ("GET", "HEAD") or not request.headers:
+            return False
+
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match is not None:
+            for tag in if_none_match.split(','):
+                tag = tag.strip()
+                # Weak comparison, as required for If-None-Match.
+                if tag == '*' or (tag[2:] if tag.startswith('W/') else tag) == entry.etag:
+                    return True
+            return False
+
+        if_modified_since = request.headers.get('if-modified-since')
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError, IndexError):
+                return False
+            return entry.mtime // 1000000000 <= since
+        return False
+
+    def build_not_modified(self):
+        """
+        Constructs a ``304 Not Modified`` response carrying the validators.
+
+        :rtype bytes: Encoded 304 response.
+        """
+        self.status_code = 304
+        self.reason = "Not Modified"
+        headers = [(key, self.headers[key]) for key in
+                   ('ETag', 'Last-Modified', 'Cache-Control', 'Vary') if key in self.headers]
+        return serialize_head(304, "Not Modified", headers)
+
+    def requested_ranges(self, request, entry):
+        """
+        Evaluates the ``Range`` and ``If-Range`` headers of a GET request.
+
+        :params request (class:`Request <Request>`): incoming request object.
+        :params entry (StaticFile): the file being served.
+
+        :rtype list: the satisfiable (first, last) ranges, empty for 416, or
+                     None to send the whole file.
+        """
+        if request.method != "GET" or not request.headers:
+            return None
+        header = request.headers.get('range')
+        if not header:
+            return None
+
+        if_range = request.headers.get('if-range')
+        if if_range is not None:
+            if_range = if_range.strip()
+            # An entity tag is compared strongly, a weak one never matches.
+            validator = entry.etag if if_range.startswith(('"', 'W/')) else entry.last_modified
+            if if_range != validator:
+                return None
+        return parse_range(header, entry.size)
+
+    def build_partial(self, request, entry, ranges):
+        """
+        Constructs a ``206 Partial Content`` response, with a
+        ``multipart/byteranges`` body when there are several ranges.
+
+        :params request (class:`Request <Request>`): incoming request object.
+        :params entry (StaticFile): the file being served.
+        :params ranges (list): satisfiable (first, last) inclusive ranges.
+
+        :rtype bytes: the response, or a :class:`FileResponse <FileResponse>` /
+                      :class:`ChunkedResponse <ChunkedResponse>` for files not
+                      held in memory.
+        """
+        self.status_code = 206
+        self.reason = "Partial Content"
+
+        if len(ranges) == 1:
+            first, last = ranges[0]
+            count = last - first + 1
+            self.headers['Content-Range'] = "bytes {}-{}/{}".format(first, last, entry.size)
+            self._header = self.build_response_header(request, count)
+            if entry.content is None:
+                return FileResponse(entry.path, self._header, first, count)
+            return self._header + entry.content[first:last + 1]
+
+        boundary = binascii.hexlify(os.urandom(12)).decode()
+        part_type = self.headers['Content-Type']
+        parts = [(("--{}\r\nContent-Type: {}\r\nContent-Range: bytes {}-{}/{}\r\n\r\n").format(
+                      boundary, part_type, first, last, entry.size).encode('utf-8'), first, last)
+                 for first, last in ranges]
+        closing = "--{}--\r\n".format(boundary).encode('utf-8')
+        self.headers['Content-Type'] = "multipart/byteranges; boundary={}".format(boundary)
+
+        if entry.content is None:
+            # Streamed from the file but with its exact length, so that no
+            # chunked framing is needed, whatever the client version.
+            length = sum(len(head) + last - first + 3 for head, first, last in parts) + len(closing)
+            headers = {key: self.headers[key] for key in
+                       ('Cache-Control', 'ETag', 'Last-Modified', 'Content-Encoding', 'Vary')
+                       if key in self.headers}
+            return ChunkedResponse(self.iter_parts(entry.path, parts, closing),
+                                   content_type=self.headers['Content-Type'],
+                                   status_code=206, reason="Partial Content", headers=headers,
+                                   length=length)
+
+        body = b"".join(head + entry.content[first:last + 1] + b"\r\n"
+                        for head, first, last in parts) + closing
+        self._header = self.build_response_header(request, len(body))
+        return self._header + body
+
+    @staticmethod
+    def iter_parts(path, parts, closing):
+        """
+        Yields a ``multipart/byteranges`` body read from a file in blocks.
+
+        :params path (str): path of the file.
+        :params parts (list): (part head, first, last) of every range.
+        :params closing (bytes): the closing boundary.
+
+        :rtype iterator: bytes blocks of the body.
+        """
+        with open(path, 'rb') as f:
+            for head, first, last in parts:
+                yield head
+                f.seek(first)
+                remaining = last - first + 1
+                while remaining > 0:
+                    block = f.read(min(remaining, STREAM_BLOCK_SIZE))
+                    if not block:
+                        raise OSError("File {} truncated while sending".format(path))
+                    remaining -= len(block)
+                    yield block
+                yield b"\r\n"
+        yield closing
+
+    def build_range_not_satisfiable(self, entry):
+        """
+        Constructs a ``416 Range Not Satisfiable`` response.
+
+        :params entry (StaticFile): the file being served.
+
+        :rtype bytes: Encoded 416 response.
+        """
+        self.status_code = 416
+        self.reason = "Range Not Satisfiable"
+        return (
+                "HTTP/1.1 416 Range Not Satisfiable\r\n"
+                "Content-Range: bytes */{}\r\n"
+                "Content-Length: 0\r\n"
+                "\r\n"
+            ).format(entry.size).encode('utf-8')
+
     def build_notfound(self):
         """
         Constructs a standard 404 Not Found HTTP response.
@@ -310,36 +624,601 @@ class Response():
 
         :params request (class:`Request <Request>`): incoming request object.
 
-        :rtype bytes: complete HTTP response using prepared headers and content.
+        :rtype bytes: complete HTTP response using prepared headers and content,
+                      or a :class:`FileResponse <FileResponse>` for files too
+                      large for the static cache.
         """
 
         path = request.path
 
-        mime_type = self.get_mime_type(path)
-        print("[Response] Method: {} path {} mime_type {}".format(request.method, request.path, mime_type))
-
-        base_dir = ""
-
-        #If HTML, parse and serve embedded objects
-        try:
-            # This will correctly route 'text/html' to 'www/'
-            # and 'text/css', 'image/png', etc. to 'static/'
-            base_dir = self.prepare_content_type(mime_type=mime_type)
-        except ValueError as e:
-            # Handle unsupported MIME types if prepare_content_type raises an error
-            print(f"[Response] Unsupported MIME type or error: {e}")
-            return self.build_notfound()
-        #
-        # TODO: add support objects
-        #
-        print("[Response] base_dir {}".format(base_dir))
-        print("[Response] path {}".format(path))
+        manifest = asset_manifest()
+        if manifest is not None:
+            # One dict hit; a path missing from the manifest never reaches the disk.
+            asset = manifest.get(path)
+            entry = self.lookup_asset(asset) if asset is not None else None
+        else:
+            entry = self.find_content(request)
 
-        c_len, self._content = self.build_content(path, base_dir)
-        if c_len == 0:
+        if entry is None or entry.size == 0:
             print(f"[Response] File not found or is empty, returning 404 for: {path}")
             return self.build_notfound()
-            
+
+        entry = self.select_variant(request, entry)
+        self.prepare_validators(entry)
+        if self.is_not_modified(request, entry):
+            return self.build_not_modified()
+
+        ranges = self.requested_ranges(request, entry)
+        if ranges is not None:
+            if not ranges:
+                return self.build_range_not_satisfiable(entry)
+            return self.build_partial(request, entry, ranges)
+
+        self._content = entry.content
+        if entry.content is None:
+            # Too big to cache: the body is sent straight from the file.
+            self._header = self.build_response_header(request, entry.size)
+            return FileResponse(entry.path, self._header, 0, entry.size)
+
         self._header = self.build_response_header(request)
 
-        return self._header + self._content
\ No newline at end of file
+        return self._header + self._content
+
+
+class ChunkedResponse():
+    """The :class:`ChunkedResponse <ChunkedResponse>` object, a response whose
+    body is produced piece by piece and sent with ``Transfer-Encoding: chunked``.
+
+    Route hooks may return one directly, or simply return a generator, an
+    iterator or a file-like object which the adapter wraps in a
+    :class:`ChunkedResponse <ChunkedResponse>`. The body is never held in
+    memory in full and the first bytes go out as soon as they are produced.
+    When the total ``length`` is known up front it is sent as
+    ``Content-Length`` instead and the body is not chunked, which every HTTP
+    version understands.
+
+    :attrs status_code (int): HTTP status code, 200 by default.
+    :attrs reason (str): textual reason for the status code.
+    :attrs headers (dict): response headers.
+    :attrs body: generator, iterator or file-like object yielding the body.
+    :attrs head (bytes): serialized status line and headers.
+    :attrs chunked (bool): whether the body is framed in chunks, False with
+                           a ``length`` or once :meth:`close_delimited` was called.
+    :attrs length (int): size of the body, None when unknown.
+
+    Usage::
+
+      >>> def export(headers, body):
+      >>>     return ChunkedResponse((json.dumps(p) + "\\n" for p in peers),
+      >>>                            content_type="application/x-ndjson")
+    """
+
+    __attrs__ = [
+        "status_code",
+        "reason",
+        "headers",
+        "body",
+        "head",
+        "chunked",
+        "length",
+    ]
+
+    def __init__(self, body, content_type=None, status_code=200, reason="OK", headers=None,
+                 length=None):
+        """
+        Initializes a new :class:`ChunkedResponse <ChunkedResponse>` object.
+
+        :param body: generator, iterator or file-like object yielding bytes or str.
+        :param content_type (str): MIME type, guessed from the file name if omitted.
+        :param status_code (int): HTTP status code.
+        :param reason (str): textual reason for the status code.
+        :param headers (dict): extra response headers.
+        :param length (int): exact size of the body in bytes, if known.
+        """
+        if content_type is None:
+            name = getattr(body, "name", None)
+            if isinstance(name, str):
+                content_type = mimetypes.guess_type(name)[0]
+            content_type = content_type or "application/octet-stream"
+
+        self.status_code = status_code
+        self.reason = reason
+        self.body = body
+        self.headers = {
+            "Content-Type": content_type,
+            "Transfer-Encoding": "chunked",
+            "Cache-Control": "no-cache",
+        }
+        self.headers.update(headers or {})
+        self.length = length
+        self.chunked = length is None
+        if not self.chunked:
+            del self.headers["Transfer-Encoding"]
+        self.head = serialize_head(status_code, reason, self.headers.items(), length)
+
+    def close_delimited(self):
+        """
+        Drop the chunked framing for a client that does not understand it
+        (HTTP/1.0): the blocks are sent as they are and the body ends when the
+        connection is closed, so the connection cannot be kept alive. A
+        response of known ``length`` is left as it is.
+
+        :rtype ChunkedResponse: self.
+        """
+        if self.length is not None:
+            return self
+        self.chunked = False
+        self.headers.pop("Transfer-Encoding", None)
+        head_end = self.head.find(b"\r\n\r\n")
+        lines = [line for line in self.head[:head_end].split(b"\r\n")
+                 if not line.lower().startswith(b"transfer-encoding:")]
+        self.head = b"\r\n".join(lines) + self.head[head_end:]
+        return self
+
+    @staticmethod
+    def is_streamable(value):
+        """
+        Tells whether a hook result should be streamed.
+
+        :param value: the hook return value.
+
+        :rtype bool: True for file-like objects, generators and iterators.
+        """
+        if isinstance(value, (bytes, str, bytearray)):
+            return False
+        return hasattr(value, "read") or hasattr(value, "__next__")
+
+    def iter_blocks(self):
+        """
+        Yields the raw body blocks, reading file-like bodies in fixed blocks.
+
+        :rtype iterator: bytes blocks of the body.
+        """
+        if hasattr(self.body, "read"):
+            while True:
+                block = self.body.read(STREAM_BLOCK_SIZE)
+                if not block:
+                    return
+                yield block
+        else:
+            yield from self.body
+
+    def __iter__(self):
+        """
+        Yields the body framed as HTTP chunks, ending with the last chunk, or
+        the bare blocks once :meth:`close_delimited` was called.
+
+        :rtype iterator: bytes ready to be written to the socket.
+        """
+        try:
+            for block in self.iter_blocks():
+                if isinstance(block, str):
+                    block = block.encode("utf-8")
+                if not block:
+                    # An empty chunk would end the body early.
+                    continue
+                if self.chunked:
+                    yield b"%x\r\n" % len(block) + block + b"\r\n"
+                else:
+                    yield block
+            if self.chunked:
+                yield b"0\r\n\r\n"
+        finally:
+            self.close()
+
+    def close(self):
+        """Release the underlying generator or file."""
+        close = getattr(self.body, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+
+class FileResponse():
+    """The :class:`FileResponse <FileResponse>` object, a response whose body
+    is a region of a file on disk.
+
+    Engines send the head, then move the body from the file to the socket with
+    ``sendfile`` (zero copy: the bytes never enter Python memory), in blocks of
+    :data:`SENDFILE_BLOCK_SIZE`. Where ``sendfile`` is not available the body
+    is read and written in :data:`STREAM_BLOCK_SIZE` blocks instead.
+
+    :attrs path (str): path of the file.
+    :attrs head (bytes): serialized status line and headers.
+    :attrs offset (int): position of the next byte to send.
+    :attrs remaining (int): bytes of the body still to send.
+    """
+
+    __attrs__ = [
+        "path",
+        "head",
+        "offset",
+        "remaining",
+    ]
+
+    def __init__(self, path, head, offset, count):
+        """
+        Initializes a new :class:`FileResponse <FileResponse>` object.
+
+        :param path (str): path of the file.
+        :param head (bytes): serialized status line and headers.
+        :param offset (int): position of the first body byte in the file.
+        :param count (int): length of the body.
+        """
+        self.path = path
+        self.head = head
+        self.offset = offset
+        self.remaining = count
+        self._file = None
+
+    @property
+    def file(self):
+        """The file object, opened on first use."""
+        if self._file is None:
+            self._file = open(self.path, 'rb')
+        return self._file
+
+    def fileno(self):
+        """Descriptor of the file, opened on first use."""
+        return self.file.fileno()
+
+    def advance(self, sent):
+        """
+        Account for ``sent`` body bytes written to the socket.
+
+        :raises OSError: If nothing could be read, i.e. the file shrank after
+                         its length was announced.
+        """
+        if not sent:
+            raise OSError("File {} truncated while sending".format(self.path))
+        self.offset += sent
+        self.remaining -= sent
+
+    def sendfile(self, sock):
+        """
+        Send the next block with one ``sendfile`` call, for non-blocking sockets.
+
+        :param sock (socket.socket): the client socket.
+
+        :rtype int: bytes sent.
+
+        :raises BlockingIOError: If the socket buffer is full.
+        """
+        sent = os.sendfile(sock.fileno(), self.fileno(), self.offset,
+                           min(self.remaining, SENDFILE_BLOCK_SIZE))
+        self.advance(sent)
+        return sent
+
+    def send(self, sock):
+        """
+        Send the body on a blocking socket, yielding after every block so the
+        caller can re-arm its write deadline.
+
+        :param sock (socket.socket): the client socket.
+
+        :rtype iterator: bytes sent by each block.
+        """
+        try:
+            if HAS_SENDFILE:
+                while self.remaining > 0:
+                    yield self.sendfile(sock)
+            else:
+                for block in self:
+                    sock.sendall(block)
+                    yield len(block)
+        finally:
+            self.close()
+
+    def __iter__(self):
+        """
+        Yields the body read in blocks, the buffered fallback of ``sendfile``.
+
+        :rtype iterator: bytes blocks of the body.
+        """
+        try:
+            self.file.seek(self.offset)
+            while self.remaining > 0:
+                block = self.file.read(min(self.remaining, STREAM_BLOCK_SIZE))
+                self.advance(len(block))
+                yield block
+        finally:
+            self.close()
+
+    def close(self):
+        """Close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ResponseHeaders():
+    """The :class:`ResponseHeaders <ResponseHeaders>` object, an ordered,
+    case insensitive multimap of response headers.
+
+    A name may appear several times (e.g. ``Set-Cookie``): :meth:`add` appends
+    a value, item assignment replaces every value of the name.
+
+    Usage::
+
+      >>> headers = ResponseHeaders({"Content-Type": "application/json"})
+      >>> headers.add("Set-Cookie", "a=1")
+      >>> headers.add("Set-Cookie", "b=2")
+      >>> headers.get_all("set-cookie")
+      ['a=1', 'b=2']
+    """
+
+    def __init__(self, headers=None):
+        """
+        :param headers: a dict, a list of (name, value) pairs or another
+                        :class:`ResponseHeaders <ResponseHeaders>`.
+        """
+        self._items = []
+        if headers is not None:
+            pairs = headers.items() if hasattr(headers, "items") else headers
+            for name, value in pairs:
+                self.add(name, value)
+
+    def add(self, name, value):
+        """Append a value to ``name``, keeping the previous ones."""
+        self._items.append((name, str(value)))
+
+    def get(self, name, default=None):
+        """First value of ``name``, ``default`` if absent."""
+        name = name.lower()
+        for key, value in self._items:
+            if key.lower() == name:
+                return value
+        return default
+
+    def get_all(self, name):
+        """Every value of ``name``, in order."""
+        name = name.lower()
+        return [value for key, value in self._items if key.lower() == name]
+
+    def items(self):
+        """The (name, value) pairs, repeated names included."""
+        return list(self._items)
+
+    def __getitem__(self, name):
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name, value):
+        del self[name]
+        self.add(name, value)
+
+    def __delitem__(self, name):
+        name = name.lower()
+        self._items = [(key, value) for key, value in self._items if key.lower() != name]
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __iter__(self):
+        return (name for name, _ in self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return "ResponseHeaders({!r})".format(self._items)
+
+
+class RouteResponse():
+    """The :class:`RouteResponse <RouteResponse>` object, the reply of a
+    route hook: a status, a header multimap and a body.
+
+    The body is ``bytes`` (``str`` is encoded, a ``dict`` or ``list`` is sent
+    as JSON), or an iterator / file-like object which is streamed with
+    ``Transfer-Encoding: chunked``. ``Content-Length`` and the framing headers
+    are computed by the response, not taken from :attr:`headers`.
+
+    A buffered reply keeps its head and body as two buffers and writes both
+    with one ``sendmsg`` call per socket write (scatter-gather), so they are
+    never copied into one.
+
+    :attrs status_code (int): HTTP status code.
+    :attrs reason (str): reason phrase, None for the standard one.
+    :attrs headers (ResponseHeaders): response headers.
+    :attrs body: bytes, iterator or file-like object.
+
+    Usage::
+
+      >>> @app.route('/peers', methods=['GET'])
+      >>> def peers(request):
+      >>>     return RouteResponse.json({"peers": list(peer_storage)})
+    """
+
+    __attrs__ = [
+        "status_code",
+        "reason",
+        "headers",
+        "body",
+    ]
+
+    def __init__(self, body=b"", status=200, headers=None, content_type=None):
+        """
+        Initializes a new :class:`RouteResponse <RouteResponse>` object.
+
+        :param body: bytes, str, dict / list (JSON), iterator or file-like object.
+        :param status: status code, or ``"code reason"`` string.
+        :param headers: dict, list of (name, value) pairs or ResponseHeaders.
+        :param content_type (str): Content-Type, overriding ``headers``.
+        """
+        self.status_code, self.reason = parse_status(status)
+        self.headers = ResponseHeaders(headers)
+
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body)
+            content_type = content_type or "application/json"
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        elif body is None:
+            body = b""
+        self.body = body
+
+        if content_type is not None:
+            self.headers["Content-Type"] = content_type
+        elif "Content-Type" not in self.headers and self.status_code not in BODYLESS_STATUSES:
+            self.headers["Content-Type"] = "text/html"
+
+        self._head = None
+        self._pending = None
+
+    @classmethod
+    def json(cls, data, status=200, headers=None):
+        """
+        Builds a JSON reply.
+
+        :param data: JSON serializable value.
+        :param status: status code, or ``"code reason"`` string.
+        :param headers: extra headers.
+
+        :rtype RouteResponse: the reply.
+        """
+        return cls(json.dumps(data), status, headers, content_type="application/json")
+
+    @classmethod
+    def coerce(cls, value):
+        """
+        Converts a hook result into a reply.
+
+        :param value: a RouteResponse, a ``(status, headers, body)`` or
+                      ``(status, body)`` tuple, or a dict / list sent as JSON.
+
+        :rtype RouteResponse: the reply.
+
+        :raises TypeError: If the value has another shape.
+        """
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, (dict, list)):
+            return cls(value)
+        if isinstance(value, tuple) and len(value) == 3:
+            status, headers, body = value
+            return cls(body, status, headers)
+        if isinstance(value, tuple) and len(value) == 2:
+            status, body = value
+            return cls(body, status)
+        raise TypeError("Unsupported hook result {!r}".format(type(value)))
+
+    @property
+    def streamed(self):
+        """True if the body is an iterator or a file-like object."""
+        return ChunkedResponse.is_streamable(self.body)
+
+    @property
+    def head(self):
+        """Serialized status line and headers, built on first use."""
+        if self._head is None:
+            headers = [(name, value) for name, value in self.headers.items()
+                       if name.lower() not in ("content-length", "transfer-encoding")]
+            length = None
+            if self.streamed:
+                headers.append(("Transfer-Encoding", "chunked"))
+            elif self.status_code not in BODYLESS_STATUSES:
+                length = len(self.body)
+            self._head = serialize_head(self.status_code, self.reason, headers, length)
+        return self._head
+
+    @head.setter
+    def head(self, head):
+        self._head = head
+
+    def compress(self, accept_encoding, min_size):
+        """
+        Encode a buffered body for a client accepting gzip or deflate.
+
+        :param accept_encoding (str): the request ``Accept-Encoding`` value.
+        :param min_size (int): smallest body compressed.
+
+        :rtype RouteResponse: self, compressed when worth it.
+        """
+        if (self.streamed or len(self.body) < min_size or "Content-Encoding" in self.headers
+                or self.status_code in BODYLESS_STATUSES + (206,)
+                or not is_compressible(self.headers.get("Content-Type"))):
+            return self
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is None:
+            return self
+        body = compress(self.body, encoding)
+        if len(body) < len(self.body):
+            self.body = body
+            self.headers["Content-Encoding"] = encoding
+            self.headers["Vary"] = merge_vary(self.headers.get("Vary"))
+            self._head = None
+        return self
+
+    def to_wire(self):
+        """
+        The form the engines send: the reply itself when buffered, a
+        :class:`ChunkedResponse <ChunkedResponse>` with this head when streamed.
+
+        :rtype: RouteResponse or ChunkedResponse.
+        """
+        if not self.streamed:
+            return self
+        chunked = ChunkedResponse(self.body, content_type=self.headers.get("Content-Type"),
+                                  status_code=self.status_code, reason=self.reason or "",
+                                  headers=dict(self.headers.items()))
+        chunked.head = self.head
+        return chunked
+
+    def buffers(self):
+        """
+        The buffers written to the socket.
+
+        :rtype list: head and body, the body left out when empty.
+        """
+        return [self.head, self.body] if self.body else [self.head]
+
+    @property
+    def remaining(self):
+        """Bytes not written yet."""
+        if self._pending is None:
+            return sum(len(buf) for buf in self.buffers())
+        return sum(len(buf) for buf in self._pending)
+
+    def sendmsg(self, sock):
+        """
+        Write as much of the reply as one scatter-gather call accepts, for
+        non-blocking sockets.
+
+        :param sock (socket.socket): the client socket.
+
+        :rtype int: bytes sent.
+
+        :raises BlockingIOError: If the socket buffer is full.
+        """
+        if self._pending is None:
+            self._pending = [memoryview(buf) for buf in self.buffers()]
+        if HAS_SENDMSG:
+            sent = sock.sendmsg(self._pending)
+        else:
+            sent = sock.send(self._pending[0])
+
+        left = sent
+        while self._pending and left >= len(self._pending[0]):
+            left -= len(self._pending.pop(0))
+        if left:
+            self._pending[0] = self._pending[0][left:]
+        return sent
+
+    def send(self, sock):
+        """
+        Write the reply on a blocking socket, yielding after every partial
+        write so the caller can re-arm its write deadline.
+
+        :param sock (socket.socket): the client socket.
+
+        :rtype iterator: bytes sent by each call.
+        """
+        while self.remaining > 0:
+            yield self.sendmsg(sock)
+
+    def __repr__(self):
+        return "<RouteResponse [{}]>".format(self.status_code)
@@ -0,0 +1,286 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.router
+~~~~~~~~~~~~~~~~~
+
+This module provides the :class:`Router <Router>` of WeApRous applications,
+a radix tree of path segments compiled once at startup from the
+``(METHOD, path)`` route table.
+
+Route paths may contain typed parameters, written ``<name>`` or
+``<type:name>``:
+
+- ``str`` (default): one non empty path segment.
+- ``int``: a segment of digits, passed to the hook as an ``int``.
+- ``float``: a decimal number, passed as a ``float``.
+- ``path``: the rest of the path, slashes included (last segment only).
+
+Looking a path up walks one tree level per segment: static segments are a
+dict lookup, parameters are only tried when no static branch matches, so the
+cost depends on the length of the path and not on the number of routes.
+
+A hook declaring a ``request`` parameter is called with the prepared
+:class:`Request <Request>` (and the path parameters), other hooks keep
+receiving ``headers`` and ``body``.
+
+A path matched with another method than the declared ones yields the
+``Allow`` list, which the adapter turns into ``405 Method Not Allowed``, or
+into the reply of an ``OPTIONS`` request when no ``OPTIONS`` hook is declared.
+Routes declaring only ``OPTIONS`` (e.g. a CORS preflight catch-all) do not
+claim the path for other methods.
+
+Usage Example:
+--------------
+>>> router = Router({("GET", "/channels/<name>/messages"): get_messages})
+>>> match = router.match("GET", "/channels/general/messages?since=3")
+>>> match.hook, match.params
+(<function get_messages>, {'name': 'general'})
+"""
+
+import functools
+import inspect
+import math
+from urllib.parse import unquote
+
+
+def _to_float(value):
+    """Converter of ``float`` parameters: digits with an optional sign and
+    decimal point. ``nan``, ``inf``, exponents and numbers too large for a
+    float (which ``float()`` turns into ``inf``) are rejected."""
+    if not value.replace(".", "", 1).lstrip("-").isdigit():
+        raise ValueError(value)
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(value)
+    return number
+
+
+def _to_int(value):
+    """Converter of ``int`` parameters, digits only."""
+    if not value.isdigit():
+        raise ValueError(value)
+    return int(value)
+
+
+#: Parameter converters, in the order they are tried at a tree level.
+CONVERTERS = {
+    "int": _to_int,
+    "float": _to_float,
+    "str": str,
+    "path": str,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def wants_request(hook):
+    """
+    Tells whether a hook takes the :class:`Request <Request>` object, i.e.
+    declares a ``request`` parameter. The signature is inspected once per hook.
+
+    :param hook (callable): the route hook.
+
+    :rtype bool: True to call it with ``request=``, False for ``headers=`` and ``body=``.
+    """
+    try:
+        return "request" in inspect.signature(hook).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class RouteMatch:
+    """The :class:`RouteMatch <RouteMatch>` object, the result of a lookup.
+
+    :attrs hook (callable): the route hook, None if the method is not allowed.
+    :attrs params (dict): converted path parameters of the matched route.
+    :attrs allowed (tuple): methods declared for the path, set when ``hook`` is None.
+    """
+
+    __attrs__ = [
+        "hook",
+        "params",
+        "allowed",
+    ]
+
+    def __init__(self, hook, params=None, allowed=()):
+        self.hook = hook
+        self.params = params or {}
+        self.allowed = allowed
+
+
+class _Node:
+    """One level of the tree: static children, parameter children and the
+    hooks of the routes ending here."""
+
+    __slots__ = ("static", "params", "handlers")
+
+    def __init__(self):
+        #: segment -> _Node
+        self.static = {}
+        #: [(converter name, parameter name, _Node)], in converter order
+        self.params = []
+        #: method -> hook
+        self.handlers = {}
+
+    def param_child(self, kind, name):
+        for child_kind, child_name, child in self.params:
+            if child_kind == kind and child_name == name:
+                return child
+        child = _Node()
+        self.params.append((kind, name, child))
+        order = list(CONVERTERS)
+        self.params.sort(key=lambda entry: order.index(entry[0]))
+        return child
+
+
+def parse_segment(segment):
+    """
+    Parses one segment of a route path.
+
+    :param segment (str): e.g. ``users``, ``<name>`` or ``<int:id>``.
+
+    :rtype tuple: (converter name, parameter name), or (None, segment) for a
+                  static segment.
+
+    :raises ValueError: If the parameter type is unknown.
+    """
+    if not (segment.startswith("<") and segment.endswith(">")):
+        return None, segment
+    kind, _, name = segment[1:-1].rpartition(":")
+    kind = kind or "str"
+    if kind not in CONVERTERS or not name:
+        raise ValueError("Invalid route parameter {}".format(segment))
+    return kind, name
+
+
+class Router:
+    """The :class:`Router <Router>` object, which maps a method and a path to
+    a route hook and its path parameters.
+
+    :attrs routes (dict): the ``(METHOD, path)`` -> hook table it was built from.
+    """
+
+    __attrs__ = [
+        "routes",
+    ]
+
+    def __init__(self, routes=None):
+        """
+        Initialize a new Router instance.
+
+        :param routes (dict): Mapping of (method, path) to route hooks.
+
+        :raises ValueError: If a route path is malformed.
+        """
+        self.routes = {}
+        self._root = _Node()
+        for (method, path), hook in (routes or {}).items():
+            self.add(method, path, hook)
+
+    @classmethod
+    def compile(cls, routes):
+        """
+        Builds a router from a route table, a Router is returned unchanged.
+
+        :param routes (dict): Mapping of (method, path) to route hooks.
+
+        :rtype Router: the compiled router.
+        """
+        if isinstance(routes, cls):
+            return routes
+        return cls(routes)
+
+    def add(self, method, path, hook):
+        """
+        Insert a route in the tree.
+
+        :param method (str): HTTP method.
+        :param path (str): route path, may contain ``<type:name>`` parameters.
+        :param hook (callable): the route hook.
+
+        :raises ValueError: If the path is malformed.
+        """
+        method = method.upper()
+        segments = path.lstrip("/").split("/")
+        node = self._root
+        for index, segment in enumerate(segments):
+            kind, name = parse_segment(segment)
+            if kind is None:
+                node = node.static.setdefault(name, _Node())
+                continue
+            if kind == "path" and index != len(segments) - 1:
+                raise ValueError("path parameter must end the route {}".format(path))
+            node = node.param_child(kind, name)
+        node.handlers[method] = hook
+        self.routes[(method, path)] = hook
+
+    def match(self, method, path):
+        """
+        Look a request up.
+
+        :param method (str): HTTP method of the request.
+        :param path (str): request path, a query string is ignored.
+
+        :rtype RouteMatch: the hook and parameters, or only the allowed
+                           methods (``hook`` is None); None if no route
+                           matches the path.
+        """
+        path = path.split("?", 1)[0]
+        segments = path.lstrip("/").split("/")
+        allowed = []
+        for node, params in self._walk(self._root, segments, 0, {}):
+            hook = node.handlers.get(method)
+            if hook is not None:
+                return RouteMatch(hook, params)
+            for declared in node.handlers:
+                if declared not in allowed:
+                    allowed.append(declared)
+
+        if allowed == ["OPTIONS"] or not allowed:
+            return None
+        if "OPTIONS" not in allowed:
+            allowed.append("OPTIONS")
+        return RouteMatch(None, allowed=tuple(allowed))
+
+    def _walk(self, node, segments, index, params):
+        """Yield the (node, params) of every route matching ``segments``,
+        static branches first."""
+        if index == len(segments):
+            if node.handlers:
+                yield node, params
+            return
+
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child is not None:
+            yield from self._walk(child, segments, index + 1, params)
+
+        for kind, name, child in node.params:
+            if kind == "path":
+                rest = "/".join(segments[index:])
+                if rest and child.handlers:
+                    yield child, dict(params, **{name: unquote(rest)})
+                continue
+            if not segment:
+                continue
+            try:
+                value = CONVERTERS[kind](unquote(segment))
+            except ValueError:
+                continue
+            yield from self._walk(child, segments, index + 1, dict(params, **{name: value}))
+
+    def __len__(self):
+        return len(self.routes)
+
+    def __repr__(self):
+        return "Router({!r})".format(self.routes)
@@ -0,0 +1,115 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.serializer
+~~~~~~~~~~~~~~~~~
+
+This module provides the serializer of HTTP response heads, the counterpart
+of :mod:`daemon.parser <daemon.parser>`.
+
+A head is assembled from pre-encoded ``bytes`` fragments with a single
+``b"".join``:
+
+- status lines and constant header lines (``Cache-Control: no-cache``,
+  ``Content-Type: text/html``...) are encoded once and cached;
+- the ``Date`` line is formatted at most once per second and shared by every
+  response of that second;
+- only the values that really change per response (``Content-Length``, a
+  ``Content-Range``...) are formatted each time.
+
+Usage Example:
+--------------
+>>> serialize_head(200, None, [("Content-Type", "text/html")], content_length=5)
+b'HTTP/1.1 200 OK\\r\\nDate: ...\\r\\nContent-Type: text/html\\r\\nContent-Length: 5\\r\\n\\r\\n'
+"""
+
+import functools
+import time
+from email.utils import formatdate
+from http import HTTPStatus
+
+#: Most distinct header lines kept encoded.
+HEADER_LINE_CACHE_SIZE = 1024
+
+#: Most distinct status lines kept encoded, reasons set by hooks included.
+STATUS_LINE_CACHE_SIZE = 128
+
+_date = (None, b"")
+
+
+@functools.lru_cache(maxsize=STATUS_LINE_CACHE_SIZE)
+def status_line(status_code, reason=None):
+    """
+    Serialized status line, built once per status and reason.
+
+    :param status_code (int): HTTP status code.
+    :param reason (str): reason phrase, the standard one if omitted.
+
+    :rtype bytes: e.g. ``b"HTTP/1.1 200 OK\\r\\n"``.
+    """
+    if reason is None:
+        try:
+            reason = HTTPStatus(status_code).phrase
+        except ValueError:
+            reason = ""
+    return "HTTP/1.1 {} {}\r\n".format(status_code, reason).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=HEADER_LINE_CACHE_SIZE)
+def header_line(name, value):
+    """
+    Serialized header line, cached for the values that repeat (types,
+    cache policies, validators of hot files).
+
+    :param name (str): header name.
+    :param value (str): header value.
+
+    :rtype bytes: ``b"Name: value\\r\\n"``.
+    """
+    return "{}: {}\r\n".format(name, value).encode("utf-8")
+
+
+def date_line():
+    """
+    The ``Date`` header line of the current second, formatted at most once
+    per second.
+
+    :rtype bytes: e.g. ``b"Date: Sat, 17 Oct 2026 10:00:00 GMT\\r\\n"``.
+    """
+    global _date
+    now = int(time.time())
+    second, line = _date
+    if second != now:
+        line = b"Date: " + formatdate(now, usegmt=True).encode("ascii") + b"\r\n"
+        # One tuple assignment, readers never see a second with another line.
+        _date = (now, line)
+    return line
+
+
+def serialize_head(status_code, reason, headers, content_length=None):
+    """
+    Assemble a response head with one join.
+
+    :param status_code (int): HTTP status code.
+    :param reason (str): reason phrase, None for the standard one.
+    :param headers (iterable): (name, value) pairs, in order.
+    :param content_length (int): body size, no ``Content-Length`` if None.
+
+    :rtype bytes: status line, ``Date``, the headers and the blank line.
+    """
+    parts = [status_line(status_code, reason), date_line()]
+    parts.extend(header_line(name, value) for name, value in headers)
+    if content_length is not None:
+        parts.append(b"Content-Length: %d\r\n" % content_length)
+    parts.append(b"\r\n")
+    return b"".join(parts)
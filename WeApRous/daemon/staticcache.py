@@ -0,0 +1,419 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.staticcache
+~~~~~~~~~~~~~~~~~
+
+This module provides the in-memory cache of static files served from
+``www/`` and ``static/``.
+
+Files are kept by real path (symbolic links resolved, so aliases of one file
+share an entry) in least recently used order, up to a total byte budget; the
+least recently used ones are evicted first. A cached file is
+trusted for ``revalidate_interval`` seconds, after which one ``stat`` compares
+its size, modification time and inode with the cached copy and reloads it if
+the file changed. A hot asset therefore costs no system call at all between
+two revalidations.
+
+Files larger than ``max_entry_size`` are not held in memory, only their
+metadata is cached, so one big file cannot flush every small one. Every entry
+is charged :data:`ENTRY_OVERHEAD` bytes on top of its content, so metadata-only
+entries are evicted like the others.
+
+Every cached file carries its validators, a strong ``ETag`` built from its
+size and modification time and a ``Last-Modified`` date, for conditional
+requests. The cache also holds the browser cache lifetime (``max-age``) of
+each directory, the longest matching directory wins.
+
+Compressed variants (``gzip``, ``deflate``) of a cached file are built once,
+on first demand, and kept with it: they are charged to the same budget and
+dropped with the file when it changes or is evicted. A fresh ``.gz`` sibling
+on disk (see :func:`precompress <precompress>`) is preferred for ``gzip``.
+
+Usage Example:
+--------------
+>>> cache = StaticCache(max_bytes=32 * 1024 * 1024, revalidate_interval=2)
+>>> content = cache.read("www/index.html")
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate
+
+from .compression import compress, DEFAULT_MIN_SIZE
+
+#: Option names consumed by :func:`configure_static_cache`.
+STATIC_CACHE_OPTIONS = ("static_cache_size", "static_revalidate", "cache_lifetimes")
+#: Default total size of the cached file contents, in bytes.
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+#: Default seconds a cached file is served before it is checked on disk again.
+DEFAULT_REVALIDATE_INTERVAL = 2.0
+#: Default size above which a file content is not kept in memory.
+DEFAULT_MAX_ENTRY_SIZE = 1024 * 1024
+#: Bytes charged for the metadata of every cached file.
+ENTRY_OVERHEAD = 512
+#: Default browser cache lifetime per directory, in seconds. Pages are always
+#: revalidated (0), assets are reused for an hour.
+DEFAULT_CACHE_LIFETIMES = {"www/": 0, "static/": 3600}
+
+
+def make_etag(size, mtime):
+    """
+    Strong entity tag of a file version.
+
+    :param size (int): size in bytes.
+    :param mtime (int): modification time, in nanoseconds.
+
+    :rtype str: the quoted tag.
+    """
+    return '"{:x}-{:x}"'.format(size, mtime)
+
+
+class StaticFile:
+    """A file known to the :class:`StaticCache <StaticCache>`.
+
+    :attrs path (str): real file path.
+    :attrs size (int): size in bytes.
+    :attrs mtime (int): modification time, in nanoseconds.
+    :attrs inode (int): inode number, changes when the file is replaced.
+    :attrs content (bytes): file content, None if the file is too big to cache.
+    :attrs checked (float): ``time.monotonic()`` of the last validation.
+    :attrs etag (str): strong entity tag, quoted.
+    :attrs last_modified (str): modification time as an HTTP date.
+    :attrs max_age (int): browser cache lifetime of the file, in seconds.
+    :attrs variants (dict): encoding -> compressed StaticFile, path of a
+                            ``.gz`` sibling, or None when not worth it.
+    :attrs aliases (set): requested paths resolved to this file.
+    """
+
+    __slots__ = ("path", "size", "mtime", "inode", "content", "checked",
+                 "etag", "last_modified", "max_age", "variants", "aliases")
+
+    def __init__(self, path, stat, content, checked, max_age=0):
+        self.path = path
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime_ns
+        self.inode = stat.st_ino
+        self.content = content
+        self.checked = checked
+        self.etag = make_etag(self.size, self.mtime)
+        self.last_modified = formatdate(self.mtime // 1000000000, usegmt=True)
+        self.max_age = max_age
+        self.variants = {}
+        self.aliases = set()
+
+    def encoded(self, encoding, content):
+        """
+        Builds the compressed variant of a cached file.
+
+        :param encoding (str): content coding of ``content``.
+        :param content (bytes): the compressed content.
+
+        :rtype StaticFile: the variant, with its own size and ``ETag``.
+        """
+        variant = copy.copy(self)
+        variant.size = len(content)
+        variant.content = content
+        variant.etag = '{}-{}"'.format(self.etag[:-1], encoding)
+        variant.variants = {}
+        variant.aliases = set()
+        return variant
+
+    def matches(self, stat):
+        """True if ``stat`` describes the same version of the file."""
+        return (stat.st_size == self.size and stat.st_mtime_ns == self.mtime
+                and stat.st_ino == self.inode)
+
+    @property
+    def cost(self):
+        """Bytes charged to the cache budget, compressed variants and the
+        :data:`ENTRY_OVERHEAD` included."""
+        cost = ENTRY_OVERHEAD + (len(self.content) if self.content is not None else 0)
+        for variant in self.variants.values():
+            if isinstance(variant, StaticFile):
+                cost += variant.size
+        return cost
+
+
+class StaticCache:
+    """The :class:`StaticCache <StaticCache>` object, a thread safe LRU cache
+    of static files bounded by a byte budget.
+
+    :attrs max_bytes (int): total size of the cached contents.
+    :attrs revalidate_interval (float): seconds between two checks of a file.
+    :attrs max_entry_size (int): largest file whose content is cached.
+    :attrs lifetimes (dict): directory -> browser cache lifetime, in seconds.
+    """
+
+    __attrs__ = [
+        "max_bytes",
+        "revalidate_interval",
+        "max_entry_size",
+        "lifetimes",
+    ]
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES,
+                 revalidate_interval=DEFAULT_REVALIDATE_INTERVAL,
+                 max_entry_size=DEFAULT_MAX_ENTRY_SIZE, lifetimes=None):
+        """
+        Initialize a new StaticCache instance.
+
+        :param max_bytes (int): total size of the cached contents, 0 disables caching.
+        :param revalidate_interval (float): seconds between two checks of a file.
+        :param max_entry_size (int): largest file whose content is cached.
+        :param lifetimes (dict): directory -> browser cache lifetime in seconds,
+                                 :data:`DEFAULT_CACHE_LIFETIMES` if omitted.
+        """
+        self.max_bytes = max_bytes
+        self.revalidate_interval = revalidate_interval
+        self.max_entry_size = min(max_entry_size, max_bytes)
+        self.lifetimes = dict(DEFAULT_CACHE_LIFETIMES if lifetimes is None else lifetimes)
+
+        # Longest directory first, so the most specific one matches.
+        self._lifetimes = sorted(
+            ((os.path.realpath(directory) + os.sep, seconds)
+             for directory, seconds in self.lifetimes.items()),
+            key=lambda item: len(item[0]), reverse=True)
+
+        self._entries = OrderedDict()
+        # Requested (normalized) path -> real path of its entry.
+        self._aliases = {}
+        self._used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def used(self):
+        """Bytes charged for the cached files, see :attr:`StaticFile.cost`."""
+        return self._used
+
+    def lookup(self, path):
+        """
+        Returns the up to date :class:`StaticFile <StaticFile>` of ``path``,
+        loading or revalidating it when needed.
+
+        :param path (str): file path.
+
+        :rtype StaticFile: the cached file.
+
+        :raises OSError: If the file cannot be opened (e.g. FileNotFoundError).
+        """
+        alias = os.path.normpath(path)
+        now = time.monotonic()
+        with self._lock:
+            key = self._aliases.get(alias)
+            entry = self._entries.get(key) if key is not None else None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if now - entry.checked < self.revalidate_interval:
+                    return entry
+
+        # The link may have been retargeted, it is resolved again along
+        # with the revalidation of the file.
+        key = os.path.realpath(alias)
+        if entry is not None and entry.path != key:
+            entry = None
+        with self._lock:
+            if entry is None:
+                entry = self._entries.get(key)
+            if entry is not None:
+                self._link(alias, entry)
+                if now - entry.checked < self.revalidate_interval:
+                    return entry
+
+        if entry is not None:
+            try:
+                stat = os.stat(key)
+            except OSError:
+                self.invalidate(key)
+                raise
+            if entry.matches(stat):
+                entry.checked = now
+                return entry
+
+        entry = self._load(key, now)
+        self._store(key, entry, alias)
+        return entry
+
+    def read(self, path):
+        """
+        Returns the content of ``path``, from memory when possible.
+
+        :param path (str): file path.
+
+        :rtype bytes: the file content.
+
+        :raises OSError: If the file cannot be read.
+        """
+        entry = self.lookup(path)
+        if entry.content is not None:
+            return entry.content
+        with open(entry.path, 'rb') as f:
+            return f.read()
+
+    def variant(self, entry, encoding):
+        """
+        Returns the variant of a file compressed with ``encoding``, building
+        and caching it on first demand.
+
+        :param entry (StaticFile): the file, as returned by :meth:`lookup`.
+        :param encoding (str): ``gzip`` or ``deflate``.
+
+        :rtype StaticFile: the compressed file, or None if the file is too
+                           small, does not shrink, or is too large to be
+                           compressed in memory and has no ``.gz`` sibling.
+        """
+        variant = entry.variants.get(encoding, False)
+        if variant is False:
+            variant = self._encode(entry, encoding)
+            with self._lock:
+                if encoding in entry.variants:
+                    variant = entry.variants[encoding]
+                else:
+                    entry.variants[encoding] = variant
+                    if isinstance(variant, StaticFile) and self._entries.get(entry.path) is entry:
+                        self._used += variant.size
+                        self._evict()
+
+        if isinstance(variant, str):
+            # Precompressed sibling, cached and revalidated as a file of its own.
+            try:
+                sibling = self.lookup(variant)
+            except OSError:
+                sibling = None
+            if sibling is None or sibling.mtime < entry.mtime:
+                entry.variants.pop(encoding, None)
+                return None
+            return sibling
+        return variant
+
+    def max_age(self, path):
+        """
+        Browser cache lifetime of a file, from its longest matching directory.
+
+        :param path (str): real file path.
+
+        :rtype int: seconds, 0 if the file must always be revalidated.
+        """
+        for directory, seconds in self._lifetimes:
+            if path.startswith(directory):
+                return seconds
+        return 0
+
+    def invalidate(self, path=None):
+        """
+        Drop one file, or every file, from the cache.
+
+        :param path (str): file path, None to clear the cache.
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._aliases.clear()
+                self._used = 0
+                return
+            entry = self._entries.pop(os.path.realpath(path), None)
+            if entry is not None:
+                self._drop(entry)
+
+    def _encode(self, entry, encoding):
+        """Pick the fresh ``.gz`` sibling of a file or compress its content."""
+        if encoding == "gzip":
+            try:
+                if os.stat(entry.path + ".gz").st_mtime_ns >= entry.mtime:
+                    return entry.path + ".gz"
+            except OSError:
+                pass
+        if entry.content is None or entry.size < DEFAULT_MIN_SIZE:
+            return None
+        content = compress(entry.content, encoding)
+        if len(content) >= entry.size:
+            return None
+        return entry.encoded(encoding, content)
+
+    def _load(self, path, now):
+        """Read a file and its metadata from disk."""
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            content = f.read() if stat.st_size <= self.max_entry_size else None
+        return StaticFile(path, stat, content, now, self.max_age(path))
+
+    def _store(self, key, entry, alias):
+        """Insert an entry and evict the least recently used ones over budget."""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._drop(previous)
+            self._entries[key] = entry
+            self._used += entry.cost
+            self._link(alias, entry)
+            self._evict()
+
+    def _link(self, alias, entry):
+        """Resolve ``alias`` to ``entry`` from now on, lock held."""
+        key = self._aliases.get(alias)
+        if key is not None and key != entry.path:
+            previous = self._entries.get(key)
+            if previous is not None:
+                previous.aliases.discard(alias)
+        self._aliases[alias] = entry.path
+        entry.aliases.add(alias)
+
+    def _drop(self, entry):
+        """Forget a removed entry and its aliases, lock held."""
+        self._used -= entry.cost
+        for alias in entry.aliases:
+            if self._aliases.get(alias) == entry.path:
+                del self._aliases[alias]
+
+    def _evict(self):
+        """Evict the least recently used entries over budget, lock held."""
+        while self._used > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._drop(evicted)
+
+
+_static_cache = StaticCache()
+
+
+def static_cache():
+    """
+    Returns the process wide cache used by :class:`Response <Response>`.
+
+    :rtype StaticCache: the shared cache.
+    """
+    return _static_cache
+
+
+def configure_static_cache(options):
+    """
+    Replaces the shared cache according to the ``static_cache_size`` (bytes),
+    ``static_revalidate`` (seconds) and ``cache_lifetimes`` (directory ->
+    seconds) entries of ``options``, removing them from it. Nothing changes
+    when none is set.
+
+    :param options (dict): daemon settings.
+
+    :rtype StaticCache: the shared cache.
+    """
+    global _static_cache
+    settings = {key: options.pop(key) for key in STATIC_CACHE_OPTIONS if key in options}
+    settings = {key: value for key, value in settings.items() if value is not None}
+    if settings:
+        _static_cache = StaticCache(
+            max_bytes=settings.get("static_cache_size", DEFAULT_MAX_BYTES),
+            revalidate_interval=settings.get("static_revalidate", DEFAULT_REVALIDATE_INTERVAL),
+            lifetimes=settings.get("cache_lifetimes"))
+    return _static_cache
@@ -0,0 +1,352 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.timeouts
+~~~~~~~~~~~~~~~~~
+
+This module provides the connection timeouts shared by every daemon: a hashed
+:class:`TimerWheel <TimerWheel>` and the per-connection
+:class:`ConnectionDeadline <ConnectionDeadline>` built on it.
+
+A connection is always in one phase and each phase has its own deadline:
+
+- ``header``: receiving the request line and headers (slow clients).
+- ``body``: receiving the request body.
+- ``idle``: waiting for the next request on a keep-alive connection.
+- ``write``: sending the response to a client that does not read.
+
+Scheduling, re-arming and cancelling a deadline are O(1), so thousands of
+connections cost one wheel and, for blocking sockets, one ticking thread.
+A deadline may be re-armed by the thread serving the connection while the
+wheel thread expires it; once :meth:`ConnectionDeadline.cancel` or
+:meth:`ConnectionDeadline.arm` returned, the previous deadline never fires.
+A deadline follows one direction: a connection read and written from two
+threads uses one deadline for each.
+When a deadline expires the connection is woken up (for a blocking socket by
+shutting it down, which makes a pending ``recv`` return or ``send`` fail) and
+the thread serving it cleans up.
+
+Usage Example:
+--------------
+>>> deadline = socket_deadline(conn, header_timeout=10, idle_timeout=5)
+>>> deadline.enter("header")
+>>> data = conn.recv(4096)
+>>> deadline.cancel()
+"""
+
+import functools
+import math
+import socket
+import threading
+import time
+
+#: Connection phases, in the order a request goes through them.
+PHASES = ("header", "body", "idle", "write")
+#: Default seconds allowed to receive the request line and headers.
+DEFAULT_HEADER_TIMEOUT = 10.0
+#: Default seconds allowed to receive a request body.
+DEFAULT_BODY_TIMEOUT = 30.0
+#: Default seconds allowed to send a response (or a chunk of it).
+DEFAULT_WRITE_TIMEOUT = 30.0
+#: Default resolution of the timer wheel, in seconds.
+DEFAULT_TICK = 0.5
+#: Default number of slots of the timer wheel.
+DEFAULT_SLOTS = 512
+
+
+class Timer:
+    """A callback scheduled on a :class:`TimerWheel <TimerWheel>`.
+
+    :attrs wheel (TimerWheel): wheel holding the timer.
+    :attrs callback (callable): function called when the timer expires.
+    :attrs rounds (int): full wheel turns left before the timer expires.
+    :attrs slot (int): wheel slot holding the timer.
+    """
+
+    __slots__ = ("callback", "rounds", "slot", "wheel")
+
+    def __init__(self, wheel, callback, rounds, slot):
+        self.wheel = wheel
+        self.callback = callback
+        self.rounds = rounds
+        self.slot = slot
+
+    def cancel(self):
+        """Remove the timer from its wheel, a no-op once it expired."""
+        self.wheel.cancel(self)
+
+
+class TimerWheel:
+    """The :class:`TimerWheel <TimerWheel>` object, a hashed wheel of timers.
+
+    Timers are hashed into ``slots`` buckets ``tick`` seconds apart. Every
+    :meth:`advance` moves the cursor over the buckets whose time has come and
+    runs the callbacks of the timers due in this turn. A timer fires between
+    its delay and its delay plus one tick.
+
+    :attrs tick (float): resolution of the wheel, in seconds.
+    :attrs slots (int): number of buckets.
+    """
+
+    __attrs__ = [
+        "tick",
+        "slots",
+    ]
+
+    def __init__(self, tick=DEFAULT_TICK, slots=DEFAULT_SLOTS):
+        """
+        Initialize a new TimerWheel instance.
+
+        :param tick (float): resolution of the wheel, in seconds.
+        :param slots (int): number of buckets.
+        """
+        self.tick = tick
+        self.slots = slots
+
+        self._buckets = [set() for _ in range(slots)]
+        self._cursor = 0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def schedule(self, delay, callback):
+        """
+        Schedule ``callback`` to run in ``delay`` seconds.
+
+        :param delay (float): seconds before the timer expires.
+        :param callback (callable): function called without arguments.
+
+        :rtype Timer: handle to cancel the timer.
+        """
+        ticks = max(1, int(math.ceil(delay / self.tick)))
+        with self._lock:
+            slot = (self._cursor + ticks) % self.slots
+            timer = Timer(self, callback, (ticks - 1) // self.slots, slot)
+            self._buckets[slot].add(timer)
+        return timer
+
+    def cancel(self, timer):
+        """
+        Cancel a scheduled timer.
+
+        :param timer (Timer): the timer to cancel.
+        """
+        with self._lock:
+            self._buckets[timer.slot].discard(timer)
+
+    def advance(self, now=None):
+        """
+        Move the wheel up to ``now`` and run the expired callbacks.
+
+        :param now (float): current ``time.monotonic()``, read if omitted.
+
+        :rtype int: number of timers that expired.
+        """
+        if now is None:
+            now = time.monotonic()
+        expired = []
+        with self._lock:
+            while now - self._last >= self.tick:
+                self._last += self.tick
+                self._cursor = (self._cursor + 1) % self.slots
+                bucket = self._buckets[self._cursor]
+                for timer in list(bucket):
+                    if timer.rounds:
+                        timer.rounds -= 1
+                    else:
+                        bucket.discard(timer)
+                        expired.append(timer)
+
+        for timer in expired:
+            try:
+                timer.callback()
+            except Exception as e:
+                print("[TimerWheel] Error in timer callback: {}".format(e))
+        return len(expired)
+
+    def start(self):
+        """Advance the wheel from a background daemon thread."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._last = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name="timer-wheel", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Ticking thread loop."""
+        while True:
+            time.sleep(self.tick)
+            self.advance()
+
+
+_default_wheel = None
+_default_lock = threading.Lock()
+
+
+def default_wheel():
+    """
+    Returns the process wide wheel shared by blocking sockets, starting its
+    ticking thread on first use (so a forked worker gets its own).
+
+    :rtype TimerWheel: the shared wheel.
+    """
+    global _default_wheel
+    with _default_lock:
+        if _default_wheel is None:
+            _default_wheel = TimerWheel()
+            _default_wheel.start()
+        return _default_wheel
+
+
+class ConnectionDeadline:
+    """The :class:`ConnectionDeadline <ConnectionDeadline>` object, which
+    keeps the deadline of the current phase of one connection.
+
+    :attrs wheel (TimerWheel): wheel the deadline is scheduled on.
+    :attrs on_expire (callable): called with the phase whose deadline passed.
+    :attrs timeouts (dict): seconds allowed per phase, None for no limit.
+    :attrs phase (str): current phase, None when no deadline is armed.
+    :attrs expired (str): phase that timed out, None until then.
+    """
+
+    __attrs__ = [
+        "wheel",
+        "on_expire",
+        "timeouts",
+        "phase",
+        "expired",
+    ]
+
+    def __init__(self, wheel, on_expire, header_timeout=DEFAULT_HEADER_TIMEOUT,
+                 body_timeout=DEFAULT_BODY_TIMEOUT, idle_timeout=None,
+                 write_timeout=DEFAULT_WRITE_TIMEOUT):
+        """
+        Initialize a new ConnectionDeadline instance.
+
+        :param wheel (TimerWheel): wheel the deadline is scheduled on.
+        :param on_expire (callable): called with the phase whose deadline passed.
+        :param header_timeout (float): seconds to receive the request headers.
+        :param body_timeout (float): seconds to receive the request body.
+        :param idle_timeout (float): seconds to wait for the next request.
+        :param write_timeout (float): seconds to send a response.
+        """
+        self.wheel = wheel
+        self.on_expire = on_expire
+        self.timeouts = {
+            "header": header_timeout,
+            "body": body_timeout,
+            "idle": idle_timeout,
+            "write": write_timeout,
+        }
+        self.phase = None
+        self.expired = None
+        self._timer = None
+        # Number of the armed timer, a callback of an older one is stale.
+        self._generation = 0
+        # Reentrant: on_expire may cancel the deadline from the same thread.
+        self._lock = threading.RLock()
+
+    def enter(self, phase):
+        """
+        Switch to ``phase``, keeping the running deadline if already in it.
+
+        :param phase (str): one of :data:`PHASES`.
+        """
+        with self._lock:
+            if phase != self.phase:
+                self.arm(phase)
+
+    def refresh(self, phase):
+        """
+        Start a fresh deadline for ``phase`` only if it is the current one,
+        e.g. to count activity in the other direction as not being idle.
+
+        :param phase (str): one of :data:`PHASES`.
+        """
+        with self._lock:
+            if phase == self.phase:
+                self.arm(phase)
+
+    def arm(self, phase):
+        """
+        Start a fresh deadline for ``phase``.
+
+        :param phase (str): one of :data:`PHASES`.
+        """
+        with self._lock:
+            self._disarm()
+            self.phase = phase
+            timeout = self.timeouts[phase]
+            if timeout:
+                self._generation += 1
+                self._timer = self.wheel.schedule(
+                    timeout, functools.partial(self._expire, self._generation))
+
+    def cancel(self):
+        """Disarm the current deadline."""
+        with self._lock:
+            self._disarm()
+            self.phase = None
+
+    def _disarm(self):
+        """Cancel the running timer. The caller must hold ``self._lock``."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _expire(self, generation):
+        """Timer callback, ignored if the deadline was re-armed or cancelled
+        since, even when the wheel already picked the timer up."""
+        with self._lock:
+            if self._timer is None or generation != self._generation:
+                return
+            self._timer = None
+            self.expired = self.phase
+            self.on_expire(self.phase)
+
+
+def shutdown_on_expire(sock):
+    """
+    Builds the ``on_expire`` callback of a blocking socket.
+
+    A read deadline shuts down the receiving side, so that a blocked ``recv``
+    returns and a ``408`` can still be written. A write deadline shuts down
+    both sides, making a blocked ``send`` fail.
+
+    :param sock (socket.socket): the connection socket.
+
+    :rtype callable: the callback.
+    """
+    def expire(phase):
+        how = socket.SHUT_RDWR if phase == "write" else socket.SHUT_RD
+        try:
+            sock.shutdown(how)
+        except OSError:
+            pass
+    return expire
+
+
+def socket_deadline(sock, wheel=None, **timeouts):
+    """
+    Builds a :class:`ConnectionDeadline <ConnectionDeadline>` for a blocking
+    socket, scheduled on the shared wheel by default.
+
+    :param sock (socket.socket): the connection socket.
+    :param wheel (TimerWheel): wheel to use, :func:`default_wheel` if omitted.
+    :param timeouts: ``header_timeout``, ``body_timeout``, ``idle_timeout``
+                     and ``write_timeout``.
+
+    :rtype ConnectionDeadline: the deadline, not armed yet.
+    """
+    return ConnectionDeadline(wheel or default_wheel(), shutdown_on_expire(sock), **timeouts)
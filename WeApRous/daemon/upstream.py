@@ -0,0 +1,593 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.upstream
+~~~~~~~~~~~~~~~~~
+
+This module provides the keep-alive connection pools the proxy uses to reach
+its backends, one :class:`UpstreamPool <UpstreamPool>` per ``(host, port)``.
+
+Requests are forwarded with ``Connection: keep-alive`` and the response is
+read exactly as far as its framing goes (``Content-Length``, chunked encoding,
+or no body for ``HEAD``, ``1xx``, ``204`` and ``304``), so the connection can
+carry the next request instead of paying a new TCP handshake. A response
+framed by the end of the connection, or carrying ``Connection: close``, ends
+the connection.
+
+Each pool keeps at most ``max_idle`` idle connections (most recently used
+first) and opens at most ``max_connections`` in total; callers wait for a
+connection once the cap is reached. A connection taken from the pool is
+checked first: idle for longer than ``idle_timeout`` (a bit less than the
+backend keep-alive timeout) or closed by the backend, it is discarded. A
+reused connection failing before the first response byte is retried once on a
+fresh connection, for idempotent methods only.
+
+Usage Example:
+--------------
+>>> pool = upstream_pools().get("127.0.0.1", 9000)
+>>> response = pool.request(b"GET / HTTP/1.1\\r\\nHost: a\\r\\n\\r\\n")
+"""
+
+import collections
+import socket
+import threading
+import time
+
+from .reader import RECV_SIZE
+
+#: Option names consumed by :func:`configure_upstream_pools`.
+UPSTREAM_OPTIONS = ("upstream_max_idle", "upstream_max_connections",
+                    "upstream_idle_timeout", "upstream_timeout")
+#: Default idle connections kept per backend.
+DEFAULT_MAX_IDLE = 8
+#: Default connections open at once per backend.
+DEFAULT_MAX_CONNECTIONS = 64
+#: Default seconds an idle connection is reused, below the backend keep-alive (5s).
+DEFAULT_IDLE_TIMEOUT = 4.0
+#: Default seconds to connect, send or wait for backend bytes.
+DEFAULT_UPSTREAM_TIMEOUT = 30.0
+#: Methods safe to send twice when a reused connection turns out dead.
+IDEMPOTENT_METHODS = (b"GET", b"HEAD", b"OPTIONS", b"PUT", b"DELETE", b"TRACE")
+#: Largest response head (status line and headers) accepted from a backend.
+MAX_RESPONSE_HEAD_SIZE = 64 * 1024
+#: Largest chunk size or trailer line accepted from a backend.
+MAX_CHUNK_LINE_SIZE = 8 * 1024
+
+
+class UpstreamError(Exception):
+    """Raised when a backend cannot be reached or answers garbage."""
+
+
+def set_connection_header(message, value):
+    """
+    Rewrites the ``Connection`` header of a raw request or response.
+
+    :param message (bytes): raw HTTP message.
+    :param value (bytes): the new value, e.g. ``b"close"`` or ``b"keep-alive"``.
+
+    :rtype bytes: the message with a single ``Connection`` header.
+    """
+    head_end = message.find(b"\r\n\r\n")
+    if head_end < 0:
+        return message
+    lines = [line for line in message[:head_end].split(b"\r\n")
+             if not line.lower().startswith((b"connection:", b"keep-alive:"))]
+    lines.append(b"Connection: " + value)
+    return b"\r\n".join(lines) + message[head_end:]
+
+
+def parse_response_head(head):
+    """
+    Parses the status line and the framing headers of a response head.
+
+    :param head (bytes): status line and headers, final empty line excluded.
+
+    :rtype tuple: (version, status code, headers) with lowercase header names;
+                  repeated headers are joined with ``", "``.
+
+    :raises UpstreamError: If the status line is malformed.
+    """
+    lines = head.split(b"\r\n")
+    parts = lines[0].split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith(b"HTTP/") or not parts[1].isdigit():
+        raise UpstreamError("Malformed status line {!r}".format(lines[0][:80]))
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(b":")
+        if not sep:
+            continue
+        name = name.strip().lower()
+        value = value.strip()
+        headers[name] = headers[name] + b", " + value if name in headers else value
+    return parts[0], int(parts[1]), headers
+
+
+def request_method(request):
+    """
+    Method of a raw request, which decides whether its response has a body.
+
+    :param request (bytes): raw HTTP request.
+
+    :rtype bytes: the method, upper case.
+    """
+    return request.split(b" ", 1)[0].upper()
+
+
+class ResponseFramer:
+    """Follows the framing of one backend response while its bytes arrive,
+    so the response can be relayed piece by piece and its end found without
+    waiting for the backend to close.
+
+    :attrs method (bytes): method of the request.
+    :attrs status (int): status code, None until the head is complete.
+    :attrs headers (dict): lowercase header name -> value, None until then.
+    :attrs received (bool): whether any byte arrived.
+    :attrs done (bool): whether the response is complete.
+    :attrs keep_alive (bool): whether the connection can carry another
+                              request once done.
+    """
+
+    __slots__ = ("method", "rewrite_head", "status", "headers", "received",
+                 "done", "keep_alive", "_state", "_buf", "_remaining", "_persistent")
+
+    def __init__(self, method, rewrite_head=None):
+        """
+        :param method (bytes): method of the request, ``HEAD`` has no body.
+        :param rewrite_head (callable): bytes -> bytes applied to the final
+                                        response head before it is passed on.
+        """
+        self.method = method
+        self.rewrite_head = rewrite_head
+        self.status = None
+        self.headers = None
+        self.received = False
+        self.done = False
+        self.keep_alive = False
+        self._state = "head"
+        self._buf = bytearray()
+        self._remaining = 0
+        self._persistent = False
+
+    def feed(self, data):
+        """
+        Consume bytes received from the backend.
+
+        :param data (bytes): the received bytes.
+
+        :rtype bytes: the bytes to pass on, the head once it is complete.
+                      Bytes past the end of the response are dropped and
+                      keep the connection from being reused.
+
+        :raises UpstreamError: If the response is malformed.
+        """
+        self.received = True
+        out = []
+        i, n = 0, len(data)
+        while i < n and not self.done:
+            state = self._state
+            if state == "head":
+                self._buf += data[i:]
+                end = self._buf.find(b"\r\n\r\n")
+                if end < 0:
+                    if len(self._buf) > MAX_RESPONSE_HEAD_SIZE:
+                        raise UpstreamError("Response head too large")
+                    break
+                head = bytes(self._buf[:end + 4])
+                data = bytes(self._buf[end + 4:])
+                i, n = 0, len(data)
+                self._buf = bytearray()
+                out.append(self._on_head(head))
+            elif state in ("length", "chunk"):
+                take = min(self._remaining, n - i)
+                out.append(data[i:i + take])
+                i += take
+                self._remaining -= take
+                if not self._remaining:
+                    if state == "length":
+                        self._end()
+                    else:
+                        self._state = "size"
+            elif state == "close":
+                out.append(data[i:])
+                i = n
+            else:
+                # "size" or "trailer": one line, possibly split across reads
+                newline = data.find(b"\n", i)
+                if newline < 0:
+                    self._buf += data[i:]
+                    out.append(data[i:])
+                    if len(self._buf) > MAX_CHUNK_LINE_SIZE:
+                        raise UpstreamError("Chunk line too long")
+                    break
+                line = bytes(self._buf) + data[i:newline + 1]
+                out.append(data[i:newline + 1])
+                self._buf = bytearray()
+                i = newline + 1
+                if state == "trailer":
+                    if not line.strip():
+                        self._end()
+                    continue
+                try:
+                    size = int(line.split(b";", 1)[0].strip(), 16)
+                except ValueError:
+                    raise UpstreamError("Malformed chunk size")
+                if size:
+                    # The chunk data and its CRLF
+                    self._state, self._remaining = "chunk", size + 2
+                else:
+                    self._state = "trailer"
+        if i < n:
+            self.keep_alive = False
+        return b"".join(out)
+
+    def finish(self):
+        """
+        Account for the backend closing the connection.
+
+        :raises UpstreamError: If the response was not complete.
+        """
+        if self.done:
+            return
+        if self._state != "close":
+            raise UpstreamError("Backend closed before the end of the response")
+        self.done = True
+        self.keep_alive = False
+
+    def _on_head(self, head):
+        """Pick the body framing from a complete head."""
+        version, status, headers = parse_response_head(head[:-4])
+        if 100 <= status < 200 and status != 101:
+            # Interim response, the final one follows.
+            return head
+        self.status, self.headers = status, headers
+
+        connection = headers.get(b"connection", b"").lower()
+        if version == b"HTTP/1.0":
+            self._persistent = b"keep-alive" in connection
+        else:
+            self._persistent = b"close" not in connection and status != 101
+
+        length = headers.get(b"content-length")
+        if self.method == b"HEAD" or status in (101, 204, 304):
+            self._end()
+        elif headers.get(b"transfer-encoding", b"").rstrip().lower().endswith(b"chunked"):
+            self._state = "size"
+        elif length is not None:
+            try:
+                self._remaining = int(length.split(b",")[0])
+            except ValueError:
+                raise UpstreamError("Malformed Content-Length")
+            self._state = "length"
+            if not self._remaining:
+                self._end()
+        else:
+            # Delimited by the end of the connection, never reused.
+            self._state = "close"
+            self._persistent = False
+        return self.rewrite_head(head) if self.rewrite_head is not None else head
+
+    def _end(self):
+        self.done = True
+        self.keep_alive = self._persistent
+
+
+class UpstreamConnection:
+    """A pooled connection to a backend.
+
+    :attrs sock (socket.socket): the backend socket.
+    :attrs created (float): ``time.monotonic()`` of the connect.
+    :attrs last_used (float): ``time.monotonic()`` of the last release.
+    :attrs requests (int): requests sent on this connection.
+    """
+
+    __slots__ = ("sock", "created", "last_used", "requests")
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.created = self.last_used = time.monotonic()
+        self.requests = 0
+
+    def alive(self):
+        """
+        Tells whether the backend kept the connection open, without blocking:
+        a readable idle connection is either closed or out of sync.
+
+        :rtype bool: True if the connection can carry a request.
+        """
+        timeout = self.sock.gettimeout()
+        try:
+            self.sock.setblocking(False)
+            try:
+                self.sock.recv(1, socket.MSG_PEEK)
+            finally:
+                self.sock.settimeout(timeout)
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError:
+            return False
+        # b"" is a close, any byte is an unsolicited reply.
+        return False
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class UpstreamPool:
+    """The :class:`UpstreamPool <UpstreamPool>` object, the keep-alive
+    connections to one backend.
+
+    :attrs host (str): backend address.
+    :attrs port (int): backend port.
+    :attrs max_idle (int): idle connections kept.
+    :attrs max_connections (int): connections open at once.
+    :attrs idle_timeout (float): seconds an idle connection is reused.
+    :attrs timeout (float): socket timeout of the backend connections.
+    """
+
+    __attrs__ = [
+        "host",
+        "port",
+        "max_idle",
+        "max_connections",
+        "idle_timeout",
+        "timeout",
+    ]
+
+    def __init__(self, host, port, max_idle=DEFAULT_MAX_IDLE,
+                 max_connections=DEFAULT_MAX_CONNECTIONS,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, timeout=DEFAULT_UPSTREAM_TIMEOUT):
+        """
+        Initialize a new UpstreamPool instance.
+
+        :param host (str): backend address.
+        :param port (int): backend port.
+        :param max_idle (int): idle connections kept, 0 disables keep-alive.
+        :param max_connections (int): connections open at once.
+        :param idle_timeout (float): seconds an idle connection is reused.
+        :param timeout (float): socket timeout of the backend connections.
+        """
+        self.host = host
+        self.port = port
+        self.max_idle = max_idle
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        self._idle = collections.deque()
+        self._open = 0
+        self._cond = threading.Condition()
+
+    @property
+    def open(self):
+        """Connections currently open, idle or in use."""
+        return self._open
+
+    @property
+    def idle(self):
+        """Connections currently idle."""
+        return len(self._idle)
+
+    def acquire(self):
+        """
+        Take a healthy idle connection, or open a new one.
+
+        :rtype tuple: (connection, reused).
+
+        :raises UpstreamError: If no connection frees up within ``timeout``.
+        :raises OSError: If the backend refuses the connection.
+        """
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                while self._idle:
+                    conn = self._idle.pop()
+                    if time.monotonic() - conn.last_used < self.idle_timeout and conn.alive():
+                        return conn, True
+                    self._open -= 1
+                    conn.close()
+                if self._open < self.max_connections:
+                    self._open += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise UpstreamError("No free connection to {}:{}".format(self.host, self.port))
+                self._cond.wait(remaining)
+
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        except OSError:
+            self._discard()
+            raise
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return UpstreamConnection(sock), False
+
+    def release(self, conn, reusable):
+        """
+        Give a connection back after a request.
+
+        :param conn (UpstreamConnection): the connection.
+        :param reusable (bool): whether the response left it in sync.
+        """
+        with self._cond:
+            if reusable and len(self._idle) < self.max_idle:
+                conn.last_used = time.monotonic()
+                self._idle.append(conn)
+                self._cond.notify()
+                return
+        conn.close()
+        self._discard()
+
+    def _discard(self):
+        """Account for a closed connection."""
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def request(self, request):
+        """
+        Send a request and read its response on a pooled connection.
+
+        :param request (bytes): raw HTTP request, its ``Connection`` header
+                                is rewritten to keep the connection open.
+
+        :rtype bytes: the raw response, headers untouched.
+
+        :raises UpstreamError: If the backend answers garbage or no
+                               connection is available.
+        :raises OSError: If the backend cannot be reached.
+        """
+        method = request_method(request)
+        request = self.prepare(request)
+        while True:
+            conn, reused = self.acquire()
+            framer = ResponseFramer(method)
+            try:
+                conn.requests += 1
+                conn.sock.sendall(request)
+                response = self.read_response(conn.sock, framer)
+            except (OSError, UpstreamError):
+                self.release(conn, False)
+                if self.retryable(reused, framer, method):
+                    # The backend closed the idle connection meanwhile.
+                    continue
+                raise
+            except BaseException:
+                self.release(conn, False)
+                raise
+            self.release(conn, framer.keep_alive)
+            return response
+
+    def prepare(self, request):
+        """
+        Ask the backend to keep the connection open, unless reuse is disabled.
+
+        :param request (bytes): raw HTTP request.
+
+        :rtype bytes: the request to send.
+        """
+        return set_connection_header(request, b"keep-alive" if self.max_idle else b"close")
+
+    @staticmethod
+    def retryable(reused, framer, method):
+        """
+        Tells whether a failed request may be sent again on a fresh
+        connection: the failing one was reused, the backend answered nothing
+        and the method is idempotent.
+        """
+        return reused and not framer.received and method in IDEMPOTENT_METHODS
+
+    def read_response(self, sock, framer):
+        """
+        Read one response, as far as its framing goes.
+
+        :param sock (socket.socket): the backend socket.
+        :param framer (ResponseFramer): the framer of the expected response.
+
+        :rtype bytes: the raw response.
+
+        :raises UpstreamError: If the response is malformed or truncated.
+        """
+        parts = []
+        while not framer.done:
+            chunk = sock.recv(RECV_SIZE)
+            if not chunk:
+                framer.finish()
+                break
+            parts.append(framer.feed(chunk))
+        return b"".join(parts)
+
+    def close(self):
+        """Close every idle connection."""
+        with self._cond:
+            while self._idle:
+                self._idle.pop().close()
+                self._open -= 1
+            self._cond.notify_all()
+
+
+class UpstreamPools:
+    """The :class:`UpstreamPools <UpstreamPools>` object, the pools of every
+    backend, created on first use with shared settings.
+
+    :attrs settings (dict): keyword arguments of every :class:`UpstreamPool <UpstreamPool>`,
+                            defaults included.
+    """
+
+    __attrs__ = [
+        "settings",
+    ]
+
+    def __init__(self, **settings):
+        self.settings = dict(max_idle=DEFAULT_MAX_IDLE, max_connections=DEFAULT_MAX_CONNECTIONS,
+                             idle_timeout=DEFAULT_IDLE_TIMEOUT, timeout=DEFAULT_UPSTREAM_TIMEOUT)
+        self.settings.update(settings)
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def get(self, host, port):
+        """
+        The pool of a backend.
+
+        :param host (str): backend address.
+        :param port (int): backend port.
+
+        :rtype UpstreamPool: the pool.
+        """
+        key = (host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = self._pools[key] = UpstreamPool(host, port, **self.settings)
+        return pool
+
+    def close(self):
+        """Close the idle connections of every pool."""
+        with self._lock:
+            for pool in self._pools.values():
+                pool.close()
+
+
+_upstream_pools = UpstreamPools()
+
+
+def upstream_pools():
+    """
+    Returns the process wide pools used by the proxy :class:`Relay <Relay>`.
+
+    :rtype UpstreamPools: the shared pools.
+    """
+    return _upstream_pools
+
+
+def configure_upstream_pools(options):
+    """
+    Replaces the shared pools according to the ``upstream_max_idle``,
+    ``upstream_max_connections``, ``upstream_idle_timeout`` and
+    ``upstream_timeout`` entries of ``options``, removing them from it.
+
+    :param options (dict): proxy settings.
+
+    :rtype UpstreamPools: the shared pools.
+    """
+    global _upstream_pools
+    settings = {key: options.pop(key) for key in UPSTREAM_OPTIONS if key in options}
+    settings = {key[len("upstream_"):]: value for key, value in settings.items() if value is not None}
+    if settings:
+        _upstream_pools.close()
+        _upstream_pools = UpstreamPools(**settings)
+    return _upstream_pools
@@ -28,6 +28,13 @@ class WeApRous:
     using decorators and launch a TCP-based backend server to serve RESTful requests. 
     Each route is mapped to a handler function based on HTTP method and path. It mappings
     supports tracking the combined HTTP methods and path route mappings internally.
+    Paths may declare typed parameters (``<name>``, ``<int:id>``, ``<path:rest>``),
+    passed to the handler as keyword arguments; the table is compiled into a
+    :class:`Router <Router>` when the server starts. A handler declaring a
+    ``request`` parameter receives the :class:`Request <Request>`, whose
+    ``cookies``, ``query``, ``form`` and ``json`` are parsed on first use.
+    Handlers may be plain functions or ``async def`` coroutines; the ``asyncio``
+    engine awaits coroutines directly and offloads plain functions to threads.
 
     Usage::
       >>> import daemon.weaprous
@@ -40,7 +47,16 @@ class WeApRous:
       >>> def hello(headers, body):
       >>>     return {'message': 'Hello, world!'}
 
-      >>> app.run()
+      >>> @app.route('/channels/<name>/messages/<int:since>', methods=['GET'])
+      >>> def messages(request, name, since):
+      >>>     return {'channel': name, 'since': since, 'peer': request.json['peer_id']}
+
+      >>> @app.route('/wait', methods=['GET'])
+      >>> async def wait(headers, body):
+      >>>     await asyncio.sleep(1)
+      >>>     return {'message': 'Done'}
+
+      >>> app.run(engine="asyncio")
     """
 
     def __init__(self):
@@ -68,7 +84,7 @@ class WeApRous:
         """
         Decorator to register a route handler for a specific path and HTTP methods.
 
-        :param path (str): The URL path to route.
+        :param path (str): The URL path to route, may contain ``<type:name>`` parameters.
         :param methods (list): A list of HTTP methods (e.g., ['GET', 'POST']) to bind.
 
         :rtype: function - A decorator that registers the handler function.
@@ -84,18 +100,24 @@ class WeApRous:
             return func
         return decorator
 
-    def run(self):
+    def run(self, engine="thread", **options):
         """
         Start the backend server and begin handling requests.
 
         This method launches the TCP server using the configured IP and port,
         and dispatches incoming requests to the registered route handlers.
 
+        :param engine (str): Server engine, ``thread`` (default), ``pool``, ``selector``
+                            or ``asyncio``.
+        :param options: Engine settings forwarded to :func:`create_backend`,
+                        e.g. ``max_workers=16`` for the ``pool`` engine or
+                        ``workers=4`` to fork four server processes.
+
         :raise: Error if IP or port has not been configured.
         """
         if not self.ip or not self.port:
             print("Rous app need to preapre address"
                   "by calling app.prepare_address(ip,port)")
 
-        create_backend(self.ip, self.port, self.routes)
+        create_backend(self.ip, self.port, self.routes, engine=engine, **options)
         
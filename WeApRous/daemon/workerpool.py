@@ -0,0 +1,173 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.workerpool
+~~~~~~~~~~~~~~~~~
+
+This module provides a bounded, self-tuning pool of worker threads used by
+the backend daemon instead of spawning one thread per accepted connection.
+
+Accepted connections are pushed into a bounded queue. The pool keeps at least
+``min_workers`` threads alive, grows up to ``max_workers`` while work is
+waiting and no worker is idle, and shrinks back when a worker has been idle
+for longer than ``idle_timeout`` seconds. Setting ``min_workers`` equal to
+``max_workers`` gives a fixed-size pool.
+
+Usage Example:
+--------------
+>>> pool = WorkerPool(handle_client, min_workers=4, max_workers=32)
+>>> pool.start()
+>>> pool.submit(ip, port, conn, addr, routes)
+"""
+
+import queue
+import threading
+
+#: Default number of worker threads kept alive at all times.
+DEFAULT_MIN_WORKERS = 4
+#: Default upper bound on the number of worker threads.
+DEFAULT_MAX_WORKERS = 64
+#: Default depth of the accept queue feeding the workers.
+DEFAULT_QUEUE_SIZE = 128
+#: Default number of seconds an extra worker may stay idle before exiting.
+DEFAULT_IDLE_TIMEOUT = 30.0
+
+
+class WorkerPool:
+    """The :class:`WorkerPool <WorkerPool>` object, which runs a handler
+    function for every submitted job on a bounded set of threads.
+
+    :attrs handler (callable): function invoked with the arguments of each job.
+    :attrs min_workers (int): number of threads that never shrink away.
+    :attrs max_workers (int): maximum number of concurrent threads.
+    :attrs queue_size (int): capacity of the job queue.
+    :attrs idle_timeout (float): idle seconds before an extra thread exits.
+    """
+
+    __attrs__ = [
+        "handler",
+        "min_workers",
+        "max_workers",
+        "queue_size",
+        "idle_timeout",
+    ]
+
+    def __init__(self, handler, min_workers=DEFAULT_MIN_WORKERS,
+                 max_workers=DEFAULT_MAX_WORKERS, queue_size=DEFAULT_QUEUE_SIZE,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        """
+        Initialize a new WorkerPool instance.
+
+        :param handler (callable): function invoked with the arguments of each job.
+        :param min_workers (int): number of threads that never shrink away.
+        :param max_workers (int): maximum number of concurrent threads.
+        :param queue_size (int): capacity of the job queue, at least 1 so the
+                                 accept loop always feels backpressure.
+        :param idle_timeout (float): idle seconds before an extra thread exits.
+
+        :raises ValueError: If the worker bounds or the queue size are invalid.
+        """
+        if max_workers < 1 or min_workers < 0 or min_workers > max_workers:
+            raise ValueError("Invalid worker bounds min={} max={}".format(
+                min_workers, max_workers))
+        # queue.Queue(0) is unbounded, which would silently drop backpressure.
+        if queue_size < 1:
+            raise ValueError("Invalid queue size {}".format(queue_size))
+
+        self.handler = handler
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.idle_timeout = idle_timeout
+
+        self._jobs = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._workers = 0
+        self._idle = 0
+        self._running = False
+
+    def start(self):
+        """Start the minimum number of worker threads."""
+        with self._lock:
+            self._running = True
+            for _ in range(self.min_workers):
+                self._spawn()
+
+    def submit(self, *args, block=True, timeout=None):
+        """
+        Queue a job for the workers, growing the pool if nobody is idle.
+
+        :param args: positional arguments passed to the handler.
+        :param block (bool): wait for room in the queue when it is full.
+        :param timeout (float): maximum seconds to wait when blocking.
+
+        :rtype bool: True if the job was queued, False if the queue is full.
+        """
+        try:
+            self._jobs.put(args, block=block, timeout=timeout)
+        except queue.Full:
+            return False
+
+        with self._lock:
+            if self._running and self._idle == 0 and self._workers < self.max_workers:
+                self._spawn()
+        return True
+
+    def shutdown(self):
+        """Ask every worker to exit once the queued jobs are drained."""
+        with self._lock:
+            self._running = False
+            workers = self._workers
+        for _ in range(workers):
+            self._jobs.put(None)
+
+    @property
+    def size(self):
+        """Current number of worker threads."""
+        return self._workers
+
+    def _spawn(self):
+        """Start one worker thread. The caller must hold ``self._lock``."""
+        self._workers += 1
+        self._idle += 1
+        thread = threading.Thread(target=self._worker, daemon=True)
+        thread.start()
+
+    def _worker(self):
+        """Worker loop: run jobs until told to stop or idle for too long."""
+        while True:
+            try:
+                job = self._jobs.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    if self._workers > self.min_workers:
+                        self._workers -= 1
+                        self._idle -= 1
+                        return
+                continue
+
+            if job is None:
+                with self._lock:
+                    self._workers -= 1
+                    self._idle -= 1
+                return
+
+            with self._lock:
+                self._idle -= 1
+            try:
+                self.handler(*job)
+            except Exception as e:
+                print("[WorkerPool] Error in worker: {}".format(e))
+            finally:
+                with self._lock:
+                    self._idle += 1
@@ -26,6 +26,14 @@ import socket
 import argparse
 
 from daemon import create_backend
+from daemon.backend import ENGINES, DEFAULT_BACKLOG
+from daemon.workerpool import DEFAULT_MIN_WORKERS, DEFAULT_MAX_WORKERS, DEFAULT_QUEUE_SIZE
+from daemon.httpadapter import DEFAULT_KEEPALIVE_TIMEOUT, DEFAULT_MAX_KEEPALIVE_REQUESTS
+from daemon.reader import DEFAULT_MAX_HEADER_SIZE, DEFAULT_MAX_BODY_SIZE
+from daemon.admission import DEFAULT_MAX_QUEUE, DEFAULT_QUEUE_TIMEOUT, DEFAULT_RETRY_AFTER
+from daemon.timeouts import DEFAULT_HEADER_TIMEOUT, DEFAULT_BODY_TIMEOUT, DEFAULT_WRITE_TIMEOUT
+from daemon.staticcache import DEFAULT_MAX_BYTES, DEFAULT_REVALIDATE_INTERVAL, DEFAULT_CACHE_LIFETIMES
+from daemon.compression import DEFAULT_MIN_SIZE, precompress
 
 # Default port number used if none is specified via command-line arguments.
 PORT = 9000 
@@ -40,6 +48,32 @@ if __name__ == "__main__":
 
     :arg --server-ip (str): IP address to bind the server (default: 127.0.0.1).
     :arg --server-port (int): Port number to bind the server (default: 9000).
+    :arg --engine (str): Server engine, thread, pool, selector or asyncio (default: thread).
+    :arg --workers (int): Server processes sharing the port through SO_REUSEPORT (default: 1).
+    :arg --backlog (int): Length of the kernel listen backlog.
+    :arg --tcp-nodelay (flag): Disable Nagle's algorithm on client connections.
+    :arg --min-workers (int): Worker threads kept alive by the pool engine.
+    :arg --max-workers (int): Maximum worker threads of the pool engine.
+    :arg --queue-size (int): Accept queue depth of the pool engine.
+    :arg --keepalive-timeout (float): Idle seconds between keep-alive requests.
+    :arg --max-keepalive-requests (int): Requests served per connection.
+    :arg --max-header-size (int): Cap on request line plus headers, in bytes.
+    :arg --max-body-size (int): Cap on request bodies, in bytes.
+    :arg --header-timeout (float): Seconds to receive the request headers.
+    :arg --body-timeout (float): Seconds to receive the request body.
+    :arg --write-timeout (float): Seconds to send a response (or a chunk of it).
+    :arg --max-inflight (int): Connections served at once, unset disables load shedding.
+    :arg --max-queue (int): Connections waiting for a slot before 503 is answered.
+    :arg --queue-timeout (float): Seconds a connection waits for a slot.
+    :arg --retry-after (int): Retry-After seconds sent with 503.
+    :arg --static-cache-size (int): Bytes of static files kept in memory.
+    :arg --static-revalidate (float): Seconds between two disk checks of a cached file.
+    :arg --cache-lifetime (str): Browser cache lifetime of a directory, DIR=SECONDS, repeatable.
+    :arg --compress-min-size (int): Smallest route reply body compressed for gzip/deflate clients.
+    :arg --no-compression (flag): Never compress route replies.
+    :arg --precompress (flag): Write .gz siblings of the www/ and static/ files before serving.
+    :arg --no-asset-manifest (flag): Resolve static files on disk for every request.
+    :arg --asset-watch (float): Seconds between two rescans of the asset manifest.
     """
 
     parser = argparse.ArgumentParser(
@@ -58,9 +92,204 @@ if __name__ == "__main__":
         default=PORT,
         help='Port number to bind the server. Default is {}.'.format(PORT)
     )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='thread',
+        help='Server engine. Default is thread (one thread per connection).'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Server processes sharing the port, restarted if they crash. Default is 1.'
+    )
+    parser.add_argument(
+        '--backlog',
+        type=int,
+        default=DEFAULT_BACKLOG,
+        help='Length of the kernel listen backlog. Default is {}.'.format(DEFAULT_BACKLOG)
+    )
+    parser.add_argument(
+        '--tcp-nodelay',
+        action='store_true',
+        help='Set TCP_NODELAY on client connections.'
+    )
+    parser.add_argument(
+        '--min-workers',
+        type=int,
+        default=DEFAULT_MIN_WORKERS,
+        help='Worker threads kept alive by the pool engine. Default is {}.'.format(DEFAULT_MIN_WORKERS)
+    )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help='Maximum worker threads of the pool engine. Default is {}.'.format(DEFAULT_MAX_WORKERS)
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help='Accept queue depth of the pool engine. Default is {}.'.format(DEFAULT_QUEUE_SIZE)
+    )
+    parser.add_argument(
+        '--keepalive-timeout',
+        type=float,
+        default=DEFAULT_KEEPALIVE_TIMEOUT,
+        help='Idle seconds a keep-alive connection waits for its next request. Default is {}.'.format(DEFAULT_KEEPALIVE_TIMEOUT)
+    )
+    parser.add_argument(
+        '--max-keepalive-requests',
+        type=int,
+        default=DEFAULT_MAX_KEEPALIVE_REQUESTS,
+        help='Requests served per connection, 1 disables keep-alive. Default is {}.'.format(DEFAULT_MAX_KEEPALIVE_REQUESTS)
+    )
+    parser.add_argument(
+        '--max-header-size',
+        type=int,
+        default=DEFAULT_MAX_HEADER_SIZE,
+        help='Cap on request line plus headers, in bytes. Default is {}.'.format(DEFAULT_MAX_HEADER_SIZE)
+    )
+    parser.add_argument(
+        '--max-body-size',
+        type=int,
+        default=DEFAULT_MAX_BODY_SIZE,
+        help='Cap on request bodies, in bytes. Default is {}.'.format(DEFAULT_MAX_BODY_SIZE)
+    )
+    parser.add_argument(
+        '--header-timeout',
+        type=float,
+        default=DEFAULT_HEADER_TIMEOUT,
+        help='Seconds to receive the request headers, 0 disables. Default is {}.'.format(DEFAULT_HEADER_TIMEOUT)
+    )
+    parser.add_argument(
+        '--body-timeout',
+        type=float,
+        default=DEFAULT_BODY_TIMEOUT,
+        help='Seconds to receive the request body, 0 disables. Default is {}.'.format(DEFAULT_BODY_TIMEOUT)
+    )
+    parser.add_argument(
+        '--write-timeout',
+        type=float,
+        default=DEFAULT_WRITE_TIMEOUT,
+        help='Seconds to send a response or a chunk of it, 0 disables. Default is {}.'.format(DEFAULT_WRITE_TIMEOUT)
+    )
+    parser.add_argument(
+        '--max-inflight',
+        type=int,
+        default=None,
+        help='Connections served at once, the excess is queued then shed with 503. Default is unlimited.'
+    )
+    parser.add_argument(
+        '--max-queue',
+        type=int,
+        default=DEFAULT_MAX_QUEUE,
+        help='Connections waiting for a slot before answering 503. Default is {}.'.format(DEFAULT_MAX_QUEUE)
+    )
+    parser.add_argument(
+        '--queue-timeout',
+        type=float,
+        default=DEFAULT_QUEUE_TIMEOUT,
+        help='Seconds a connection waits for a slot. Default is {}.'.format(DEFAULT_QUEUE_TIMEOUT)
+    )
+    parser.add_argument(
+        '--retry-after',
+        type=int,
+        default=DEFAULT_RETRY_AFTER,
+        help='Retry-After seconds sent with 503. Default is {}.'.format(DEFAULT_RETRY_AFTER)
+    )
+    parser.add_argument(
+        '--static-cache-size',
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help='Bytes of static files kept in memory, 0 disables the cache. Default is {}.'.format(DEFAULT_MAX_BYTES)
+    )
+    parser.add_argument(
+        '--static-revalidate',
+        type=float,
+        default=DEFAULT_REVALIDATE_INTERVAL,
+        help='Seconds a cached file is served before checking it on disk. Default is {}.'.format(DEFAULT_REVALIDATE_INTERVAL)
+    )
+    parser.add_argument(
+        '--cache-lifetime',
+        action='append',
+        default=[],
+        metavar='DIR=SECONDS',
+        help='Browser cache lifetime (max-age) of the files of a directory, 0 always revalidates. '
+             'May be repeated. Defaults are {}.'.format(DEFAULT_CACHE_LIFETIMES)
+    )
+    parser.add_argument(
+        '--compress-min-size',
+        type=int,
+        default=DEFAULT_MIN_SIZE,
+        help='Smallest route reply body compressed for clients accepting gzip or deflate. '
+             'Default is {}.'.format(DEFAULT_MIN_SIZE)
+    )
+    parser.add_argument(
+        '--no-compression',
+        action='store_true',
+        help='Never compress route replies (static files are still negotiated).'
+    )
+    parser.add_argument(
+        '--precompress',
+        action='store_true',
+        help='Write a .gz sibling of every compressible file of www/ and static/ before serving.'
+    )
+    parser.add_argument(
+        '--no-asset-manifest',
+        action='store_true',
+        help='Do not index www/ and static/ at startup, resolve static files on disk for every request.'
+    )
+    parser.add_argument(
+        '--asset-watch',
+        type=float,
+        default=None,
+        help='Seconds between two rescans of www/ and static/ for added or removed files. '
+             'Default is to index them once.'
+    )
  
     args = parser.parse_args()
     ip = args.server_ip
     port = args.server_port
 
-    create_backend(ip, port)
+    cache_lifetimes = dict(DEFAULT_CACHE_LIFETIMES)
+    for setting in args.cache_lifetime:
+        directory, _, seconds = setting.partition('=')
+        if not directory or not seconds.isdigit():
+            parser.error("--cache-lifetime expects DIR=SECONDS, got {}".format(setting))
+        cache_lifetimes[directory] = int(seconds)
+
+    options = {
+        'workers': args.workers,
+        'backlog': args.backlog,
+        'nodelay': args.tcp_nodelay,
+        'keepalive_timeout': args.keepalive_timeout,
+        'max_keepalive_requests': args.max_keepalive_requests,
+        'max_header_size': args.max_header_size,
+        'max_body_size': args.max_body_size,
+        'header_timeout': args.header_timeout,
+        'body_timeout': args.body_timeout,
+        'write_timeout': args.write_timeout,
+        'max_inflight': args.max_inflight,
+        'max_queue': args.max_queue,
+        'queue_timeout': args.queue_timeout,
+        'retry_after': args.retry_after,
+        'static_cache_size': args.static_cache_size,
+        'static_revalidate': args.static_revalidate,
+        'cache_lifetimes': cache_lifetimes,
+        'compress_min_size': None if args.no_compression else args.compress_min_size,
+        'asset_manifest': not args.no_asset_manifest,
+        'asset_watch': args.asset_watch,
+    }
+    if args.engine == 'pool':
+        options.update({
+            'min_workers': args.min_workers,
+            'max_workers': args.max_workers,
+            'queue_size': args.queue_size,
+        })
+
+    if args.precompress:
+        print("[Backend] Precompressed {} static files".format(precompress(["www", "static"])))
+
+    create_backend(ip, port, engine=args.engine, **options)
@@ -43,6 +43,23 @@ from urllib.parse import urlparse
 from collections import defaultdict
 
 from daemon import create_proxy
+from daemon.reader import DEFAULT_MAX_HEADER_SIZE, DEFAULT_MAX_BODY_SIZE
+from daemon.admission import DEFAULT_MAX_QUEUE, DEFAULT_QUEUE_TIMEOUT, DEFAULT_RETRY_AFTER
+from daemon.timeouts import DEFAULT_HEADER_TIMEOUT, DEFAULT_BODY_TIMEOUT, DEFAULT_WRITE_TIMEOUT
+from daemon.upstream import (
+    DEFAULT_MAX_IDLE,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_UPSTREAM_TIMEOUT,
+)
+from daemon.relay import DEFAULT_RELAY_BUFFER_SIZE
+from daemon.health import (
+    DEFAULT_MAX_FAILS,
+    DEFAULT_COOLDOWN,
+    DEFAULT_SLOW_START,
+    DEFAULT_PROBE_TIMEOUT,
+)
+from daemon.proxycache import DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRY_SIZE
 
 PROXY_PORT = 8080
 
@@ -67,8 +84,10 @@ def parse_virtual_hosts(config_file):
     for host, block in host_blocks:
         proxy_map = {}
 
-        # Find all proxy_pass entries
-        proxy_passes = re.findall(r'proxy_pass\s+http://([^\s;]+);', block)
+        # Find all proxy_pass entries, with their parameters (e.g. weight=3)
+        proxy_passes = [" ".join((address,) + tuple(params.split()))
+                        for address, params in re.findall(
+                            r'proxy_pass\s+http://([^\s;]+)([^;]*);', block)]
         map = proxy_map.get(host,[])
         map = map + proxy_passes
         proxy_map[host] = map
@@ -117,11 +136,78 @@ if __name__ == "__main__":
 
     :arg --server-ip (str): IP address to bind the server (default: 127.0.0.1).
     :arg --server-port (int): Port number to bind the server (default: 9000).
+    :arg --max-header-size (int): Cap on request line plus headers, in bytes.
+    :arg --max-body-size (int): Cap on request bodies, in bytes.
+    :arg --header-timeout (float): Seconds to receive the request headers.
+    :arg --body-timeout (float): Seconds to receive the request body.
+    :arg --write-timeout (float): Seconds to send the response.
+    :arg --max-inflight (int): Connections served at once, unset disables load shedding.
+    :arg --max-queue (int): Connections waiting for a slot before 503 is answered.
+    :arg --queue-timeout (float): Seconds a connection waits for a slot.
+    :arg --retry-after (int): Retry-After seconds sent with 503.
+    :arg --upstream-max-idle (int): Idle keep-alive connections kept per backend.
+    :arg --upstream-max-connections (int): Connections open at once per backend.
+    :arg --upstream-idle-timeout (float): Seconds an idle backend connection is reused.
+    :arg --upstream-timeout (float): Seconds to connect to and hear from a backend.
+    :arg --relay-buffer-size (int): Response bytes buffered per client before backpressure.
+    :arg --health-max-fails (int): Consecutive failures ejecting a backend.
+    :arg --health-cooldown (float): Seconds an ejected backend receives no traffic.
+    :arg --health-slow-start (float): Seconds over which a backend gets its traffic back.
+    :arg --health-interval (float): Seconds between two active probes, unset disables them.
+    :arg --health-path (str): Path probed with GET, unset probes with a TCP connect.
+    :arg --health-timeout (float): Seconds allowed to a probe.
+    :arg --proxy-cache-size (int): Bytes of cached backend responses, 0 (the default) disables the cache.
+    :arg --proxy-cache-max-entry (int): Largest backend response cached, in bytes.
     """
 
     parser = argparse.ArgumentParser(prog='Proxy', description='', epilog='Proxy daemon')
     parser.add_argument('--server-ip', default='0.0.0.0')
     parser.add_argument('--server-port', type=int, default=PROXY_PORT)
+    parser.add_argument('--max-header-size', type=int, default=DEFAULT_MAX_HEADER_SIZE,
+                        help='Cap on request line plus headers, in bytes.')
+    parser.add_argument('--max-body-size', type=int, default=DEFAULT_MAX_BODY_SIZE,
+                        help='Cap on request bodies, in bytes.')
+    parser.add_argument('--header-timeout', type=float, default=DEFAULT_HEADER_TIMEOUT,
+                        help='Seconds to receive the request headers, 0 disables.')
+    parser.add_argument('--body-timeout', type=float, default=DEFAULT_BODY_TIMEOUT,
+                        help='Seconds to receive the request body, 0 disables.')
+    parser.add_argument('--write-timeout', type=float, default=DEFAULT_WRITE_TIMEOUT,
+                        help='Seconds to send the response, 0 disables.')
+    parser.add_argument('--max-inflight', type=int, default=None,
+                        help='Connections served at once. Default is unlimited.')
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE,
+                        help='Connections waiting for a slot before answering 503.')
+    parser.add_argument('--queue-timeout', type=float, default=DEFAULT_QUEUE_TIMEOUT,
+                        help='Seconds a connection waits for a slot.')
+    parser.add_argument('--retry-after', type=int, default=DEFAULT_RETRY_AFTER,
+                        help='Retry-After seconds sent with 503.')
+    parser.add_argument('--upstream-max-idle', type=int, default=DEFAULT_MAX_IDLE,
+                        help='Idle keep-alive connections kept per backend, 0 disables reuse.')
+    parser.add_argument('--upstream-max-connections', type=int, default=DEFAULT_MAX_CONNECTIONS,
+                        help='Connections open at once per backend.')
+    parser.add_argument('--upstream-idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help='Seconds an idle backend connection is reused.')
+    parser.add_argument('--upstream-timeout', type=float, default=DEFAULT_UPSTREAM_TIMEOUT,
+                        help='Seconds to connect to and hear from a backend.')
+    parser.add_argument('--relay-buffer-size', type=int, default=DEFAULT_RELAY_BUFFER_SIZE,
+                        help='Response bytes buffered per client before the backend is paused.')
+    parser.add_argument('--health-max-fails', type=int, default=DEFAULT_MAX_FAILS,
+                        help='Consecutive failures ejecting a backend, 0 disables ejection.')
+    parser.add_argument('--health-cooldown', type=float, default=DEFAULT_COOLDOWN,
+                        help='Seconds an ejected backend receives no traffic.')
+    parser.add_argument('--health-slow-start', type=float, default=DEFAULT_SLOW_START,
+                        help='Seconds over which a re-admitted backend gets its traffic back.')
+    parser.add_argument('--health-interval', type=float, default=None,
+                        help='Seconds between two active probes. Default is passive checks only.')
+    parser.add_argument('--health-path', default=None,
+                        help='Path probed with GET. Default is a TCP connect.')
+    parser.add_argument('--health-timeout', type=float, default=DEFAULT_PROBE_TIMEOUT,
+                        help='Seconds allowed to a probe.')
+    parser.add_argument('--proxy-cache-size', type=int, default=0,
+                        help='Bytes of cached backend responses, e.g. {}. Default 0 disables '
+                             'the cache.'.format(DEFAULT_MAX_BYTES))
+    parser.add_argument('--proxy-cache-max-entry', type=int, default=DEFAULT_MAX_ENTRY_SIZE,
+                        help='Largest backend response cached, in bytes.')
  
     args = parser.parse_args()
     ip = args.server_ip
@@ -129,4 +215,26 @@ if __name__ == "__main__":
 
     routes = parse_virtual_hosts("config/proxy.conf")
 
-    create_proxy(ip, port, routes)
+    create_proxy(ip, port, routes,
+                 max_header_size=args.max_header_size,
+                 max_body_size=args.max_body_size,
+                 header_timeout=args.header_timeout,
+                 body_timeout=args.body_timeout,
+                 write_timeout=args.write_timeout,
+                 relay_buffer_size=args.relay_buffer_size,
+                 max_inflight=args.max_inflight,
+                 max_queue=args.max_queue,
+                 queue_timeout=args.queue_timeout,
+                 retry_after=args.retry_after,
+                 upstream_max_idle=args.upstream_max_idle,
+                 upstream_max_connections=args.upstream_max_connections,
+                 upstream_idle_timeout=args.upstream_idle_timeout,
+                 upstream_timeout=args.upstream_timeout,
+                 health_max_fails=args.health_max_fails,
+                 health_cooldown=args.health_cooldown,
+                 health_slow_start=args.health_slow_start,
+                 health_interval=args.health_interval,
+                 health_path=args.health_path,
+                 health_timeout=args.health_timeout,
+                 proxy_cache_size=args.proxy_cache_size,
+                 proxy_cache_max_entry=args.proxy_cache_max_entry)
@@ -18,6 +18,9 @@ import argparse
 import json
 import time
 from daemon.weaprous import WeApRous
+from daemon.response import ChunkedResponse, RouteResponse
+from daemon.backend import ENGINES
+from daemon.workerpool import DEFAULT_MAX_WORKERS
 
 # Stores {peer_id: {'ip': str, 'port': int, 'messages': list}}
 peer_storage = {} # tracker list
@@ -29,20 +32,10 @@ PORT = 8000
 app = WeApRous()
 
 def json_response(status_code, status, message_or_data):
-    """Helper to generate a complete HTTP JSON response."""
+    """Helper to generate a JSON reply, serialized and sent by the adapter."""
     if status == 'error':
-        response_body = json.dumps({"status": status, "message": message_or_data})
-    else:
-        response_body = json.dumps({"status": status, **message_or_data})
-
-    return (
-        f"HTTP/1.1 {status_code} {status.upper()}\r\n"
-        f"Content-Type: application/json\r\n"
-        f"Content-Length: {len(response_body)}\r\n"
-        f"Connection: close\r\n"
-        f"\r\n"
-        f"{response_body}"
-    ).encode('utf-8')
+        return RouteResponse.json({"status": status, "message": message_or_data}, status_code)
+    return RouteResponse.json({"status": status, **message_or_data}, status_code)
 # -------------------------
 def leave_all_channels(peer_id):
     """
@@ -58,17 +51,18 @@ def leave_all_channels(peer_id):
 # -------------------------
 
 @app.route('/submit-info', methods=['POST'])
-def submit_info(headers="guest", body="anonymous"):
+def submit_info(request):
     """API 1: Handles peer registration (via peer_id)."""
     global peer_storage
     try:
-        data = json.loads(body)
+        data = request.json
         peer_id = data.get('peer_id')
         ip = data.get('ip')
-        port = int(data.get('port')) 
+        port = data.get('port')
 
         if not peer_id or not ip or not port:
             return json_response(400, "error", "Missing 'peer_id', 'ip', or 'port' in JSON body")
+        port = int(port)
 
         # 1. Store peer info and init message queue
         peer_storage[peer_id] = {
@@ -91,7 +85,7 @@ def submit_info(headers="guest", body="anonymous"):
 
 
 @app.route('/get-list', methods=['GET'])
-def get_list(headers="guest", body="anonymous"):
+def get_list(request):
     """API 2: Handles peer discovery and list all channels."""
     
     # Clean peer_storage to return a simplified list {peer_id: "ip:port"}
@@ -114,12 +108,32 @@ def get_list(headers="guest", body="anonymous"):
     
     return json_response(200, "success", data)
 
+@app.route('/export-peers', methods=['GET'])
+def export_peers(request):
+    """API 2b: Streams every registered peer as one JSON line (NDJSON)."""
+
+    def generate():
+        # Snapshot the keys so registrations during the export are harmless
+        for pid in list(peer_storage.keys()):
+            data = peer_storage.get(pid)
+            if data is None:
+                continue
+            yield json.dumps({
+                "peer_id": pid,
+                "ip": data['ip'],
+                "port": data['port'],
+                "queued": len(data['messages']),
+            }) + "\n"
+
+    print(f"[Tracker] Streaming peer export. Peers: {len(peer_storage)}")
+    return ChunkedResponse(generate(), content_type="application/x-ndjson")
+
 # /add-list -> /create-list
 @app.route('/create-list', methods=['POST'])
-def create_list(headers="guest", body="anonymous"):
+def create_list(request):
     """API 3: Handles channel creation and automatically joins the creator."""
     try:
-        data = json.loads(body)
+        data = request.json
         list_name = data.get('list_name')
         peer_id = data.get('peer_id')
         
@@ -147,13 +161,13 @@ def create_list(headers="guest", body="anonymous"):
 
 
 @app.route('/send-message', methods=['POST'])
-def send_message(headers="guest", body="anonymous"):
+def send_message(request):
     """
     API 4: Handles message push to target Peer or Channel message queue.
     /connect-peer and /broadcast-peer 
     """
     try:
-        data = json.loads(body)
+        data = request.json
         sender_id = data.get('sender_id')
         target_id = data.get('target_id')
         message = data.get('message')
@@ -195,10 +209,10 @@ def send_message(headers="guest", body="anonymous"):
 
 
 @app.route('/get-messages', methods=['POST'])
-def get_messages(headers="guest", body="anonymous"):
+def get_messages(request):
     """API 5: Handles message pull from Peer's message queue (Polling)."""
     try:
-        data = json.loads(body)
+        data = request.json
         peer_id = data.get('peer_id')
 
         if not peer_id:
@@ -219,11 +233,11 @@ def get_messages(headers="guest", body="anonymous"):
     
 
 @app.route('/join-list', methods=['POST'])
-def join_list(headers="guest", body="anonymous"):
+def join_list(request):
     """API X: Handles joining an existing channel."""
     global channel_storage
     try:
-        data = json.loads(body)
+        data = request.json
         list_name = data.get('list_name')
         peer_id = data.get('peer_id')
         
@@ -283,6 +297,18 @@ if __name__ == "__main__":
         default=PORT,
         help=f'Port number to bind the server. Default is {PORT}.'
     )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='thread',
+        help='Server engine. Default is thread (one thread per connection).'
+    )
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f'Maximum worker threads of the pool engine. Default is {DEFAULT_MAX_WORKERS}.'
+    )
  
     args = parser.parse_args()
     ip = args.server_ip
@@ -299,4 +325,7 @@ if __name__ == "__main__":
     print("*" * 60)
     
     # Start the server
-    app.run()
\ No newline at end of file
+    options = {}
+    if args.engine == 'pool':
+        options['max_workers'] = args.max_workers
+    app.run(engine=args.engine, **options)
\ No newline at end of file
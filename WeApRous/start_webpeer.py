@@ -25,14 +25,9 @@ def get_cors_headers():
     }
 
 # --- OPTIONS HANDLERS ---
-@app.route('/init-peer', methods=['OPTIONS'])
-@app.route('/connect-peer', methods=['OPTIONS'])
-@app.route('/send-peer', methods=['OPTIONS'])
-@app.route('/broadcast-peer', methods=['OPTIONS'])
-@app.route('/get-messages', methods=['OPTIONS'])
-@app.route('/join-channel', methods=['OPTIONS'])
-@app.route('/status', methods=['OPTIONS'])
-def handle_options(headers="guest", body="anonymous"):
+# One catch-all route answers the CORS preflight of every API endpoint.
+@app.route('/<path:endpoint>', methods=['OPTIONS'])
+def handle_options(headers="guest", body="anonymous", endpoint=""):
     return ("200 OK", get_cors_headers(), "")
 
 # --- API HANDLERS ---
@@ -0,0 +1,85 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+Shared fixtures of the WeApRous tests, run with ``python -m pytest -q tests``
+from the ``WeApRous`` directory. Static files are served from ``www/`` and
+``static/`` relative to the working directory, so the tests run there.
+"""
+
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from daemon.backend import create_server_socket, serve_engine
+from daemon.router import Router
+
+
+@pytest.fixture
+def socketpair():
+    """A connected pair of stream sockets, closed after the test."""
+    left, right = socket.socketpair()
+    yield left, right
+    left.close()
+    right.close()
+
+
+@pytest.fixture
+def backend():
+    """
+    Starts backends on free ports, their accept loops run in daemon threads
+    for the rest of the test session.
+
+    :rtype callable: ``backend(routes, engine="thread", options=None,
+                     **adapter_options)`` returning the port.
+    """
+    servers = []
+
+    def start(routes, engine="thread", options=None, **adapter_options):
+        server = create_server_socket("127.0.0.1", 0)
+        servers.append(server)
+        port = server.getsockname()[1]
+        thread = threading.Thread(
+            target=serve_engine,
+            args=("127.0.0.1", port, server, Router.compile(routes), engine,
+                  adapter_options, dict(options or {})),
+            daemon=True)
+        thread.start()
+        return port
+
+    return start
+
+
+def exchange(port, data, timeout=5.0):
+    """
+    Sends raw bytes to a server and reads until it closes the connection.
+
+    :param port (int): server port on 127.0.0.1.
+    :param data (bytes): the request(s).
+
+    :rtype bytes: everything the server sent.
+    """
+    with socket.create_connection(("127.0.0.1", port), timeout=timeout) as sock:
+        sock.sendall(data)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
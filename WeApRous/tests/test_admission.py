@@ -0,0 +1,123 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of :mod:`daemon.admission`."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from conftest import exchange
+from daemon.admission import AdmissionController, create_admission
+from daemon.backend import admit
+from daemon.proxy import run_proxy
+
+
+def hello(headers, body):
+    return {"hello": "world"}
+
+
+def fill(sock):
+    """Fill the send buffer of a non-blocking socket whose peer never reads."""
+    sock.setblocking(False)
+    try:
+        while True:
+            sock.send(b"x" * 65536)
+    except BlockingIOError:
+        pass
+
+
+def test_reserve_and_acquire_bounds():
+    admission = AdmissionController(max_inflight=1, max_queue=1, queue_timeout=0.05)
+    assert admission.reserve() and admission.acquire()
+    assert admission.reserve()
+    # One waiting place: the next connection is shed.
+    assert not admission.reserve()
+    assert not admission.acquire()
+    admission.release()
+    assert admission.reserve() and admission.acquire(timeout=0)
+
+
+def test_create_admission_consumes_its_options():
+    options = {"max_inflight": 2, "retry_after": 3, "other": 1}
+    admission = create_admission(options)
+    assert (admission.max_inflight, admission.retry_after) == (2, 3)
+    assert options == {"other": 1}
+    assert create_admission({}) is None
+
+
+def test_non_blocking_reject_never_waits_for_the_client(socketpair):
+    client, server = socketpair
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+    fill(server)
+    started = time.monotonic()
+    AdmissionController(max_inflight=1).reject(server, blocking=False)
+    assert time.monotonic() - started < 0.5
+    assert server.fileno() == -1
+
+
+def test_reject_sends_503(socketpair):
+    client, server = socketpair
+    AdmissionController(max_inflight=1, retry_after=7).reject(server)
+    reply = client.recv(65536)
+    assert reply.startswith(b"HTTP/1.1 503")
+    assert b"Retry-After: 7" in reply
+
+
+def test_accept_loop_sheds_without_waiting(socketpair):
+    client, server = socketpair
+    admission = AdmissionController(max_inflight=1, max_queue=0)
+    assert admission.reserve()
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+    fill(server)
+    started = time.monotonic()
+    assert not admit(server, {"admission": admission})
+    assert time.monotonic() - started < 0.5
+    assert server.fileno() == -1
+
+
+def test_proxy_sheds_beyond_max_inflight():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    threading.Thread(target=run_proxy, args=("127.0.0.1", port, {}),
+                     kwargs={"max_inflight": 1, "max_queue": 0}, daemon=True).start()
+    for _ in range(100):
+        try:
+            holder = socket.create_connection(("127.0.0.1", port), timeout=5)
+            break
+        except ConnectionRefusedError:
+            time.sleep(0.01)
+    try:
+        # The holder never sends its request and keeps the only slot.
+        time.sleep(0.05)
+        reply = exchange(port, b"GET / HTTP/1.1\r\nHost: a.local\r\n\r\n")
+        assert reply.startswith(b"HTTP/1.1 503")
+    finally:
+        holder.close()
+
+
+@pytest.mark.parametrize("engine", ["selector", "asyncio", "thread", "pool"])
+def test_engines_shed_beyond_max_inflight(backend, engine):
+    port = backend({("GET", "/hello"): hello}, engine=engine,
+                   admission=AdmissionController(max_inflight=1, max_queue=0, queue_timeout=0))
+    holder = socket.create_connection(("127.0.0.1", port), timeout=5)
+    try:
+        # The first connection holds the only slot while it is open.
+        holder.sendall(b"GET /hello HTTP/1.1\r\nHost: t\r\n\r\n")
+        assert holder.recv(65536).startswith(b"HTTP/1.1 200")
+        reply = exchange(port, b"GET /hello HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n")
+        assert reply.startswith(b"HTTP/1.1 503")
+    finally:
+        holder.close()
@@ -0,0 +1,57 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of ``async def`` route hooks on every engine."""
+
+import asyncio
+import socket
+
+import pytest
+
+from conftest import exchange
+from daemon.eventloop import SelectorServer
+
+REQUEST = b"GET /loop HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n"
+
+loops = []
+
+
+async def loop_id(headers, body):
+    await asyncio.sleep(0)
+    loops.append(asyncio.get_running_loop())
+    return {"loop": id(loops[-1])}
+
+
+@pytest.mark.parametrize("engine", ["thread", "pool", "asyncio"])
+def test_coroutine_hook_is_awaited(backend, engine):
+    port = backend({("GET", "/loop"): loop_id}, engine=engine)
+    reply = exchange(port, REQUEST)
+    assert reply.startswith(b"HTTP/1.1 200")
+    assert b'"loop"' in reply
+
+
+def test_threaded_engines_share_one_hook_loop(backend):
+    del loops[:]
+    port = backend({("GET", "/loop"): loop_id}, engine="thread")
+    for _ in range(3):
+        assert exchange(port, REQUEST).startswith(b"HTTP/1.1 200")
+    assert len(loops) == 3
+    assert loops[0] is loops[1] is loops[2]
+
+
+def test_selector_engine_refuses_coroutine_hooks():
+    server = socket.socket()
+    try:
+        with pytest.raises(ValueError, match="GET /loop"):
+            SelectorServer("127.0.0.1", 0, server, {("GET", "/loop"): loop_id})
+    finally:
+        server.close()
@@ -0,0 +1,96 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of the proxy load balancing of :mod:`daemon.balancer`."""
+
+import collections
+
+import pytest
+
+from daemon import balancer as balancer_module
+from daemon.balancer import Balancer, Member, all_members, balancer_for, parse_member
+from daemon.proxy import resolve_backend
+
+
+@pytest.fixture(autouse=True)
+def fresh_balancers(monkeypatch):
+    monkeypatch.setattr(balancer_module, "_balancers", {})
+    monkeypatch.setattr(balancer_module, "_health", {})
+
+
+def members(*weights):
+    return [Member("10.0.0.{}".format(i), 9000, weight) for i, weight in enumerate(weights, 1)]
+
+
+def test_parse_member():
+    assert parse_member("10.0.0.1:9002 weight=3") == ("10.0.0.1", 9002, {"weight": 3})
+    assert parse_member("backend:80") == ("backend", 80, {})
+    for spec in ("10.0.0.1:http", "10.0.0.1:9002 weight=0"):
+        with pytest.raises(ValueError):
+            parse_member(spec)
+
+
+def test_weighted_round_robin_is_smooth():
+    heavy, light = members(3, 1)
+    balancer = Balancer([heavy, light], "round-robin")
+    picks = [balancer.choose() for _ in range(8)]
+    assert picks.count(heavy) == 6 and picks.count(light) == 2
+    # Interleaved, never the light member twice in a row.
+    assert all(picks[i] is heavy or picks[i + 1] is heavy for i in range(7))
+
+
+def test_least_conn_follows_inflight_per_weight():
+    first, second = members(1, 2)
+    balancer = Balancer([first, second], "least_conn")
+    first.acquire()
+    second.acquire()
+    assert balancer.choose() is second
+    second.acquire()
+    second.acquire()
+    assert balancer.choose() is first
+
+
+def test_p2c_ewma_prefers_the_faster_member():
+    fast, slow = members(1, 1)
+    for member, latency in ((fast, 0.01), (slow, 0.5)):
+        member.acquire()
+        member.release(latency)
+    balancer = Balancer([fast, slow], "p2c_ewma")
+    assert collections.Counter(balancer.choose() for _ in range(20)) == {fast: 20}
+
+
+def test_ejected_members_are_skipped_unless_nothing_is_left():
+    first, second = members(1, 1)
+    balancer = Balancer([first, second])
+    first.eject(cooldown=60, slow_start=0)
+    assert {balancer.choose() for _ in range(4)} == {second}
+    assert balancer.choose(exclude=[second]) is first
+    second.eject(cooldown=60, slow_start=0)
+    assert balancer.choose() in (first, second)
+
+
+def test_balancers_survive_requests_and_follow_config_changes():
+    balancer = balancer_for("a.local", ["10.0.0.1:9001", "10.0.0.2:9001"], "least_conn")
+    assert balancer_for("a.local", ["10.0.0.1:9001", "10.0.0.2:9001"], "least_conn") is balancer
+    rebuilt = balancer_for("a.local", ["10.0.0.1:9001"], "least_conn")
+    assert rebuilt is not balancer and len(rebuilt.members) == 1
+    assert balancer_for("a.local", [], "least_conn") is None
+
+
+def test_unknown_hosts_share_the_default_balancer():
+    routes = {"a.local": (["10.0.0.1:9001", "10.0.0.2:9001"], "round-robin")}
+    resolve_backend("a.local", routes)
+    for i in range(100):
+        member = resolve_backend("attacker-{}.example".format(i), routes)
+        assert member.address == "127.0.0.1:9000"
+    assert set(balancer_module._balancers) == {"a.local", None}
+    assert len(all_members()) == 3
@@ -0,0 +1,87 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of :mod:`daemon.compression`."""
+
+import gzip
+import zlib
+
+from conftest import exchange
+from daemon.compression import compress_response, merge_vary, negotiate_encoding
+from daemon.response import RouteResponse
+
+BODY = b'{"peers": ["127.0.0.1:9001"]}' * 100
+
+
+def raw(*headers, body=BODY):
+    head = ["HTTP/1.1 200 OK", "Content-Type: application/json",
+            "Content-Length: {}".format(len(body))] + list(headers)
+    return "\r\n".join(head).encode() + b"\r\n\r\n" + body
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip;q=0.5, deflate") == "deflate"
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("*") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding(None) is None
+
+
+def test_merge_vary():
+    assert merge_vary(None) == "Accept-Encoding"
+    assert merge_vary("Origin") == "Origin, Accept-Encoding"
+    assert merge_vary("origin, accept-encoding") == "origin, accept-encoding"
+    assert merge_vary("*") == "*"
+
+
+def test_compress_response_round_trip():
+    reply = compress_response(raw(), "gzip", 64)
+    head, _, body = reply.partition(b"\r\n\r\n")
+    assert b"Content-Encoding: gzip" in head
+    assert "Content-Length: {}".format(len(body)).encode() in head
+    assert gzip.decompress(body) == BODY
+
+
+def test_compress_response_keeps_existing_vary():
+    head = compress_response(raw("Vary: Origin", "Vary: Cookie"), "deflate", 64).partition(b"\r\n\r\n")[0]
+    assert head.count(b"Vary:") == 1
+    assert b"Vary: Origin, Cookie, Accept-Encoding" in head
+
+
+def test_compress_response_leaves_small_and_encoded_replies():
+    small = raw(body=b"{}")
+    assert compress_response(small, "gzip", 64) == small
+    encoded = raw("Content-Encoding: br")
+    assert compress_response(encoded, "gzip", 64) == encoded
+    assert compress_response(raw(), "identity", 64) == raw()
+
+
+def test_route_response_compress_merges_vary():
+    response = RouteResponse(BODY, headers={"Vary": "Origin"}, content_type="application/json")
+    response.compress("deflate", 64)
+    assert response.headers["Content-Encoding"] == "deflate"
+    assert response.headers["Vary"] == "Origin, Accept-Encoding"
+    assert zlib.decompress(response.body) == BODY
+    assert "Content-Length: {}".format(len(response.body)).encode() in response.head
+
+
+def test_hook_replies_are_compressed(backend):
+    def peers(headers, body):
+        return ("200 OK", {"Vary": "Origin"}, BODY.decode())
+
+    port = backend({("GET", "/peers"): peers}, compress_min_size=64)
+    reply = exchange(port, b"GET /peers HTTP/1.1\r\nHost: t\r\nAccept-Encoding: gzip\r\n"
+                           b"Connection: close\r\n\r\n")
+    head, _, body = reply.partition(b"\r\n\r\n")
+    assert b"Content-Encoding: gzip" in head
+    assert b"Vary: Origin, Accept-Encoding" in head
+    assert gzip.decompress(body) == BODY
@@ -0,0 +1,58 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of conditional GETs of static files."""
+
+import re
+
+from conftest import exchange
+
+
+def get(port, path, *headers):
+    request = "GET {} HTTP/1.1\r\nHost: t\r\nConnection: close\r\n{}\r\n".format(
+        path, "".join(header + "\r\n" for header in headers))
+    reply = exchange(port, request.encode())
+    head, _, body = reply.partition(b"\r\n\r\n")
+    return head.decode(), body
+
+
+def header(head, name):
+    match = re.search(r"\r\n{}: ([^\r]*)".format(name), head, re.I)
+    return match and match.group(1)
+
+
+def test_validators_and_304(backend):
+    port = backend({})
+    head, body = get(port, "/css/styles.css")
+    assert head.startswith("HTTP/1.1 200")
+    etag, last_modified = header(head, "ETag"), header(head, "Last-Modified")
+    assert etag and last_modified
+
+    head, body = get(port, "/css/styles.css", "If-None-Match: " + etag)
+    assert head.startswith("HTTP/1.1 304")
+    assert body == b""
+    assert header(head, "ETag") == etag
+
+    head, _ = get(port, "/css/styles.css", "If-None-Match: W/\"other\", " + etag)
+    assert head.startswith("HTTP/1.1 304")
+    head, _ = get(port, "/css/styles.css", "If-Modified-Since: " + last_modified)
+    assert head.startswith("HTTP/1.1 304")
+
+
+def test_changed_validators_get_the_file(backend):
+    port = backend({})
+    head, body = get(port, "/css/styles.css", 'If-None-Match: "stale"')
+    assert head.startswith("HTTP/1.1 200")
+    with open("static/css/styles.css", "rb") as f:
+        assert body == f.read()
+    head, _ = get(port, "/css/styles.css", "If-Modified-Since: Thu, 01 Jan 1970 00:00:00 GMT")
+    assert head.startswith("HTTP/1.1 200")
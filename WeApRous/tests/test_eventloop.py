@@ -0,0 +1,49 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of the ``selector`` engine, :mod:`daemon.eventloop`."""
+
+import socket
+
+from conftest import exchange
+
+
+def hello(headers, body):
+    return {"hello": "world"}
+
+
+def test_serves_a_request(backend):
+    port = backend({("GET", "/hello"): hello}, engine="selector")
+    reply = exchange(port, b"GET /hello HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n")
+    assert reply.startswith(b"HTTP/1.1 200")
+    assert reply.endswith(b'{"hello": "world"}')
+
+
+def test_interleaves_clients_on_one_thread(backend):
+    port = backend({("GET", "/hello"): hello}, engine="selector")
+    # A client that sent half a request must not hold the others up.
+    stalled = socket.create_connection(("127.0.0.1", port), timeout=5)
+    try:
+        stalled.sendall(b"GET /hello HTTP/1.1\r\nHost")
+        for _ in range(5):
+            reply = exchange(port, b"GET /hello HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n")
+            assert reply.startswith(b"HTTP/1.1 200")
+        stalled.sendall(b": t\r\nConnection: close\r\n\r\n")
+        assert stalled.recv(65536).startswith(b"HTTP/1.1 200")
+    finally:
+        stalled.close()
+
+
+def test_unknown_route_is_not_found(backend):
+    port = backend({("GET", "/hello"): hello}, engine="selector")
+    reply = exchange(port, b"GET /missing.html HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n")
+    assert reply.startswith(b"HTTP/1.1 404")
@@ -0,0 +1,115 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of the backend health checks of :mod:`daemon.health`."""
+
+import socket
+import threading
+
+import pytest
+
+from daemon import balancer as balancer_module
+from daemon.balancer import Member, balancer_for
+from daemon.health import UpstreamHealth
+from daemon.proxy import handle_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_balancers(monkeypatch):
+    monkeypatch.setattr(balancer_module, "_balancers", {})
+    monkeypatch.setattr(balancer_module, "_health", {})
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_ejects_after_max_fails_and_success_resets():
+    health = UpstreamHealth(max_fails=3, cooldown=60, slow_start=0)
+    member = Member("10.0.0.1", 9001)
+    health.report(member, False)
+    health.report(member, False)
+    health.report(member, True)
+    health.report(member, False)
+    health.report(member, False)
+    assert not member.ejected
+    health.report(member, False)
+    assert member.ejected and not member.available()
+    assert member.health.failures == 0
+
+
+def test_recovering_backend_gets_no_second_chance():
+    health = UpstreamHealth(max_fails=3, cooldown=60, slow_start=60)
+    member = Member("10.0.0.1", 9001)
+    member.eject(cooldown=0, slow_start=60)
+    assert member.recovering
+    health.report(member, False)
+    assert member.ejected
+
+
+def test_failures_are_counted_under_the_lock():
+    health = UpstreamHealth(max_fails=10 ** 9)
+    member = Member("10.0.0.1", 9001)
+
+    def fail():
+        for _ in range(2000):
+            health.report(member, False)
+
+    threads = [threading.Thread(target=fail) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert member.health.failures == 16000
+
+
+def test_virtual_hosts_share_the_health_of_an_address():
+    first = balancer_for("a.local", ["10.0.0.1:9001", "10.0.0.2:9001"], "round-robin")
+    second = balancer_for("b.local", ["10.0.0.1:9001 weight=2"], "least_conn")
+    assert first.members[0].health is second.members[0].health
+    health = UpstreamHealth(max_fails=2, cooldown=60, slow_start=0)
+    health.report(first.members[0], False)
+    health.report(second.members[0], False)
+    assert second.members[0].ejected
+    assert {first.choose() for _ in range(4)} == {first.members[1]}
+    # A new configuration of the host keeps the ejection.
+    assert balancer_for("a.local", ["10.0.0.1:9001"], "least_conn").members[0].ejected
+
+
+def test_probe_round_checks_each_address_once(monkeypatch):
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen(4)
+        up, down = server.getsockname()[1], closed_port()
+        balancer_for("a.local", ["127.0.0.1:{}".format(up), "127.0.0.1:{}".format(down)], "round-robin")
+        balancer_for("b.local", ["127.0.0.1:{}".format(down)], "round-robin")
+        probes = []
+        health = UpstreamHealth(max_fails=1, cooldown=60, slow_start=0, timeout=1)
+        probe = health.probe
+        monkeypatch.setattr(health, "probe", lambda host, port: probes.append(port) or probe(host, port))
+        assert health.check() == {"127.0.0.1:{}".format(up): True, "127.0.0.1:{}".format(down): False}
+    assert sorted(probes) == sorted([up, down])
+    assert balancer_for("b.local", ["127.0.0.1:{}".format(down)], "round-robin").members[0].ejected
+
+
+def test_client_gets_502_when_no_backend_answers(socketpair, monkeypatch):
+    monkeypatch.setattr("daemon.health._upstream_health", UpstreamHealth(max_fails=1))
+    client, proxy_side = socketpair
+    routes = {"a.local": (["127.0.0.1:{}".format(closed_port()),
+                           "127.0.0.1:{}".format(closed_port())], "round-robin")}
+    client.sendall(b"GET / HTTP/1.1\r\nHost: a.local\r\n\r\n")
+    handle_client("127.0.0.1", 8080, proxy_side, ("127.0.0.1", 1), routes)
+    reply = client.recv(4096)
+    assert reply.startswith(b"HTTP/1.1 502 Bad Gateway")
+    assert all(member.ejected for member in balancer_for("a.local", *routes["a.local"]).members)
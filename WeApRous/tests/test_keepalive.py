@@ -0,0 +1,77 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of persistent connections and pipelining."""
+
+import socket
+
+import pytest
+
+from conftest import exchange
+
+ENGINES = ["thread", "pool", "selector", "asyncio"]
+
+
+def echo(headers, body):
+    return {"path": headers.get("x-name", "")}
+
+
+def read_response(sock, buf):
+    """Reads one Content-Length framed response, returns it and the rest."""
+    while b"\r\n\r\n" not in buf:
+        chunk = sock.recv(65536)
+        assert chunk, "connection closed before the response head"
+        buf += chunk
+    head, _, rest = buf.partition(b"\r\n\r\n")
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    while len(rest) < length:
+        chunk = sock.recv(65536)
+        assert chunk, "connection closed before the response body"
+        rest += chunk
+    return head, rest[:length], rest[length:]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_pipelined_requests_are_answered_in_order(backend, engine):
+    port = backend({("GET", "/echo"): echo}, engine=engine)
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(b"".join(
+            b"GET /echo HTTP/1.1\r\nHost: t\r\nX-Name: r%d\r\n\r\n" % i for i in range(3)))
+        buf = b""
+        for i in range(3):
+            head, body, buf = read_response(sock, buf)
+            assert head.startswith(b"HTTP/1.1 200")
+            assert body == b'{"path": "r%d"}' % i
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_connection_close_ends_the_connection(backend, engine):
+    port = backend({("GET", "/echo"): echo}, engine=engine)
+    reply = exchange(port, b"GET /echo HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n"
+                           b"GET /echo HTTP/1.1\r\nHost: t\r\n\r\n")
+    assert reply.count(b"HTTP/1.1 200") == 1
+
+
+def test_http10_closes_by_default(backend):
+    port = backend({("GET", "/echo"): echo})
+    reply = exchange(port, b"GET /echo HTTP/1.0\r\nHost: t\r\n\r\n")
+    assert reply.count(b" 200 ") == 1
+
+
+def test_keepalive_limit_closes(backend):
+    port = backend({("GET", "/echo"): echo}, max_keepalive_requests=2)
+    reply = exchange(port, b"GET /echo HTTP/1.1\r\nHost: t\r\n\r\n" * 3)
+    assert reply.count(b"HTTP/1.1 200") == 2
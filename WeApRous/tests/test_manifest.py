@@ -0,0 +1,73 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of :mod:`daemon.manifest`."""
+
+import os
+import time
+
+import pytest
+
+from conftest import exchange
+from daemon.manifest import AssetManifest
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """A working directory with the three static directories."""
+    files = {
+        "www/index.html": b"<p>home</p>",
+        "www/empty.html": b"",
+        "static/css/site.css": b"p {}",
+        "static/lost.html": b"<p>lost</p>",
+        "apps/peers.json": b'{"peers": []}',
+        "apps/__pycache__/app.cpython-312.pyc": b"\x00",
+    }
+    for name, data in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_indexes_the_directories_locate_serves_from(site):
+    manifest = AssetManifest()
+    assert manifest.get("/index.html").path == os.path.join("www", "index.html")
+    assert manifest.get("/css/site.css").mime_type == "text/css"
+    asset = manifest.get("/peers.json?fresh=1")
+    assert (asset.path, asset.mime_type) == (os.path.join("apps", "peers.json"), "application/json")
+    # Pages are served from www/ only, empty files and bytecode not at all.
+    assert "/lost.html" not in manifest
+    assert "/empty.html" not in manifest
+    assert len(manifest) == 3
+
+
+def test_refresh_picks_up_new_files(site):
+    manifest = AssetManifest(watch_interval=0.01)
+    assert "/new.html" not in manifest
+    (site / "www" / "new.html").write_bytes(b"<p>new</p>")
+    time.sleep(0.02)
+    assert manifest.get("/new.html") is not None
+
+
+def test_apps_assets_are_served(site, backend, monkeypatch):
+    monkeypatch.setattr("daemon.manifest._asset_manifest", AssetManifest())
+    port = backend({})
+    reply = exchange(port, b"GET /peers.json HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n")
+    head, _, body = reply.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200")
+    assert b"Content-Type: application/json" in head
+    assert body == b'{"peers": []}'
+    reply = exchange(port, b"GET /__pycache__/app.cpython-312.pyc HTTP/1.1\r\nHost: t\r\n"
+                           b"Connection: close\r\n\r\n")
+    assert reply.startswith(b"HTTP/1.1 404")
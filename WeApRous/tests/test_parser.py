@@ -0,0 +1,63 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of :mod:`daemon.parser` and of malformed request heads."""
+
+import pytest
+
+from conftest import exchange
+from daemon.httpadapter import HttpAdapter
+from daemon.parser import parse_head
+from daemon.reader import RequestError
+from daemon.request import Request
+
+
+def test_parses_request_line_and_headers():
+    head = parse_head(b"POST /a?b=1 HTTP/1.1\r\nHost: t\r\nX-Long: a\r\n b\r\n"
+                      b"Set: 1\r\nset: 2\r\nbogus\r\n\r\n")
+    assert (head.method, head.target, head.version) == ("POST", "/a?b=1", "HTTP/1.1")
+    assert head.headers["host"] == "t"
+    assert head.headers["x-long"] == "a b"
+    assert "bogus" not in head.headers
+
+
+def test_header_values_are_sliced_from_the_head():
+    raw = (b"GET / HTTP/1.1\r\nSet: 1\r\nX: a\r\n\tb\r\nSET: 2\r\n\tc\r\n"
+           b": nameless\r\nbogus\r\nEmpty:\r\n\r\nbody: ignored")
+    for source in (raw, bytearray(raw), memoryview(bytearray(raw))):
+        head = parse_head(source)
+        assert type(head.raw) is bytes and head.raw == raw
+        assert head.headers.store == {"set": [b" 1", b" 2 c"], "x": b" a b", "empty": b""}
+        assert head.headers["set"] == "1, 2 c"
+    # Without the final empty line the last header is still read.
+    assert parse_head(b"GET / HTTP/1.1\r\nHost: t").headers["host"] == "t"
+
+
+@pytest.mark.parametrize("line", [b"GET /\r\n\r\n", b"\r\n\r\n", b"GET / HTTP/1.1 extra\r\n\r\n"])
+def test_malformed_request_line(line):
+    with pytest.raises(ValueError):
+        parse_head(line)
+    with pytest.raises(RequestError) as error:
+        Request().prepare(line)
+    assert error.value.status_code == 400
+
+
+def test_adapter_answers_malformed_heads_with_400():
+    adapter = HttpAdapter("127.0.0.1", 0, None, None, {})
+    response = adapter.handle_request(b"NONSENSE\r\n\r\n", b"", {})
+    assert response.startswith(b"HTTP/1.1 400 Bad Request")
+
+
+@pytest.mark.parametrize("engine", ["thread", "selector", "asyncio"])
+def test_engines_answer_malformed_request_lines_with_400(backend, engine):
+    port = backend({}, engine=engine)
+    assert exchange(port, b"GET /\r\nHost: t\r\n\r\n").startswith(b"HTTP/1.1 400")
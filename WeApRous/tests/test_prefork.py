@@ -0,0 +1,62 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of :mod:`daemon.prefork` and the ``SO_REUSEPORT`` listeners."""
+
+import os
+import signal
+import socket
+import time
+
+import pytest
+
+from daemon.backend import create_server_socket
+from daemon.prefork import Supervisor
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+
+
+def test_rejects_no_workers():
+    with pytest.raises(ValueError):
+        Supervisor(print, 0)
+
+
+def test_restarts_exited_workers_until_stopped(tmp_path):
+    log = tmp_path / "starts"
+
+    def worker(slot):
+        with open(log, "a") as f:
+            f.write("{}\n".format(slot))
+        if len(log.read_text().split()) >= 5:
+            os.kill(os.getppid(), signal.SIGTERM)
+            time.sleep(5)
+
+    supervisor = Supervisor(worker, 2, restart_delay=0.01)
+    supervisor.run()
+    starts = log.read_text().split()
+    # Both slots were started, and restarted after exiting.
+    assert len(starts) >= 5
+    assert set(starts) == {"0", "1"}
+    assert supervisor.children == {}
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="needs SO_REUSEPORT")
+def test_reuse_port_listeners_share_the_port():
+    first = create_server_socket("127.0.0.1", 0, reuse_port=True)
+    try:
+        port = first.getsockname()[1]
+        second = create_server_socket("127.0.0.1", port, reuse_port=True)
+        second.close()
+        with pytest.raises(OSError):
+            create_server_socket("127.0.0.1", port).close()
+    finally:
+        first.close()
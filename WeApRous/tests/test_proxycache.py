@@ -0,0 +1,204 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of the proxy response cache of :mod:`daemon.proxycache`."""
+
+import socket
+import threading
+
+import pytest
+
+from daemon import balancer as balancer_module
+from daemon import proxycache
+from daemon.parser import parse_head
+from daemon.proxy import handle_client
+from daemon.proxycache import ProxyCache, configure_proxy_cache
+
+
+def response(body, *headers, status="200 OK"):
+    head = ["HTTP/1.1 " + status, "Content-Length: {}".format(len(body))] + list(headers)
+    return "\r\n".join(head).encode() + b"\r\n\r\n" + body
+
+
+def get(target="/peers", *headers):
+    return parse_head("GET {} HTTP/1.1\r\nHost: a.local\r\n{}".format(
+        target, "".join(header + "\r\n" for header in headers)))
+
+
+class ScriptedBackend:
+    """A keep-alive backend answering with the given responses in turn and
+    recording the requests it received."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.server = socket.socket()
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(4)
+        self.port = self.server.getsockname()[1]
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self):
+        while True:
+            conn, _ = self.server.accept()
+            threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+    def handle(self, conn):
+        data = b""
+        with conn:
+            while True:
+                while b"\r\n\r\n" not in data:
+                    chunk = conn.recv(65536)
+                    if not chunk:
+                        return
+                    data += chunk
+                request, _, data = data.partition(b"\r\n\r\n")
+                self.requests.append(request)
+                conn.sendall(self.responses.pop(0))
+
+
+@pytest.fixture
+def proxy(monkeypatch):
+    """Sends one request through the proxy handler to a scripted backend."""
+    monkeypatch.setattr(balancer_module, "_balancers", {})
+    monkeypatch.setattr(balancer_module, "_health", {})
+
+    def send(backend, request):
+        client, proxy_side = socket.socketpair()
+        routes = {"a.local": ("127.0.0.1:{}".format(backend.port), "round-robin")}
+        client.sendall(request)
+        handle_client("127.0.0.1", 8080, proxy_side, ("127.0.0.1", 1), routes)
+        reply = b""
+        with client:
+            while True:
+                chunk = client.recv(65536)
+                if not chunk:
+                    return reply
+                reply += chunk
+
+    return send
+
+
+def test_cache_is_opt_in(monkeypatch):
+    monkeypatch.setattr(proxycache, "_proxy_cache", None)
+    assert configure_proxy_cache({}) is None
+    assert configure_proxy_cache({"proxy_cache_max_entry": 1024}) is None
+    options = {"proxy_cache_size": 4096, "proxy_cache_max_entry": 1024, "max_inflight": 3}
+    cache = configure_proxy_cache(options)
+    assert (cache.max_bytes, cache.max_entry_size) == (4096, 1024)
+    assert options == {"max_inflight": 3}
+    assert configure_proxy_cache({"proxy_cache_size": 0}) is None
+
+
+def test_what_is_stored():
+    cache = ProxyCache(max_bytes=4096, max_entry_size=1024)
+    assert cache.store("a.local", get(), response(b"[]", "Cache-Control: max-age=60")) is not None
+    for refused in (
+            response(b"missing", "Cache-Control: max-age=86000", status="404 Not Found"),
+            response(b"[]", "Cache-Control: max-age=60", "Set-Cookie: a=1"),
+            response(b"[]", "Cache-Control: private, max-age=60"),
+            response(b"[]", "Cache-Control: no-store"),
+            response(b"[]", "Cache-Control: max-age=60", "Vary: *"),
+            response(b"[]"),
+            response(b"x" * 2000, "Cache-Control: max-age=60")):
+        assert cache.store("a.local", get("/other"), refused) is None
+    assert cache.store("a.local", get("/p", "Authorization: Basic eA=="),
+                       response(b"[]", "Cache-Control: max-age=60")) is None
+    assert len(cache) == 1
+
+
+def test_fresh_entry_is_served_with_age_and_304():
+    cache = ProxyCache()
+    cache.store("a.local", get(), response(b"[1]", "Cache-Control: max-age=60", 'ETag: "v1"'))
+    entry, fresh = cache.lookup("a.local", get())
+    assert fresh
+    reply = cache.serve(entry, get())
+    assert b"\r\nAge: 0\r\n" in reply and reply.endswith(b"\r\n\r\n[1]")
+    assert cache.serve(entry, get("/peers", 'If-None-Match: "v1"')).startswith(b"HTTP/1.1 304")
+    assert cache.lookup("a.local", get("/peers", "Cache-Control: no-cache")) == (entry, False)
+    cache.lookup("a.local", parse_head("POST /peers HTTP/1.1\r\nHost: a.local\r\n"))
+    assert cache.lookup("a.local", get()) == (None, False)
+
+
+def test_variants_follow_vary():
+    cache = ProxyCache()
+    cache.store("a.local", get("/p", "Accept-Encoding: gzip"),
+                response(b"gz", "Cache-Control: max-age=60", "Vary: Accept-Encoding"))
+    assert cache.lookup("a.local", get("/p", "Accept-Encoding: gzip"))[0].body == b"gz"
+    assert cache.lookup("a.local", get("/p"))[0] is None
+
+
+def test_responses_are_cached_through_the_proxy(proxy, monkeypatch):
+    monkeypatch.setattr(proxycache, "_proxy_cache", ProxyCache())
+    backend = ScriptedBackend(response(b"[1]", "Cache-Control: max-age=60"))
+    request = b"GET /peers HTTP/1.1\r\nHost: a.local\r\n\r\n"
+    assert proxy(backend, request).endswith(b"[1]")
+    reply = proxy(backend, request)
+    assert b"\r\nAge: " in reply and reply.endswith(b"[1]")
+    assert len(backend.requests) == 1
+
+
+def test_revalidation_304_refreshes_the_entry(proxy, monkeypatch):
+    monkeypatch.setattr(proxycache, "_proxy_cache", ProxyCache())
+    backend = ScriptedBackend(response(b"[1]", "Cache-Control: max-age=0", 'ETag: "v1"'),
+                              response(b"", "Cache-Control: max-age=60", 'ETag: "v1"',
+                                       status="304 Not Modified"))
+    request = b"GET /peers HTTP/1.1\r\nHost: a.local\r\n\r\n"
+    proxy(backend, request)
+    reply = proxy(backend, request)
+    assert reply.startswith(b"HTTP/1.1 200") and reply.endswith(b"[1]")
+    assert b'If-None-Match: "v1"' in backend.requests[1]
+    assert proxycache.proxy_cache().lookup("a.local", get())[1]
+
+
+def test_large_revalidation_response_is_streamed(proxy, monkeypatch):
+    monkeypatch.setattr(proxycache, "_proxy_cache", ProxyCache(max_bytes=4096, max_entry_size=1024))
+    body = bytes(range(256)) * 64
+    backend = ScriptedBackend(response(b"[1]", "Cache-Control: max-age=0", 'ETag: "v1"'),
+                              response(body, 'ETag: "v2"'))
+    request = b"GET /peers HTTP/1.1\r\nHost: a.local\r\n\r\n"
+    proxy(backend, request)
+    assert len(proxycache.proxy_cache()) == 1
+    reply = proxy(backend, request)
+    head, _, received = reply.partition(b"\r\n\r\n")
+    assert b"Connection: close" in head
+    assert received == body
+    assert len(proxycache.proxy_cache()) == 0
+
+
+def test_request_without_host_does_not_flush_the_cache():
+    cache = ProxyCache()
+    cache.store("a.local", get(), response(b"[1]", "Cache-Control: max-age=60"))
+    cache.store(None, parse_head("GET /x HTTP/1.0\r\n"), response(b"x", "Cache-Control: max-age=60"))
+    assert len(cache) == 2
+    cache.lookup(None, parse_head("POST /x HTTP/1.0\r\n"))
+    assert len(cache) == 1
+    assert cache.lookup("a.local", get())[1]
+    cache.clear()
+    assert (len(cache), cache.used) == (0, 0)
+
+
+def test_eviction_forgets_the_vary_of_evicted_targets():
+    cache = ProxyCache(max_bytes=2000, max_entry_size=1000)
+    for n in range(5000):
+        cache.store("a.local", get("/?{}".format(n)), response(b"[]", "Cache-Control: max-age=60"))
+    assert 0 < len(cache) < 100
+    assert len(cache._vary) == len(cache._variants) == len(cache)
+
+    cache.store("a.local", get("/p", "Accept-Encoding: gzip"),
+                response(b"gz", "Cache-Control: max-age=60", "Vary: Accept-Encoding"))
+    cache.store("a.local", get("/p"), response(b"id", "Cache-Control: max-age=60", "Vary: Accept-Encoding"))
+    cache.remove(cache.lookup("a.local", get("/p"))[0])
+    assert ("a.local", "GET", "/p") in cache._vary
+    cache.remove(cache.lookup("a.local", get("/p", "Accept-Encoding: gzip"))[0])
+    assert ("a.local", "GET", "/p") not in cache._vary
+    assert len(cache._vary) == len(cache)
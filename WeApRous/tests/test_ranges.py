@@ -0,0 +1,71 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of byte range requests of static files."""
+
+import re
+
+import pytest
+
+from conftest import exchange
+from daemon.staticcache import StaticCache
+
+PATH = "static/images/welcome.png"
+
+with open(PATH, "rb") as f:
+    CONTENT = f.read()
+
+
+@pytest.fixture(params=["cached", "uncached"])
+def cache(request, monkeypatch):
+    """The static cache, holding the file in memory or not."""
+    cache = StaticCache(max_entry_size=1 << 20 if request.param == "cached" else 64)
+    monkeypatch.setattr("daemon.staticcache._static_cache", cache)
+    return cache
+
+
+def get(port, range_header, version="HTTP/1.1"):
+    reply = exchange(port, "GET /images/welcome.png {}\r\nHost: t\r\nRange: {}\r\n"
+                           "Connection: close\r\n\r\n".format(version, range_header).encode())
+    head, _, body = reply.partition(b"\r\n\r\n")
+    return head.decode(), body
+
+
+def test_single_range(backend, cache):
+    head, body = get(backend({}), "bytes=10-19")
+    assert head.startswith("HTTP/1.1 206")
+    assert "Content-Range: bytes 10-19/{}".format(len(CONTENT)) in head
+    assert body == CONTENT[10:20]
+
+
+def test_suffix_range(backend, cache):
+    head, body = get(backend({}), "bytes=-5")
+    assert body == CONTENT[-5:]
+
+
+def test_unsatisfiable_range(backend, cache):
+    head, body = get(backend({}), "bytes={}-".format(len(CONTENT) + 10))
+    assert head.startswith("HTTP/1.1 416")
+    assert "Content-Range: bytes */{}".format(len(CONTENT)) in head
+
+
+@pytest.mark.parametrize("version", ["HTTP/1.1", "HTTP/1.0"])
+def test_multiple_ranges_are_length_delimited(backend, cache, version):
+    head, body = get(backend({}), "bytes=0-3, 100-109", version)
+    assert "Transfer-Encoding" not in head
+    length = int(re.search(r"Content-Length: (\d+)", head).group(1))
+    assert length == len(body)
+    boundary = re.search(r"boundary=(\w+)", head).group(1).encode()
+    parts = body.split(b"--" + boundary)
+    assert parts[1].endswith(b"\r\n\r\n" + CONTENT[0:4] + b"\r\n")
+    assert parts[2].endswith(b"\r\n\r\n" + CONTENT[100:110] + b"\r\n")
+    assert parts[3] == b"--\r\n"
@@ -0,0 +1,69 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of :mod:`daemon.reader`."""
+
+import pytest
+
+from daemon.reader import RequestError, RequestReader, parse_request
+
+POST = b"POST /submit HTTP/1.1\r\nHost: t\r\nContent-Length: 5\r\n\r\nhello"
+CHUNKED = (b"POST /submit HTTP/1.1\r\nHost: t\r\nTransfer-Encoding: chunked\r\n\r\n"
+           b"3\r\nhel\r\n2;ext=1\r\nlo\r\n0\r\nX-Trailer: 1\r\n\r\n")
+
+
+def status_of(buf, **caps):
+    with pytest.raises(RequestError) as error:
+        parse_request(buf, **caps)
+    return error.value.status_code
+
+
+def test_content_length_body():
+    size, head, body = parse_request(POST + b"GET / HTTP/1.1\r\n")
+    assert (size, head.method, body) == (len(POST), "POST", b"hello")
+
+
+def test_chunked_body_with_trailers():
+    size, head, body = parse_request(CHUNKED)
+    assert (size, body) == (len(CHUNKED), b"hello")
+
+
+@pytest.mark.parametrize("cut", [10, len(POST) - 1, len(CHUNKED) - 3])
+def test_incomplete_requests_need_more_bytes(cut):
+    assert parse_request(POST[:cut] if cut < len(POST) else CHUNKED[:cut]) is None
+
+
+def test_caps_and_malformed_framing():
+    assert status_of(POST, max_body_size=4) == 413
+    assert status_of(CHUNKED, max_body_size=4) == 413
+    assert status_of(b"GET / HTTP/1.1\r\nX: " + b"a" * 100, max_header_size=64) == 431
+    assert status_of(POST.replace(b"5\r\n\r\n", b"five\r\n\r\n")) == 400
+    assert status_of(CHUNKED.replace(b"3\r\nhel", b"z\r\nhel")) == 400
+
+
+def test_reader_keeps_pipelined_bytes(socketpair):
+    client, server = socketpair
+    client.sendall(POST + CHUNKED)
+    client.shutdown(1)
+    reader = RequestReader(server)
+    assert reader.read_request()[1] == b"hello"
+    assert reader.read_raw_request() == CHUNKED
+    assert reader.read_request() is None
+
+
+def test_reader_rejects_truncated_request(socketpair):
+    client, server = socketpair
+    client.sendall(POST[:-2])
+    client.shutdown(1)
+    with pytest.raises(RequestError) as error:
+        RequestReader(server).read_request()
+    assert error.value.status_code == 400
@@ -0,0 +1,117 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of the streaming proxy relay of :mod:`daemon.relay`."""
+
+import threading
+import time
+
+from daemon.relay import Relay
+from daemon.upstream import UpstreamPool
+
+PAYLOAD = bytes(range(256)) * 16384  # 4 MiB
+
+
+def big(headers, body):
+    return ("200 OK", {"Content-Type": "application/octet-stream"}, PAYLOAD)
+
+
+def read_response(sock):
+    data = b""
+    while b"\r\n\r\n" not in data:
+        data += sock.recv(65536)
+    head, _, body = data.partition(b"\r\n\r\n")
+    length = int(head.lower().split(b"content-length: ")[1].split(b"\r\n")[0])
+    while len(body) < length:
+        body += sock.recv(1 << 20)
+    return head, body
+
+
+def test_response_is_streamed_and_connection_pooled(backend, socketpair):
+    client, peer = socketpair
+    client.settimeout(7)
+    pool = UpstreamPool("127.0.0.1", backend({("GET", "/big"): big}), timeout=5)
+    relay = Relay(pool, client)
+    thread = threading.Thread(target=relay.run, args=(b"GET /big HTTP/1.1\r\nHost: t\r\n\r\n",))
+    thread.start()
+    head, body = read_response(peer)
+    thread.join(5)
+    assert b"Connection: close" in head
+    assert body == PAYLOAD
+    assert relay.sent == len(head) + 4 + len(PAYLOAD)
+    assert relay.latency is not None
+    assert (pool.open, pool.idle) == (1, 1)
+    # The relay gives both sockets their timeouts back.
+    assert client.gettimeout() == 7
+    assert pool._idle[0].sock.gettimeout() == 5
+
+
+def test_slow_client_stops_the_backend_reads(backend, socketpair):
+    client, peer = socketpair
+    pool = UpstreamPool("127.0.0.1", backend({("GET", "/big"): big}), timeout=5)
+    relay = Relay(pool, client, buffer_size=16 * 1024)
+    thread = threading.Thread(target=relay.run, args=(b"GET /big HTTP/1.1\r\nHost: t\r\n\r\n",))
+    thread.start()
+    time.sleep(0.3)
+    # Only what fits in the socket buffers and the relay buffer went out.
+    assert thread.is_alive()
+    assert relay.sent < len(PAYLOAD) // 2
+    head, body = read_response(peer)
+    thread.join(5)
+    assert body == PAYLOAD
+
+
+def test_capture_is_given_up_past_its_limit(backend, socketpair):
+    client, peer = socketpair
+    port = backend({("GET", "/big"): big, ("GET", "/small"): lambda headers, body: ("200 OK", "tiny")})
+    pool = UpstreamPool("127.0.0.1", port)
+
+    relay = Relay(pool, client, capture=1024)
+    relay.run(b"GET /small HTTP/1.1\r\nHost: t\r\n\r\n")
+    assert bytes(relay.captured).endswith(b"\r\n\r\ntiny")
+    assert read_response(peer)[1] == b"tiny"
+
+    relay = Relay(pool, client, capture=1024)
+    thread = threading.Thread(target=relay.run, args=(b"GET /big HTTP/1.1\r\nHost: t\r\n\r\n",))
+    thread.start()
+    read_response(peer)
+    thread.join(5)
+    assert relay.captured is None
+
+
+def test_fetch_buffers_without_a_client(backend):
+    pool = UpstreamPool("127.0.0.1", backend({("GET", "/big"): big}))
+    relay = Relay(pool, None)
+    response = relay.fetch(b"GET /big HTTP/1.1\r\nHost: t\r\n\r\n")
+    assert response.endswith(PAYLOAD)
+    assert relay.sent == 0
+
+
+def test_fetch_streams_what_outgrows_its_limit(backend, socketpair):
+    client, peer = socketpair
+    pool = UpstreamPool("127.0.0.1", backend({("GET", "/big"): big}), timeout=5)
+    relay = Relay(pool, client)
+    result = []
+    thread = threading.Thread(target=lambda: result.append(
+        relay.fetch(b"GET /big HTTP/1.1\r\nHost: t\r\n\r\n", limit=1024)))
+    thread.start()
+    head, body = read_response(peer)
+    thread.join(5)
+    assert result == [None]
+    assert b"Connection: close" in head and body == PAYLOAD
+    assert relay.captured is None and relay.sent == len(head) + 4 + len(PAYLOAD)
+    assert client.gettimeout() is None
+    assert (pool.open, pool.idle) == (1, 1)
+
+    # Below the limit nothing reaches the client.
+    small = Relay(pool, client).fetch(b"GET /big HTTP/1.1\r\nHost: t\r\n\r\n", limit=len(PAYLOAD) * 2)
+    assert small.endswith(PAYLOAD)
@@ -0,0 +1,70 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of the lazily parsed :class:`Request <Request>` attributes."""
+
+import json
+from unittest import mock
+
+import pytest
+
+from conftest import exchange
+from daemon.request import Request
+from start_sampleapp import app
+
+
+def make(head, body=""):
+    request = Request()
+    request.prepare(head)
+    request.body = body
+    return request
+
+
+def test_cookies_query_and_form():
+    request = make(b"POST /login?next=/a&x= HTTP/1.1\r\nCookie: auth=true; id=7\r\n"
+                   b"Content-Type: application/x-www-form-urlencoded\r\n\r\n",
+                   "username=admin&password=p%40ss")
+    assert request.cookies == {"auth": "true", "id": "7"}
+    assert request.query == {"next": "/a", "x": ""}
+    assert request.form == {"username": "admin", "password": "p@ss"}
+
+
+def test_form_ignores_other_content_types():
+    request = make(b"POST / HTTP/1.1\r\nContent-Type: application/json\r\n\r\n", "a=1")
+    assert request.form == {}
+
+
+def test_json_document():
+    request = make(b"POST / HTTP/1.1\r\n\r\n", '{"peer_id": "p1"}')
+    assert request.json == {"peer_id": "p1"}
+    assert request.json is request.json
+
+
+def test_empty_body_is_an_empty_document():
+    assert make(b"POST / HTTP/1.1\r\n\r\n").json == {}
+
+
+def test_malformed_json_is_parsed_once():
+    request = make(b"POST / HTTP/1.1\r\n\r\n", "{nope")
+    with mock.patch("daemon.request.json.loads", side_effect=json.loads) as loads:
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                request.json
+    assert loads.call_count == 1
+
+
+def test_tracker_answers_an_empty_body_with_400(backend):
+    port = backend(app.routes)
+    reply = exchange(port, b"POST /submit-info HTTP/1.1\r\nHost: t\r\nContent-Length: 0\r\n"
+                           b"Connection: close\r\n\r\n")
+    assert reply.startswith(b"HTTP/1.1 400")
+    assert b"Missing" in reply
@@ -0,0 +1,72 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of :mod:`daemon.router`."""
+
+import pytest
+
+from daemon.request import Request
+from daemon.router import Router
+
+
+def first(headers, body): pass
+def second(headers, body): pass
+def third(headers, body): pass
+def rest(headers, body): pass
+
+
+ROUTER = Router({
+    ("GET", "/channels/<name>/messages"): first,
+    ("GET", "/channels/general/messages"): second,
+    ("GET", "/items/<int:id>"): third,
+    ("GET", "/prices/<float:value>"): third,
+    ("GET", "/files/<path:name>"): rest,
+    ("POST", "/items/<int:id>"): first,
+})
+
+
+def test_static_segments_win_over_parameters():
+    match = ROUTER.match("GET", "/channels/general/messages?since=3")
+    assert (match.hook, match.params) == (second, {})
+    match = ROUTER.match("GET", "/channels/random/messages")
+    assert (match.hook, match.params) == (first, {"name": "random"})
+
+
+def test_typed_parameters():
+    assert ROUTER.match("GET", "/items/42").params == {"id": 42}
+    assert ROUTER.match("GET", "/items/4x") is None
+    assert ROUTER.match("GET", "/prices/-1.5").params == {"value": -1.5}
+    assert ROUTER.match("GET", "/files/a/b%20c.txt").params == {"name": "a/b c.txt"}
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", "1e5", "1_0", "1" * 400])
+def test_float_parameters_must_be_finite_decimals(value):
+    assert ROUTER.match("GET", "/prices/" + value) is None
+
+
+def test_other_methods_yield_the_allow_list():
+    match = ROUTER.match("DELETE", "/items/1")
+    assert match.hook is None
+    assert match.allowed == ("GET", "POST", "OPTIONS")
+
+
+def test_compile_returns_a_router_unchanged():
+    assert Router.compile(ROUTER) is ROUTER
+    assert len(Router.compile({("GET", "/a"): first})) == 1
+
+
+def test_requests_need_a_compiled_router():
+    request = Request()
+    request.prepare(b"GET /items/7 HTTP/1.1\r\nHost: t\r\n\r\n", ROUTER)
+    assert (request.hook, request.params) == (third, {"id": 7})
+    with pytest.raises(TypeError):
+        Request().prepare(b"GET /items/7 HTTP/1.1\r\nHost: t\r\n\r\n", {("GET", "/a"): first})
@@ -0,0 +1,124 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of :class:`daemon.response.RouteResponse` and its ``sendmsg`` writes."""
+
+import json
+import socket
+
+import pytest
+
+from conftest import exchange
+from daemon.response import ChunkedResponse, ResponseHeaders, RouteResponse
+
+ENGINES = ["thread", "pool", "selector", "asyncio"]
+
+
+def drain(sock, size):
+    data = b""
+    while len(data) < size:
+        data += sock.recv(65536)
+    return data
+
+
+def test_headers_are_a_case_insensitive_multimap():
+    headers = ResponseHeaders([("Set-Cookie", "a=1"), ("Content-Type", "text/plain")])
+    headers.add("set-cookie", "b=2")
+    assert headers.get_all("SET-COOKIE") == ["a=1", "b=2"]
+    assert headers["content-type"] == "text/plain"
+    headers["Set-Cookie"] = "c=3"
+    assert headers.get_all("Set-Cookie") == ["c=3"]
+    del headers["CONTENT-TYPE"]
+    assert "Content-Type" not in headers
+    with pytest.raises(KeyError):
+        headers["Content-Type"]
+
+
+def test_coerce_hook_results():
+    reply = RouteResponse.coerce({"ok": True})
+    assert reply.headers["Content-Type"] == "application/json"
+    assert json.loads(reply.body) == {"ok": True}
+    reply = RouteResponse.coerce(("404 Gone", {"X-Peer": "1"}, "missing"))
+    assert (reply.status_code, reply.reason, reply.body) == (404, "Gone", b"missing")
+    assert reply.headers["X-Peer"] == "1"
+    assert RouteResponse.coerce((201, "made")).status_code == 201
+    with pytest.raises(TypeError):
+        RouteResponse.coerce(("a", "b", "c", "d"))
+
+
+def test_head_frames_the_body():
+    reply = RouteResponse("hello", headers={"Content-Length": "99"})
+    head = reply.head
+    assert head.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert head.count(b"Content-Length") == 1
+    assert b"Content-Length: 5\r\n" in head
+    assert head.endswith(b"\r\n\r\n")
+
+    head = RouteResponse(status=204).head
+    assert b"Content-Length" not in head and b"Content-Type" not in head
+    assert RouteResponse(status=204).buffers() == [head]
+
+
+def test_streamed_body_goes_out_chunked():
+    wire = RouteResponse(iter([b"a", b"b"]), headers={"X-Peer": "1"}).to_wire()
+    assert isinstance(wire, ChunkedResponse)
+    assert b"Transfer-Encoding: chunked" in wire.head
+    assert b"X-Peer: 1" in wire.head
+    assert b"".join(wire) == b"1\r\na\r\n1\r\nb\r\n0\r\n\r\n"
+
+
+def test_sendmsg_resumes_partial_writes(socketpair):
+    left, right = socketpair
+    left.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+    left.setblocking(False)
+    body = bytes(range(256)) * 4096
+    reply = RouteResponse(body, content_type="application/octet-stream")
+    total = len(reply.head) + len(body)
+    assert reply.remaining == total
+
+    received = b""
+    calls = 0
+    while reply.remaining:
+        try:
+            sent = reply.sendmsg(left)
+        except BlockingIOError:
+            received += right.recv(1 << 20)
+            continue
+        calls += 1
+        assert sent > 0
+    received += drain(right, total - len(received))
+    assert calls > 1
+    assert received == reply.head + body
+
+
+def test_send_yields_every_write(socketpair):
+    left, right = socketpair
+    reply = RouteResponse(b"x" * 10, content_type="text/plain")
+    assert sum(reply.send(left)) == len(reply.head) + 10
+    assert drain(right, len(reply.head) + 10).endswith(b"x" * 10)
+    assert reply.remaining == 0
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engines_write_route_responses(backend, engine):
+    payload = b"peer\n" * 200000
+
+    def peers(headers, body):
+        return RouteResponse(payload, headers=[("Set-Cookie", "a=1"), ("Set-Cookie", "b=2")],
+                             content_type="text/plain")
+
+    port = backend({("GET", "/peers"): peers}, engine=engine, compress_min_size=None)
+    reply = exchange(port, b"GET /peers HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n")
+    head, _, received = reply.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200")
+    assert b"Set-Cookie: a=1\r\nSet-Cookie: b=2" in head
+    assert received == payload
@@ -0,0 +1,52 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of static files too large for the cache, sent with ``sendfile``."""
+
+import pytest
+
+from conftest import exchange
+from daemon.response import FileResponse
+from daemon.staticcache import StaticCache
+
+
+@pytest.fixture
+def small_cache(monkeypatch):
+    """A static cache holding no file content over 64 bytes."""
+    cache = StaticCache(max_entry_size=64)
+    monkeypatch.setattr("daemon.staticcache._static_cache", cache)
+    return cache
+
+
+def test_file_response_sends_a_region(socketpair, tmp_path):
+    client, server = socketpair
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 64)
+    response = FileResponse(str(path), b"HEAD\r\n\r\n", 100, 5000)
+    for _ in response.send(server):
+        pass
+    server.close()
+    received = b""
+    while len(received) < 5000:
+        received += client.recv(65536)
+    assert received == path.read_bytes()[100:5100]
+
+
+@pytest.mark.parametrize("engine", ["thread", "selector", "asyncio"])
+def test_uncached_files_are_served_whole(backend, small_cache, engine):
+    port = backend({}, engine=engine)
+    reply = exchange(port, b"GET /images/welcome.png HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n")
+    head, _, body = reply.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200")
+    with open("static/images/welcome.png", "rb") as f:
+        assert body == f.read()
+    assert small_cache.lookup("static/images/welcome.png").content is None
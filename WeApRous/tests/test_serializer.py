@@ -0,0 +1,59 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of :mod:`daemon.serializer`."""
+
+from email.utils import parsedate_to_datetime
+
+from daemon import serializer
+from daemon.serializer import date_line, header_line, serialize_head, status_line
+
+
+def test_status_lines():
+    assert status_line(200) == b"HTTP/1.1 200 OK\r\n"
+    assert status_line(404, "Gone") == b"HTTP/1.1 404 Gone\r\n"
+    assert status_line(799) == b"HTTP/1.1 799 \r\n"
+    assert status_line(200) is status_line(200)
+
+
+def test_custom_reasons_do_not_grow_the_status_line_cache():
+    for n in range(serializer.STATUS_LINE_CACHE_SIZE * 4):
+        status_line(200, "OK {}".format(n))
+    assert status_line.cache_info().currsize == serializer.STATUS_LINE_CACHE_SIZE
+
+
+def test_header_lines_are_cached():
+    line = header_line("Content-Type", "text/css")
+    assert line == b"Content-Type: text/css\r\n"
+    assert header_line("Content-Type", "text/css") is line
+
+
+def test_date_line_changes_once_per_second(monkeypatch):
+    monkeypatch.setattr(serializer, "_date", (None, b""))
+    monkeypatch.setattr(serializer.time, "time", lambda: 1791021600.2)
+    line = date_line()
+    assert line == b"Date: Sat, 03 Oct 2026 10:00:00 GMT\r\n"
+    monkeypatch.setattr(serializer.time, "time", lambda: 1791021600.9)
+    assert date_line() is line
+    monkeypatch.setattr(serializer.time, "time", lambda: 1791021601.0)
+    assert date_line() == b"Date: Sat, 03 Oct 2026 10:00:01 GMT\r\n"
+
+
+def test_serialize_head():
+    head = serialize_head(200, None, [("Content-Type", "text/html"), ("Set-Cookie", "a=1"),
+                                      ("Set-Cookie", "b=2")], content_length=5)
+    lines = head.split(b"\r\n")
+    assert lines[0] == b"HTTP/1.1 200 OK"
+    assert parsedate_to_datetime(lines[1][6:].decode()).tzinfo is not None
+    assert lines[2:] == [b"Content-Type: text/html", b"Set-Cookie: a=1", b"Set-Cookie: b=2",
+                         b"Content-Length: 5", b"", b""]
+    assert b"Content-Length" not in serialize_head(304, None, [])
@@ -0,0 +1,94 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of :mod:`daemon.staticcache`."""
+
+import os
+
+import pytest
+
+from daemon.staticcache import ENTRY_OVERHEAD, StaticCache
+
+
+@pytest.fixture
+def files(tmp_path):
+    def write(name, content):
+        path = tmp_path / name
+        path.write_bytes(content)
+        return str(path)
+    return write
+
+
+def test_serves_from_memory_until_revalidation(files):
+    path = files("a.txt", b"one")
+    cache = StaticCache(revalidate_interval=3600)
+    assert cache.read(path) == b"one"
+    with open(path, "wb") as f:
+        f.write(b"two!")
+    assert cache.read(path) == b"one"
+    cache.revalidate_interval = 0
+    assert cache.read(path) == b"two!"
+
+
+def test_symlink_aliases_share_one_entry(files, tmp_path):
+    path = files("a.txt", b"x" * 100)
+    os.symlink(path, str(tmp_path / "alias.txt"))
+    cache = StaticCache()
+    first = cache.lookup(path)
+    second = cache.lookup(str(tmp_path / "alias.txt"))
+    third = cache.lookup(str(tmp_path / "sub" / ".." / "a.txt"))
+    assert first is second is third
+    assert cache.used == ENTRY_OVERHEAD + 100
+
+
+def test_retargeted_symlink_is_followed(files, tmp_path):
+    files("a.txt", b"a")
+    files("b.txt", b"b")
+    link = str(tmp_path / "link.txt")
+    os.symlink("a.txt", link)
+    cache = StaticCache(revalidate_interval=0)
+    assert cache.read(link) == b"a"
+    os.remove(link)
+    os.symlink("b.txt", link)
+    assert cache.read(link) == b"b"
+
+
+def test_metadata_only_entries_are_evicted(files):
+    cache = StaticCache(max_bytes=4 * ENTRY_OVERHEAD, max_entry_size=10)
+    big = [files("big{}.bin".format(i), b"x" * 100) for i in range(10)]
+    for path in big:
+        assert cache.lookup(path).content is None
+    assert cache.used <= cache.max_bytes
+    assert len(cache._entries) == 4
+    assert len(cache._aliases) == 4
+
+
+def test_lru_eviction_keeps_recent_files(files):
+    cache = StaticCache(max_bytes=2 * (ENTRY_OVERHEAD + 100))
+    a, b, c = (files(name, b"x" * 100) for name in ("a", "b", "c"))
+    cache.lookup(a)
+    cache.lookup(b)
+    cache.lookup(a)
+    cache.lookup(c)
+    assert sorted(os.path.basename(key) for key in cache._entries) == ["a", "c"]
+
+
+def test_disabled_cache_still_reads(files):
+    path = files("a.txt", b"content")
+    cache = StaticCache(max_bytes=0)
+    assert cache.read(path) == b"content"
+    assert cache.used == 0
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        StaticCache().lookup(str(tmp_path / "missing"))
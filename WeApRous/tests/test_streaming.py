@@ -0,0 +1,56 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of streamed (chunked) responses."""
+
+import pytest
+
+from conftest import exchange
+from daemon.response import ChunkedResponse
+
+ENGINES = ["thread", "pool", "selector", "asyncio"]
+
+
+def numbers(headers, body):
+    return (str(i) for i in range(3))
+
+
+def split(reply):
+    head, _, body = reply.partition(b"\r\n\r\n")
+    return head.lower(), body
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_http11_gets_chunks(backend, engine):
+    port = backend({("GET", "/numbers"): numbers}, engine=engine)
+    head, body = split(exchange(port, b"GET /numbers HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n"))
+    assert b"transfer-encoding: chunked" in head
+    assert body == b"1\r\n0\r\n1\r\n1\r\n1\r\n2\r\n0\r\n\r\n"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_http10_gets_a_close_delimited_body(backend, engine):
+    port = backend({("GET", "/numbers"): numbers}, engine=engine)
+    # Even when asking for keep-alive: only closing can end the body.
+    head, body = split(exchange(port, b"GET /numbers HTTP/1.0\r\nConnection: keep-alive\r\n\r\n"))
+    assert b"transfer-encoding" not in head
+    assert b"connection: close" in head
+    assert body == b"012"
+
+
+def test_close_delimited_keeps_other_headers():
+    response = ChunkedResponse(iter([b"a", b"", "b"]), content_type="text/plain",
+                               headers={"X-Id": "7"}).close_delimited()
+    assert b"transfer-encoding" not in response.head.lower()
+    assert b"X-Id: 7\r\n" in response.head
+    assert response.head.endswith(b"\r\n\r\n")
+    assert b"".join(response) == b"ab"
@@ -0,0 +1,137 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of :mod:`daemon.timeouts`."""
+
+import threading
+import time
+
+import pytest
+
+from daemon.timeouts import ConnectionDeadline, TimerWheel, socket_deadline
+
+
+def make(**timeouts):
+    wheel = TimerWheel(tick=1.0)
+    fired = []
+    start = time.monotonic()
+    deadline = ConnectionDeadline(wheel, fired.append, **timeouts)
+    return wheel, deadline, fired, start
+
+
+def test_wheel_fires_after_the_delay():
+    wheel = TimerWheel(tick=1.0, slots=4)
+    start = time.monotonic()
+    fired = []
+    wheel.schedule(2.5, lambda: fired.append("a"))
+    # Longer than one turn of the wheel.
+    wheel.schedule(9.0, lambda: fired.append("b"))
+    assert wheel.advance(start + 2.0) == 0
+    assert wheel.advance(start + 3.0) == 1
+    assert wheel.advance(start + 8.0) == 0
+    assert wheel.advance(start + 9.0) == 1
+    assert fired == ["a", "b"]
+
+
+def test_deadline_expires_its_phase():
+    wheel, deadline, fired, start = make(header_timeout=2)
+    deadline.enter("header")
+    wheel.advance(start + 2.0)
+    assert fired == ["header"]
+    assert deadline.expired == "header"
+
+
+def test_enter_keeps_and_arm_restarts_the_deadline():
+    wheel, deadline, fired, start = make(header_timeout=2, idle_timeout=2)
+    deadline.enter("header")
+    wheel.advance(start + 1.0)
+    deadline.enter("header")
+    wheel.advance(start + 2.0)
+    assert fired == ["header"]
+    deadline.arm("idle")
+    deadline.cancel()
+    wheel.advance(start + 10.0)
+    assert fired == ["header"]
+
+
+def test_stale_timer_picked_up_before_rearm_does_not_fire():
+    wheel, deadline, fired, start = make(write_timeout=1)
+    deadline.arm("write")
+    # The wheel thread took the timer out of its bucket, then the connection
+    # thread re-armed the same phase before the callback ran.
+    stale = deadline._timer.callback
+    deadline.arm("write")
+    stale()
+    assert fired == []
+    deadline.cancel()
+    stale()
+    assert fired == []
+
+
+def test_refresh_only_rearms_the_current_phase():
+    wheel, deadline, fired, start = make(header_timeout=2, idle_timeout=2)
+    deadline.enter("header")
+    wheel.advance(start + 1.0)
+    deadline.refresh("idle")
+    assert deadline.phase == "header"
+    wheel.advance(start + 2.0)
+    assert fired == ["header"]
+
+
+def test_cancel_races_with_expiry():
+    # Whatever the interleaving, once cancel() returned nothing fires.
+    wheel = TimerWheel(tick=0.001)
+    late = []
+    for _ in range(200):
+        fired = []
+        deadline = ConnectionDeadline(wheel, fired.append, write_timeout=0.001)
+        deadline.arm("write")
+        ticker = threading.Thread(target=wheel.advance, args=(time.monotonic() + 0.01,))
+        ticker.start()
+        deadline.cancel()
+        after = len(fired)
+        ticker.join()
+        wheel.advance(time.monotonic() + 0.01)
+        if len(fired) != after:
+            late.append(fired)
+    assert late == []
+
+
+def test_socket_deadline_shuts_the_socket_down(socketpair):
+    client, server = socketpair
+    wheel = TimerWheel(tick=1.0)
+    start = time.monotonic()
+    deadline = socket_deadline(server, wheel, header_timeout=1)
+    deadline.enter("header")
+    wheel.advance(start + 1.0)
+    # A blocked recv returns at once.
+    assert server.recv(10) == b""
+
+
+def test_chat_client_keeps_one_deadline_per_direction(socketpair):
+    pytest.importorskip("requests")
+    from chat_client_withHelper import P2PChatClient
+
+    client, peer = socketpair
+    chat = P2PChatClient("alice", 0, "http://127.0.0.1:1", idle_timeout=30)
+    receiving, sending = chat.make_deadline(client)
+    receiving.enter("header")
+    chat.send_to(client, b"alice")
+    assert peer.recv(10) == b"alice"
+    # Sending neither ends the handshake phase of the receiving thread
+    # nor leaves a write deadline behind.
+    assert receiving.phase == "header"
+    assert sending.phase is None
+    receiving.enter("idle")
+    chat.send_to(client, b"hi")
+    assert receiving.phase == "idle"
+    receiving.cancel()
@@ -0,0 +1,128 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of the backend connection pools of :mod:`daemon.upstream`."""
+
+import socket
+import threading
+
+import pytest
+
+from daemon.upstream import (ResponseFramer, UpstreamError, UpstreamPool,
+                             set_connection_header)
+
+GET = b"GET /hello HTTP/1.1\r\nHost: t\r\n\r\n"
+
+
+def hello(headers, body):
+    return ("200 OK", {"Content-Type": "text/plain"}, "hello")
+
+
+def one_shot_backend():
+    """A backend answering one keep-alive response per connection, then
+    closing it behind the proxy's back."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+
+    def serve():
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                conn.recv(65536)
+                conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def test_connections_are_reused(backend):
+    pool = UpstreamPool("127.0.0.1", backend({("GET", "/hello"): hello}))
+    for _ in range(3):
+        assert pool.request(GET).endswith(b"\r\n\r\nhello")
+    assert (pool.open, pool.idle) == (1, 1)
+    conn, reused = pool.acquire()
+    assert reused and conn.requests == 3
+    pool.release(conn, True)
+    pool.close()
+    assert pool.open == 0
+
+
+def test_reused_connection_keeps_its_timeout(backend):
+    pool = UpstreamPool("127.0.0.1", backend({("GET", "/hello"): hello}), timeout=2.5)
+    pool.request(GET)
+    conn, reused = pool.acquire()
+    assert reused
+    # alive() peeks without blocking, the socket must stay in timeout mode.
+    assert conn.alive()
+    assert conn.sock.gettimeout() == 2.5
+    pool.release(conn, True)
+    pool.close()
+
+
+def test_connection_closed_by_the_backend_is_replaced():
+    pool = UpstreamPool("127.0.0.1", one_shot_backend(), timeout=2)
+    assert pool.request(GET).endswith(b"ok")
+    conn = pool._idle[0]
+    conn.sock.recv(1, socket.MSG_PEEK)  # wait for the backend close
+    assert not conn.alive()
+    assert pool.request(GET).endswith(b"ok")
+    assert pool.open == 1
+
+
+def test_max_idle_zero_asks_the_backend_to_close(backend):
+    pool = UpstreamPool("127.0.0.1", backend({("GET", "/hello"): hello}), max_idle=0)
+    assert b"Connection: close" in pool.prepare(GET)
+    pool.request(GET)
+    assert (pool.open, pool.idle) == (0, 0)
+
+
+def test_callers_wait_for_a_free_connection(backend):
+    pool = UpstreamPool("127.0.0.1", backend({("GET", "/hello"): hello}),
+                        max_connections=1, timeout=0.2)
+    conn, _ = pool.acquire()
+    with pytest.raises(UpstreamError):
+        pool.acquire()
+    threading.Timer(0.05, pool.release, (conn, True)).start()
+    pool.timeout = 2
+    assert pool.acquire()[0] is conn
+
+
+def test_set_connection_header():
+    message = b"GET / HTTP/1.1\r\nConnection: close\r\nKeep-Alive: 5\r\nHost: t\r\n\r\nbody"
+    assert set_connection_header(message, b"keep-alive") == (
+        b"GET / HTTP/1.1\r\nHost: t\r\nConnection: keep-alive\r\n\r\nbody")
+
+
+def test_framer_follows_chunks_split_across_reads():
+    framer = ResponseFramer(b"GET")
+    data = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n0\r\n\r\n"
+    out = b"".join(framer.feed(data[i:i + 3]) for i in range(0, len(data), 3))
+    assert out == data
+    assert framer.done and framer.keep_alive and framer.status == 200
+
+
+def test_framer_bodyless_and_close_delimited_responses():
+    framer = ResponseFramer(b"HEAD")
+    framer.feed(b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\n")
+    assert framer.done and framer.keep_alive
+
+    framer = ResponseFramer(b"GET")
+    framer.feed(b"HTTP/1.1 200 OK\r\n\r\nuntil close")
+    assert not framer.done
+    framer.finish()
+    assert framer.done and not framer.keep_alive
+
+    framer = ResponseFramer(b"GET")
+    framer.feed(b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nshort")
+    with pytest.raises(UpstreamError):
+        framer.finish()
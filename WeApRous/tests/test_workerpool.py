@@ -0,0 +1,75 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Tests of :mod:`daemon.workerpool`."""
+
+import threading
+
+import pytest
+
+from daemon.workerpool import WorkerPool
+
+
+def test_rejects_unbounded_queue():
+    with pytest.raises(ValueError):
+        WorkerPool(print, queue_size=0)
+    with pytest.raises(ValueError):
+        WorkerPool(print, queue_size=-1)
+
+
+def test_rejects_inconsistent_bounds():
+    with pytest.raises(ValueError):
+        WorkerPool(print, min_workers=4, max_workers=2)
+
+
+def test_full_queue_refuses_jobs():
+    release = threading.Event()
+    started = threading.Event()
+
+    def handler():
+        started.set()
+        release.wait(5)
+
+    pool = WorkerPool(handler, min_workers=1, max_workers=1, queue_size=1)
+    pool.start()
+    try:
+        assert pool.submit()
+        assert started.wait(5)
+        # The only worker is busy: one job fits in the queue, the next does not.
+        assert pool.submit(block=False)
+        assert not pool.submit(block=False)
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_grows_up_to_max_workers():
+    release = threading.Event()
+    running = threading.Semaphore(0)
+
+    def handler():
+        running.release()
+        release.wait(5)
+
+    pool = WorkerPool(handler, min_workers=0, max_workers=3, queue_size=8)
+    pool.start()
+    try:
+        # Every job finds the workers busy, so each one adds a thread.
+        for _ in range(3):
+            assert pool.submit()
+            assert running.acquire(timeout=5)
+        assert pool.size == 3
+        assert pool.submit()
+        assert pool.size == 3
+    finally:
+        release.set()
+        pool.shutdown()